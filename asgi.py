@@ -0,0 +1,5 @@
+from src import create_asgi_app
+
+
+# Served by an ASGI server, e.g. hypercorn asgi:app
+app = create_asgi_app()
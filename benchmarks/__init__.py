@@ -0,0 +1 @@
+""" Benchmarks for the persistence layer, run with `python -m benchmarks.<name>` """
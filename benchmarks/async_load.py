@@ -0,0 +1,180 @@
+""" Load benchmark of the ASGI app against the WSGI app
+
+Seeds a SQLite database (or uses --database-url), then serves it with the
+sync app under gunicorn (hbnb:app, workers x threads) and with the async
+app under hypercorn (asgi:app), one after the other, and sends each the
+same mix of read requests at several concurrency levels. Prints the
+throughput and latency percentiles of each.
+
+A local SQLite file answers in microseconds, so both paths are mostly
+CPU bound there; point --database-url at a PostgreSQL server over the
+network to measure requests that actually wait on the database.
+
+    python -m benchmarks.async_load [--concurrency 10 100 1000] [--requests 5000]
+
+Requires gunicorn, hypercorn, and the async drivers (see requirements.txt).
+Raise the open file limit (ulimit -n) above the highest concurrency.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src import create_app, db
+from src.config import TestingConfig
+from utils.constants import REPOSITORY_ENV_VAR
+
+from benchmarks.index_latency import seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = "127.0.0.1"
+
+
+def servers(workers: int, threads: int, port: int) -> dict:
+    """The command line serving each path"""
+    bind = f"{HOST}:{port}"
+    return {
+        "sync (gunicorn)": [
+            sys.executable, "-m", "gunicorn", "-w", str(workers), "--threads", str(threads), "-b", bind, "hbnb:app",
+        ],
+        "async (hypercorn)": [sys.executable, "-m", "hypercorn", "-w", str(workers), "-b", bind, "asgi:app"],
+    }
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with {process.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Nothing listens on port {port}")
+
+
+def paths(keys: dict, count: int, rng: random.Random) -> list[str]:
+    """A mix of the read endpoints both apps serve"""
+    choices = [
+        lambda: f"/places/{rng.choice(keys['places'])}",
+        lambda: f"/places/{rng.choice(keys['places'])}/reviews",
+        lambda: f"/places/{rng.choice(keys['places'])}/reviews/stats",
+        lambda: f"/places/{rng.choice(keys['places'])}?expand=city,host",
+        lambda: f"/countries/{rng.choice(keys['countries'])}/cities",
+        lambda: "/reviews?limit=50&order=desc",
+    ]
+    return [rng.choice(choices)() for _ in range(count)]
+
+
+async def fetch(port: int, path: str) -> int:
+    """GET a path over a new connection and return the status code"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load(port: int, requests: list[str], concurrency: int) -> dict:
+    """Send the requests with at most `concurrency` in flight"""
+    latencies, errors = [], 0
+    queue = iter(requests)
+
+    async def client() -> None:
+        nonlocal errors
+        for path in queue:
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path)
+            except OSError:
+                status = None
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(requests) / elapsed,
+        "p50": quantiles[49],
+        "p99": quantiles[98],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url", help="An existing database to serve instead of a seeded SQLite file")
+    parser.add_argument("--places", type=int, default=5_000)
+    parser.add_argument("--reviews", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8, help="Threads of each gunicorn worker")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        uri = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'hbnb.db')}"
+        config = type("BenchmarkConfig", (TestingConfig,), {"SQLALCHEMY_DATABASE_URI": uri})
+        counts = {
+            "countries": 50, "cities": 500, "users": 2_000, "places": args.places, "reviews": args.reviews,
+        }
+        with create_app(config).app_context():
+            db.create_all()
+            keys = seed(counts, random.Random(args.seed))
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+        env = {
+            **os.environ,
+            "ENV": "development",
+            "SQLALCHEMY_DATABASE_URI": uri,
+            "PROD_DATABASE_URL": uri,
+            REPOSITORY_ENV_VAR: "db",
+            "DB_POOL_SIZE": str(args.pool_size),
+        }
+        requests = paths(keys, args.requests, random.Random(args.seed))
+
+        results = {}
+        for name, command in servers(args.workers, args.threads, args.port).items():
+            process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(args.port, process)
+                # Warm up the pools and caches
+                asyncio.run(load(args.port, requests[:200], 10))
+                for concurrency in args.concurrency:
+                    results[name, concurrency] = asyncio.run(load(args.port, requests, concurrency))
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(f"\n{'server':<20} {'in flight':>9} {'req/s':>9} {'p50':>10} {'p99':>10} {'errors':>7}")
+    for (name, concurrency), result in results.items():
+        print(
+            f"{name:<20} {concurrency:>9} {result['rps']:>9.0f} {result['p50']:>8.1f}ms "
+            f"{result['p99']:>8.1f}ms {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+""" Insert throughput of single saves against save_many, per repository
+
+Inserts N places into a fresh memory, file and SQLite repository, once
+with one save() per object and once with a single save_many(), and prints
+inserts per second. One-by-one saves are skipped above --single-max, where
+committing or fsyncing every object would take minutes.
+
+    python -m benchmarks.batch_writes [--objects 10000 100000] [--single-max 10000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.place import Place
+from src.persistence.db import DBRepository
+from src.persistence.file import DataManager
+from src.persistence.memory import MemoryRepository
+
+
+def make_places(count: int) -> list:
+    return [
+        Place({"name": f"Place {i}", "address": "Rambla 1234", "city_id": "city", "user_id": "user"})
+        for i in range(count)
+    ]
+
+
+def measure(repo, count: int, batch: bool) -> float:
+    places = make_places(count)
+    start = time.perf_counter()
+    if batch:
+        repo.save_many(places)
+    else:
+        for place in places:
+            repo.save(place)
+    return count / (time.perf_counter() - start)
+
+
+def run_memory(count: int, batch: bool) -> float:
+    return measure(MemoryRepository(), count, batch)
+
+
+def run_file(count: int, batch: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo = DataManager(
+            filename=os.path.join(tmpdir, "data.json"), max_journal_bytes=2**62, max_journal_entries=2**62
+        )
+        throughput = measure(repo, count, batch)
+        repo.close()
+        return throughput
+
+
+def run_db(count: int, batch: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = type("BenchmarkConfig", (TestingConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmpdir, 'hbnb.db')}",
+        })
+        with create_app(config).app_context():
+            db.create_all()
+            throughput = measure(DBRepository(), count, batch)
+            db.session.remove()
+            db.engine.dispose()
+            return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objects", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--single-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    os.environ["USE_DATABASE"] = "false"
+
+    results = []
+    for name, run in (("memory", run_memory), ("file", run_file), ("sqlite", run_db)):
+        for count in args.objects:
+            single = run(count, False) if count <= args.single_max else None
+            results.append((name, count, single, run(count, True)))
+
+    print(f"{'repository':>10} {'objects':>8} {'save/s':>10} {'save_many/s':>12}")
+    for name, count, single, batch in results:
+        single = f"{single:>10.0f}" if single is not None else f"{'-':>10}"
+        print(f"{name:>10} {count:>8} {single} {batch:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+""" Write throughput of the file repository per durability mode
+
+Saves N reviews into a fresh DataManager for each durability mode, from
+one and from several threads, and prints writes per second. Compaction
+is disabled so only journal appends are measured.
+
+    python -m benchmarks.file_durability [--writes 5000] [--threads 1 4]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from src.models.review import Review
+from src.persistence.file import DataManager
+
+MODES = (("always", None), ("interval", 10), ("interval", 100), ("off", None))
+
+
+def run(mode: str, interval_ms: int | None, writes: int, threads: int) -> float:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo = DataManager(
+            filename=os.path.join(tmpdir, "data.json"),
+            max_journal_bytes=2**62,
+            max_journal_entries=2**62,
+            durability=mode,
+            flush_interval_ms=interval_ms or 100,
+        )
+        reviews = [
+            Review(place_id=f"place-{i % 100}", user_id="user", comment="Great stay", rating=5)
+            for i in range(writes)
+        ]
+
+        def write(chunk):
+            for review in chunk:
+                repo.save(review)
+
+        workers = [
+            threading.Thread(target=write, args=(reviews[i::threads],)) for i in range(threads)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        # Count the final flush, so 'off' and 'interval' pay for durability too
+        repo.close()
+        return writes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--writes", type=int, default=5000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    os.environ["USE_DATABASE"] = "false"
+
+    print(f"{'mode':>14} {'threads':>8} {'writes/s':>10}")
+    for mode, interval_ms in MODES:
+        label = f"{mode} {interval_ms}ms" if interval_ms else mode
+        for threads in args.threads:
+            throughput = run(mode, interval_ms, args.writes, threads)
+            print(f"{label:>14} {threads:>8} {throughput:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+""" Snapshot size and speed per file storage format
+
+Builds N place records and, for each storage format, times writing them
+to a snapshot and streaming them back, and prints the file size.
+
+    python -m benchmarks.file_formats [--records 100000 1000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from uuid import uuid4
+
+from src.models.place import Place
+from src.persistence.file import DataManager
+from src.persistence.records import to_record
+from src.persistence.serializers import SERIALIZERS
+
+
+def make_records(count: int) -> list:
+    rng = random.Random(0)
+    records = []
+    for _ in range(count):
+        place = Place({
+            "name": "Loft", "description": "Bright loft near the beach", "address": "Rambla 1234",
+            "latitude": rng.uniform(-90, 90), "longitude": rng.uniform(-180, 180),
+            "user_id": str(uuid4()), "city_id": str(uuid4()), "price_per_night": rng.randint(20, 500),
+            "number_of_rooms": rng.randint(1, 5), "number_of_bathrooms": rng.randint(1, 3),
+            "max_guests": rng.randint(1, 10),
+        })
+        records.append(to_record(place))
+    return records
+
+
+def run(name: str, records: list, tmpdir: str) -> tuple[float, float, int]:
+    serializer = SERIALIZERS[name]
+    path = os.path.join(tmpdir, f"data.{name}")
+
+    start = time.perf_counter()
+    with open(path, "w" + serializer.mode) as file:
+        serializer.dump({"place": records}, file)
+    save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(path, "r" + serializer.mode) as file:
+        for _ in serializer.load(file, DataManager.models):
+            pass
+    load = time.perf_counter() - start
+
+    return save, load, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'records':>9} {'format':>8} {'save s':>8} {'load s':>8} {'size MiB':>9}")
+    for count in args.records:
+        records = make_records(count)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in SERIALIZERS:
+                save, load, size = run(name, records, tmpdir)
+                print(f"{count:>9} {name:>8} {save:>8.2f} {load:>8.2f} {size / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
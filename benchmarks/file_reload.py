@@ -0,0 +1,100 @@
+""" Startup cost of the file repository
+
+Writes N reviews and N / 10 places in each storage layout, then reloads
+them in a fresh process and prints the startup time, the time until every
+model is in memory, and the peak RSS. json.load of the single-file JSON
+snapshot is shown for comparison.
+
+    python -m benchmarks.file_reload [--records 100000] [--workers 4] [--buckets 8]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from src.models.place import Place
+from src.models.review import Review
+from src.persistence.file import DataManager
+from src.persistence.streaming import peak_rss_bytes
+
+
+def reload(filename: str, options: dict) -> tuple[float, float, int]:
+    os.environ["USE_DATABASE"] = "false"
+    start = time.perf_counter()
+    repo = DataManager(filename=filename, **options)
+    startup = time.perf_counter() - start
+    for model in DataManager.models:
+        repo.get_all(model)
+    return startup, time.perf_counter() - start, peak_rss_bytes()
+
+
+def json_load(filename: str, options: dict) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    with open(filename) as file:
+        json.load(file)
+    seconds = time.perf_counter() - start
+    return seconds, seconds, peak_rss_bytes()
+
+
+def in_fresh_process(function, filename: str, options: dict) -> tuple[float, float, int]:
+    # A new interpreter each time, so the peak RSS of one run does not hide the other
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(function, filename, options).result()
+
+
+def write(filename: str, objects: list, options: dict) -> None:
+    repo = DataManager(
+        filename=filename, max_journal_bytes=2**62, max_journal_entries=2**62, durability="off", **options
+    )
+    for obj in objects:
+        repo.save(obj)
+    repo.compact()
+    repo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--buckets", type=int, default=8)
+    args = parser.parse_args()
+
+    os.environ["USE_DATABASE"] = "false"
+
+    objects = [
+        Review(place_id=f"place-{i % 1000}", user_id=f"user-{i % 500}", comment="Great stay", rating=5)
+        for i in range(args.records)
+    ] + [
+        Place({"name": "Loft", "address": "Rambla 1234", "city_id": "city", "user_id": "user"})
+        for _ in range(args.records // 10)
+    ]
+    sharded = {"layout": "sharded", "buckets": args.buckets}
+    variants = (
+        ("json.load only", "json", {"storage_format": "json"}, {}, json_load),
+        ("single json", "json", {"storage_format": "json"}, {}, reload),
+        ("single binary", "binary", {"storage_format": "binary"}, {}, reload),
+        ("sharded lazy", "sharded", sharded, {}, reload),
+        (f"sharded {args.workers} workers", "sharded", sharded, {"reload_workers": args.workers}, reload),
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filenames = {}
+        for _, name, write_options, _, _ in variants:
+            if name not in filenames:
+                filenames[name] = os.path.join(tmpdir, name, "data.json")
+                os.mkdir(os.path.dirname(filenames[name]))
+                write(filenames[name], objects, write_options)
+
+        print(f"{len(objects)} records, {os.cpu_count()} CPUs")
+        print(f"{'load':>20} {'startup s':>10} {'all loaded s':>13} {'peak RSS MiB':>13}")
+        for label, name, write_options, read_options, function in variants:
+            startup, loaded, peak = in_fresh_process(function, filenames[name], {**write_options, **read_options})
+            print(f"{label:>20} {startup:>10.2f} {loaded:>13.2f} {peak / 2**20:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+""" Query latency of the database repository with and without the indexes migration
+
+Seeds a SQLite database with countries, cities, users, places and reviews,
+downgrades it to the revision before the foreign-key and sort indexes, and
+times the repository queries the controllers run: children by foreign key
+and keyset pages. It then upgrades to head with the real migration and
+times them again.
+
+    python -m benchmarks.index_latency [--places 20000] [--reviews 200000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import insert
+
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.city import City
+from src.models.country import Country
+from src.models.place import Place
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.db import DBRepository
+from src.persistence.indexes import page_key
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BEFORE_INDEXES = "18c39446000d"
+PAGE_LIMIT = 50
+
+
+def seed(counts: dict, rng: random.Random) -> dict:
+    """Insert rows with Core statements and return the keys the queries pick from"""
+    start = datetime(2024, 1, 1)
+
+    def created(i: int) -> datetime:
+        return start + timedelta(seconds=i)
+
+    countries = [f"{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(counts["countries"])]
+    db.session.execute(insert(Country.__table__), [{"code": code, "name": code} for code in countries])
+
+    # City ids are integer columns
+    cities = list(range(1, counts["cities"] + 1))
+    db.session.execute(insert(City.__table__), [
+        {"id": i, "name": f"City {i}", "country_code": rng.choice(countries), "created_at": created(i)}
+        for i in cities
+    ])
+
+    users = [f"user-{i}" for i in range(counts["users"])]
+    db.session.execute(insert(User.__table__), [
+        {
+            "id": user, "email": f"{user}@example.com", "password": "x", "first_name": "Ana",
+            "last_name": "Diaz", "is_admin": False, "created_at": created(i), "updated_at": created(i),
+        }
+        for i, user in enumerate(users)
+    ])
+
+    places = [f"place-{i}" for i in range(counts["places"])]
+    db.session.execute(insert(Place.__table__), [
+        {
+            "id": place, "name": place, "address": "Rambla 1234", "latitude": 0.0, "longitude": 0.0,
+            "user_id": rng.choice(users), "city_id": str(rng.choice(cities)), "price_per_night": 100,
+            "number_of_rooms": 1, "number_of_bathrooms": 1, "max_guests": 2, "created_at": created(i),
+        }
+        for i, place in enumerate(places)
+    ])
+
+    # Review ids are integer columns
+    for batch in range(0, counts["reviews"], 50_000):
+        db.session.execute(insert(Review.__table__), [
+            {
+                "id": i + 1, "place_id": rng.choice(places), "user_id": rng.choice(users),
+                "rating": rng.randint(1, 5), "comment": "Nice", "created_at": created(i),
+            }
+            for i in range(batch, min(batch + 50_000, counts["reviews"]))
+        ])
+
+    db.session.commit()
+    return {"countries": countries, "cities": cities, "users": users, "places": places}
+
+
+def queries(repo: DBRepository, keys: dict) -> dict:
+    """The repository calls to time, each taking a random generator"""
+    places = repo.page("place", limit=len(keys["places"]))
+    cursors = [page_key(place) for place in places]
+    db.session.remove()
+
+    return {
+        "reviews for place": lambda rng: repo.find("review", place_id=rng.choice(keys["places"])),
+        "reviews by user": lambda rng: repo.find("review", user_id=rng.choice(keys["users"])),
+        "cities in country": lambda rng: repo.find("city", country_code=rng.choice(keys["countries"])),
+        "places in city": lambda rng: repo.find("place", city_id=str(rng.choice(keys["cities"]))),
+        "places by host": lambda rng: repo.find("place", user_id=rng.choice(keys["users"])),
+        "review count for place": lambda rng: repo.count("review", place_id=rng.choice(keys["places"])),
+        "first page of reviews": lambda rng: repo.page("review", limit=PAGE_LIMIT, order="desc"),
+        "page of places": lambda rng: repo.page("place", rng.choice(cursors), limit=PAGE_LIMIT),
+    }
+
+
+def measure(calls: dict, count: int, seed_value: int) -> dict:
+    """Median milliseconds of each call over count runs"""
+    results = {}
+    for name, call in calls.items():
+        rng = random.Random(seed_value)
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            call(rng)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.session.remove()
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--countries", type=int, default=50)
+    parser.add_argument("--cities", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--places", type=int, default=20_000)
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    counts = {
+        "countries": args.countries, "cities": args.cities, "users": args.users,
+        "places": args.places, "reviews": args.reviews,
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        uri = f"sqlite:///{os.path.join(tmpdir, 'hbnb.db')}"
+        config = type("BenchmarkConfig", (TestingConfig,), {"SQLALCHEMY_DATABASE_URI": uri})
+        alembic = AlembicConfig(os.path.join(ROOT, "alembic.ini"))
+        alembic.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+        alembic.set_main_option("sqlalchemy.url", uri)
+
+        with create_app(config).app_context():
+            db.create_all()
+            start = time.perf_counter()
+            keys = seed(counts, random.Random(args.seed))
+            print(f"Seeded {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s")
+
+            # create_all built the indexes the models declare, so go back to before them
+            command.stamp(alembic, "head")
+            command.downgrade(alembic, BEFORE_INDEXES)
+            repo = DBRepository()
+            without = measure(queries(repo, keys), args.queries, args.seed)
+
+            command.upgrade(alembic, "head")
+            with_indexes = measure(queries(repo, keys), args.queries, args.seed)
+
+            db.session.remove()
+            db.engine.dispose()
+
+    print(f"\n{'query':<24} {'no indexes':>12} {'indexes':>12} {'speedup':>9}")
+    for name in without:
+        before, after = without[name], with_indexes[name]
+        print(f"{name:<24} {before:>10.3f}ms {after:>10.3f}ms {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+""" Stress benchmark for the thread-safe MemoryRepository
+
+Readers call get/get_by/get_all in a loop while writer threads save and
+delete reviews, for --duration seconds per reader count. Prints read and
+write throughput per reader count, then checks that every write landed
+and that the indexes agree with the stored objects.
+
+Under CPython's GIL only one thread runs Python code at a time, so the
+threads never read in parallel. Reads/s still change with the reader
+count, mostly because more readers win a larger share of the GIL from
+the writers, whose writes/s fall accordingly. The "scaling" column thus
+measures GIL scheduling and lock overhead, not parallel speedup; run it
+on a free-threaded build to see how the lock design itself scales.
+
+    python -m benchmarks.memory_concurrency [--duration 2] [--places 1000]
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from src.models.review import Review
+from src.persistence.memory import MemoryRepository
+
+WRITERS = 2
+
+
+def seed(repo: MemoryRepository, places: int) -> list[str]:
+    place_ids = [f"place-{i}" for i in range(places)]
+    for place_id in place_ids:
+        for i in range(5):
+            repo.save(Review(place_id=place_id, user_id=f"user-{i}", comment="Seed", rating=4))
+    return place_ids
+
+
+def reader(repo, place_ids, stop, counts, slot):
+    rng = random.Random(slot)
+    ops = 0
+    while not stop.is_set():
+        place_id = rng.choice(place_ids)
+        for review in repo.get_by("review", "place_id", place_id):
+            repo.get("review", review.id)
+        ops += 1
+        if ops % 500 == 0:
+            repo.get_all("country")
+    counts[slot] = ops
+
+
+def writer(repo, place_ids, stop, counts, slot, kept):
+    rng = random.Random(1000 + slot)
+    writes = 0
+    while not stop.is_set():
+        review = Review(place_id=rng.choice(place_ids), user_id=f"writer-{slot}", comment="New", rating=3)
+        repo.save(review)
+        # Delete every other review so saves and deletes interleave
+        if writes % 2:
+            assert repo.delete(review)
+        else:
+            kept.append(review.id)
+        writes += 1
+    counts[slot] = writes
+
+
+def run(readers: int, duration: float, places: int) -> tuple[float, float, bool]:
+    repo = MemoryRepository(thread_safe=True)
+    place_ids = seed(repo, places)
+    seeded = len(repo.get_all("review"))
+
+    stop = threading.Event()
+    counts = [0] * readers
+    writes = [0] * WRITERS
+    kept: list[str] = []
+
+    threads = [
+        threading.Thread(target=reader, args=(repo, place_ids, stop, counts, i))
+        for i in range(readers)
+    ]
+    writers = [
+        threading.Thread(target=writer, args=(repo, place_ids, stop, writes, i, kept))
+        for i in range(WRITERS)
+    ]
+
+    start = time.perf_counter()
+    for t in threads + writers:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads + writers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    reviews = repo.get_all("review")
+    indexed = sum(len(repo.get_by("review", "place_id", p)) for p in place_ids)
+    consistent = (
+        len(reviews) == seeded + len(kept) == indexed
+        and all(repo.get("review", review_id) for review_id in kept)
+    )
+
+    return sum(counts) / elapsed, sum(writes) / elapsed, consistent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--places", type=int, default=1000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'readers':>8} {'reads/s':>12} {'scaling':>8} {'writes/s':>10} {'writes ok':>10}")
+    baseline = None
+    for readers in args.threads:
+        throughput, write_throughput, consistent = run(readers, args.duration, args.places)
+        baseline = baseline or throughput
+        print(
+            f"{readers:>8} {throughput:>12.0f} {throughput / baseline:>7.2f}x "
+            f"{write_throughput:>10.0f} {str(consistent):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+""" Multi-criteria place search: columnar store vs per-object filtering
+
+Loads N synthetic places into a MemoryRepository with the columnar place
+store enabled and times the same search through numpy masks and through
+the per-place Python check.
+
+    python -m benchmarks.place_search [--places 1000000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+
+from src.models.place import Place
+from src.persistence.criteria import matches, parse_criteria
+from src.persistence.memory import MemoryRepository
+
+CRITERIA = {
+    "price_per_night__gte": 80,
+    "price_per_night__lte": 150,
+    "max_guests__gte": 4,
+    "number_of_rooms__in": [2, 3],
+    "latitude__gt": -35.0,
+    "latitude__lt": -34.0,
+}
+
+
+def load(repo: MemoryRepository, count: int) -> None:
+    rng = random.Random(0)
+    for _ in range(count):
+        repo.save(Place(data={
+            "name": "Place",
+            "city_id": "city",
+            "user_id": "user",
+            "latitude": rng.uniform(-36, -30),
+            "longitude": rng.uniform(-58, -53),
+            "price_per_night": rng.randint(20, 400),
+            "number_of_rooms": rng.randint(1, 5),
+            "number_of_bathrooms": rng.randint(1, 3),
+            "max_guests": rng.randint(1, 10),
+        }))
+
+
+def timed(func, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--places", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    repo = MemoryRepository(columnar_places=True)
+    start = time.perf_counter()
+    load(repo, args.places)
+    print(f"Loaded {args.places} places in {time.perf_counter() - start:.1f}s")
+
+    conditions = parse_criteria(CRITERIA)
+    columnar_ms, hits = timed(lambda: repo.search_places(**CRITERIA), args.repeat)
+    python_ms, python_hits = timed(
+        lambda: [p for p in repo.snapshot("place") if matches(p, conditions)], args.repeat
+    )
+    assert hits == python_hits
+
+    print(f"{'path':>10} {'best ms':>10} {'matches':>10}")
+    print(f"{'columnar':>10} {columnar_ms:>10.1f} {hits:>10}")
+    print(f"{'python':>10} {python_ms:>10.1f} {python_hits:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+""" Memory per stored object: model instances vs slotted records
+
+Builds N places and N reviews the way the memory and file repositories
+used to hold them (SQLAlchemy model instances) and the way they hold them
+now (Records), and prints the bytes allocated per object for each.
+
+    python -m benchmarks.record_memory [--count 20000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from src.models.place import Place
+from src.models.review import Review
+from src.persistence.records import to_record
+
+
+def make_place(i: int) -> Place:
+    return Place(data={
+        "name": f"Place {i}",
+        "description": "A place to stay",
+        "address": f"{i} Main Street",
+        "city_id": "city",
+        "user_id": "user",
+        "latitude": -34.9,
+        "longitude": -56.2,
+        "price_per_night": 100,
+        "number_of_rooms": 2,
+        "number_of_bathrooms": 1,
+        "max_guests": 4,
+    })
+
+
+def make_review(i: int) -> Review:
+    return Review(place_id="place", user_id="user", comment=f"Review {i}", rating=4)
+
+
+def measure(build, count: int) -> float:
+    """Bytes allocated per object by build(i), with the objects kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+
+    # Warm up the record types so their creation is not measured
+    to_record(make_place(0))
+    to_record(make_review(0))
+
+    print(f"{'model':>8} {'instance B':>12} {'record B':>10} {'saving':>8}")
+    for name, make in (("place", make_place), ("review", make_review)):
+        instance_bytes = measure(make, args.count)
+        # The instance is freed as soon as its record is built, so only the
+        # record and the values it references stay allocated
+        record_bytes = measure(lambda i: to_record(make(i)), args.count)
+        print(
+            f"{name:>8} {instance_bytes:>12.0f} {record_bytes:>10.0f} "
+            f"{1 - record_bytes / instance_bytes:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
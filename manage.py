@@ -1,8 +1,65 @@
+import time
+
+import click
 from flask.cli import FlaskGroup
 from src import create_app
 
 cli = FlaskGroup(create_app=create_app)
 
 
+@cli.command("compact")
+def compact():
+    """Compact the file storage into a fresh snapshot.
+
+    Run it while the app is stopped: a running app keeps its own journal open.
+    """
+    from src.persistence.file import DataManager
+
+    start = time.perf_counter()
+    repo = DataManager()
+    replay_before = time.perf_counter() - start
+
+    if repo.use_database:
+        raise click.ClickException("USE_DATABASE is set, there is no file storage to compact")
+
+    before = repo.storage_stats()
+    repo.compact()
+    after = repo.storage_stats()
+
+    start = time.perf_counter()
+    DataManager()
+    replay_after = time.perf_counter() - start
+
+    click.echo(f"{'':<10} {'snapshot B':>12} {'journal B':>12} {'reload s':>10}")
+    click.echo(
+        f"{'before':<10} {before['snapshot_bytes']:>12} {before['journal_bytes']:>12} {replay_before:>10.3f}"
+    )
+    click.echo(
+        f"{'after':<10} {after['snapshot_bytes']:>12} {after['journal_bytes']:>12} {replay_after:>10.3f}"
+    )
+
+
+@cli.command("convert")
+@click.argument("storage_format", type=click.Choice(["json", "binary"]))
+def convert(storage_format):
+    """Rewrite the file storage snapshot in another format.
+
+    The snapshot is loaded in whatever format it is in and compacted in STORAGE_FORMAT.
+    Set FILE_STORAGE_FORMAT to the same format so later compactions keep it.
+    """
+    from src.persistence.file import DataManager
+
+    repo = DataManager(storage_format=storage_format)
+
+    if repo.use_database:
+        raise click.ClickException("USE_DATABASE is set, there is no file storage to convert")
+
+    before = repo.storage_stats()
+    repo.compact()
+    after = repo.storage_stats()
+
+    click.echo(f"Snapshot converted to {storage_format}: {before['snapshot_bytes']} B -> {after['snapshot_bytes']} B")
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,59 @@
+"""lowercase user emails
+
+Revision ID: 3c7a8e5f1b20
+Revises: 9d4f1a6c2e87
+Create Date: 2026-10-18 21:42:10.518307
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7a8e5f1b20'
+down_revision: Union[str, None] = '9d4f1a6c2e87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def normalize_email(email: str) -> str:
+    """As User.normalize_email, frozen here so later changes to the model do not alter this migration"""
+    return email.strip().lower()
+
+
+def upgrade() -> None:
+    # get_by_email looks up the normalized email, so emails stored before it
+    # normalized them on write would never be found
+    connection = op.get_bind()
+    users = sa.table('users', sa.column('id', sa.String), sa.column('email', sa.String))
+
+    by_email: dict[str, list] = {}
+    for user_id, email in connection.execute(sa.select(users.c.id, users.c.email)):
+        by_email.setdefault(normalize_email(email), []).append((user_id, email))
+
+    updates = []
+    for normalized, rows in by_email.items():
+        if len(rows) > 1:
+            # Normalizing these would break the unique constraint; which account to keep is for a person to decide
+            logging.getLogger('alembic.runtime.migration').warning(
+                'Not normalizing %s: they collide as %s', ', '.join(f'{email} ({user_id})' for user_id, email in rows),
+                normalized,
+            )
+            continue
+        user_id, email = rows[0]
+        if email != normalized:
+            updates.append({'user_id': user_id, 'normalized': normalized})
+
+    if updates:
+        connection.execute(
+            users.update().where(users.c.id == sa.bindparam('user_id')).values(email=sa.bindparam('normalized')),
+            updates,
+        )
+
+
+def downgrade() -> None:
+    # The original case of the emails is not kept
+    pass
@@ -0,0 +1,62 @@
+"""add foreign key and sort indexes
+
+Revision ID: 5b2e9c7d41a3
+Revises: 18c39446000d
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9c7d41a3'
+down_revision: Union[str, None] = '18c39446000d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, columns) of each index, named as the models declare them
+INDEXES: list[tuple[str, list[str]]] = [
+    ('reviews', ['place_id']),
+    ('reviews', ['user_id']),
+    ('places', ['city_id']),
+    ('places', ['user_id']),
+    ('cities', ['country_code']),
+    ('amenities', ['place_id']),
+    ('place_amenity', ['place_id']),
+    ('place_amenity', ['amenity_id']),
+    # Keyset pagination orders and seeks by (created_at, id)
+    ('users', ['created_at', 'id']),
+    ('cities', ['created_at', 'id']),
+    ('places', ['created_at', 'id']),
+    ('amenities', ['created_at', 'id']),
+    ('reviews', ['created_at', 'id']),
+    ('place_amenity', ['created_at', 'id']),
+]
+
+
+def index_name(table: str, columns: list[str]) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def upgrade() -> None:
+    # Built outside the migration transaction so Postgres can build them
+    # concurrently, without locking the tables against writes
+    with op.get_context().autocommit_block():
+        for table, columns in INDEXES:
+            op.create_index(
+                index_name(table, columns), table, columns,
+                if_not_exists=True, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in reversed(INDEXES):
+            op.drop_index(
+                index_name(table, columns), table_name=table,
+                if_exists=True, postgresql_concurrently=True,
+            )
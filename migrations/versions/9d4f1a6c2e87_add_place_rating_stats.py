@@ -0,0 +1,60 @@
+"""add place rating stats
+
+Revision ID: 9d4f1a6c2e87
+Revises: 5b2e9c7d41a3
+Create Date: 2026-10-18 14:03:27.164922
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1a6c2e87'
+down_revision: Union[str, None] = '5b2e9c7d41a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'place_rating_stats',
+        sa.Column('place_id', sa.String(length=36), nullable=False),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Float(), nullable=False),
+        sa.Column('rating_1', sa.Integer(), nullable=False),
+        sa.Column('rating_2', sa.Integer(), nullable=False),
+        sa.Column('rating_3', sa.Integer(), nullable=False),
+        sa.Column('rating_4', sa.Integer(), nullable=False),
+        sa.Column('rating_5', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['place_id'], ['places.id'], ),
+        sa.PrimaryKeyConstraint('place_id'),
+        # db.create_all at app start may have created it already, empty
+        if_not_exists=True,
+    )
+
+    # Backfill from the existing reviews, bucketing ratings as
+    # src/persistence/ratings.star does: rounded half up, clamped to 1-5.
+    # Rows the app wrote before the upgrade are recomputed too
+    op.execute('DELETE FROM place_rating_stats')
+    op.execute(
+        """
+        INSERT INTO place_rating_stats
+            (place_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5)
+        SELECT place_id, COUNT(*), SUM(rating),
+            SUM(CASE WHEN rating < 1.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 1.5 AND rating < 2.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 2.5 AND rating < 3.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 3.5 AND rating < 4.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 4.5 THEN 1 ELSE 0 END)
+        FROM reviews
+        WHERE place_id IS NOT NULL AND rating IS NOT NULL
+        GROUP BY place_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('place_rating_stats')
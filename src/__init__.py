@@ -6,11 +6,12 @@ from flask_bcrypt import Bcrypt
 import os
 from dotenv import load_dotenv
 from src.config import DevelopmentConfig, ProductionConfig, TestingConfig
+from src.replicas import RoutingSession
 
 load_dotenv()
 
 cors = CORS()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 bcrypt = Bcrypt()
 
@@ -19,7 +20,74 @@ def create_app(config_class=None) -> Flask:
     print("Creating app...")
     app = Flask(__name__)
     app.url_map.strict_slashes = False
-    
+
+    load_config(app, config_class)
+
+    register_extensions(app)
+    register_routes(app)
+    register_handlers(app)
+
+    print("Registered routes:")
+    for rule in app.url_map.iter_rules():
+        print(f"{rule.endpoint}: {rule.rule}")
+
+    return app
+
+def create_asgi_app(config_class=None):
+    """
+    Create the ASGI app, serving the async controllers with an AsyncDBRepository
+    so each process holds many requests waiting on the database at once.
+    Run it with an ASGI server, see asgi.py.
+    """
+    from quart import Quart
+    from src.persistence.async_db import AsyncDBRepository
+    from src.persistence.engine import install_sqlite_pragmas
+    from src.routes.aio import blueprints
+
+    print("Creating ASGI app...")
+    app = Quart(__name__)
+    app.url_map.strict_slashes = False
+
+    load_config(app, config_class)
+
+    register_async_extensions(app)
+
+    repository = AsyncDBRepository(app.config)
+    install_sqlite_pragmas(app, [repository.engine.sync_engine])
+    app.extensions["repository"] = repository
+
+    @app.before_serving
+    async def create_tables() -> None:
+        await repository.create_all()
+
+    @app.teardown_request
+    async def remove_session(error: BaseException | None) -> None:
+        await repository.remove_session()
+
+    @app.after_serving
+    async def dispose_engine() -> None:
+        await repository.dispose()
+
+    for blueprint in blueprints:
+        app.register_blueprint(blueprint)
+    register_handlers(app)
+
+    return app
+
+def register_async_extensions(app) -> None:
+    """
+    Set up the extensions the async controllers use. flask_jwt_extended reads
+    flask.current_app, which Quart never binds, so JWTs are issued in the
+    context of a bare Flask app that shares the config of the ASGI app, and
+    stay valid on the WSGI app.
+    """
+    bcrypt.init_app(app)
+    jwt_app = Flask(__name__)
+    jwt_app.config.update(app.config)
+    jwt.init_app(jwt_app)
+    app.extensions["jwt_app"] = jwt_app
+
+def load_config(app, config_class=None) -> None:
     env = os.getenv('ENV', 'development')
 
     if env == 'development':
@@ -35,22 +103,20 @@ def create_app(config_class=None) -> Flask:
     # Use get method with a default value to avoid KeyError
     print(f"Using config: {app.config.get('ENV', 'undefined')}")
 
-    register_extensions(app)
-    register_routes(app)
-    register_handlers(app)
-
-    print("Registered routes:")
-    for rule in app.url_map.iter_rules():
-        print(f"{rule.endpoint}: {rule.rule}")
-
-    return app
-
 def register_extensions(app: Flask) -> None:
     print("Registering extensions...")
     cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
+    from src import replicas
+    from src.persistence.engine import engine_options, install_sqlite_pragmas
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
     db.init_app(app)
+    replica_engines = replicas.init_app(app)
+    with app.app_context():
+        install_sqlite_pragmas(app, [*db.engines.values(), *replica_engines])
     jwt.init_app(app)
     bcrypt.init_app(app)
+    from src.persistence.db import DBRepository
+    DBRepository.init_app(app)
     with app.app_context():
         db.create_all()
     print("Extensions registered")
@@ -73,7 +139,7 @@ def register_routes(app: Flask) -> None:
     
     print("Routes registered")
 
-def register_handlers(app: Flask) -> None:
+def register_handlers(app) -> None:
     print("Registering error handlers...")
     app.register_error_handler(404, lambda e: (
         {"error": "Not found", "message": str(e)}, 404
@@ -16,6 +16,24 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'hohohoitsasecret')
     JWT_ACCESS_TOKEN_EXPIRES = 3600
     SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_DATABASE_URI', 'sqlite:///hbnb.db')
+    # Flush repository writes during a request and commit once when it ends,
+    # instead of committing each write; a 4xx or 5xx then rolls them all back
+    DB_UNIT_OF_WORK = os.getenv('DB_UNIT_OF_WORK', 'false').lower() == 'true'
+    # Connection pool, see src/persistence/engine.py
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    # Whole seconds, engine_from_config casts it to int
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    # Comma-separated read replicas of SQLALCHEMY_DATABASE_URI, see src/replicas.py
+    DB_REPLICA_URIS = [uri.strip() for uri in os.getenv('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+    # PRAGMAs run on every new SQLite connection
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    # Negative sizes are in KiB
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))
 
 class DevelopmentConfig(Config):
     DEBUG = True
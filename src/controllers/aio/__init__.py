@@ -0,0 +1,23 @@
+""" Async versions of the controllers, served by the app of create_asgi_app
+
+They read and write through the AsyncRepository of the app instead of the
+model classmethods, which call the blocking src.persistence.db.
+"""
+
+from flask.ctx import AppContext
+from quart import current_app
+
+from src.persistence.repository import AsyncRepository
+
+
+def repository() -> AsyncRepository:
+    """Get the repository of the current ASGI app"""
+    return current_app.extensions["repository"]
+
+
+def jwt_context() -> AppContext:
+    """
+    Get an app context in which flask_jwt_extended can create tokens, see
+    register_async_extensions. Do not await inside it.
+    """
+    return current_app.extensions["jwt_app"].app_context()
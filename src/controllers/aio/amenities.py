@@ -0,0 +1,19 @@
+from quart import abort
+from src.controllers.aio import repository
+from src.controllers.aio.pagination import paginate
+from src.models.amenity import Amenity
+
+
+async def get_amenities():
+    amenities, headers = await paginate("amenity")
+
+    return [amenity.to_dict() for amenity in amenities], 200, headers
+
+
+async def get_amenity_by_id(amenity_id: str):
+    amenity: Amenity | None = await repository().get("amenity", amenity_id)
+
+    if not amenity:
+        abort(404, f"Amenity with ID {amenity_id} not found")
+
+    return amenity.to_dict()
@@ -0,0 +1,19 @@
+from quart import abort
+from src.controllers.aio import repository
+from src.controllers.aio.pagination import paginate
+from src.models.city import City
+
+
+async def get_cities():
+    cities, headers = await paginate("city")
+
+    return [city.to_dict() for city in cities], 200, headers
+
+
+async def get_city_by_id(city_id: str):
+    city: City | None = await repository().get("city", city_id)
+
+    if not city:
+        abort(404, f"City with ID {city_id} not found")
+
+    return city.to_dict()
@@ -0,0 +1,30 @@
+from quart import abort
+from src.controllers.aio import repository
+from src.models.city import City
+from src.models.country import Country
+
+
+async def get_countries():
+    countries: list[Country] = await repository().get_all("country")
+
+    return [country.to_dict() for country in countries]
+
+
+async def get_country_by_code(code: str):
+    country: Country | None = await repository().get("country", code)
+
+    if not country:
+        abort(404, f"Country with ID {code} not found")
+
+    return country.to_dict()
+
+
+async def get_country_cities(code: str):
+    country: Country | None = await repository().get("country", code)
+
+    if not country:
+        abort(404, f"Country with ID {code} not found")
+
+    cities: list[City] = await repository().find("city", country_code=country.code)
+
+    return [city.to_dict() for city in cities]
@@ -0,0 +1,15 @@
+from quart import abort, request
+
+from src.controllers.aio import repository
+from src.controllers.pagination import page_args, trim_page
+
+
+async def paginate(model_name: str) -> tuple[list, dict]:
+    """Get the objects of a list endpoint and its response headers, as src.controllers.pagination.paginate does"""
+    try:
+        after, limit, order = page_args(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    # One extra object tells whether there is a next page
+    return trim_page(await repository().page(model_name, after, limit + 1, order), limit, order)
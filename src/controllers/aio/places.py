@@ -0,0 +1,31 @@
+from quart import abort, request
+from src.controllers.aio import repository
+from src.controllers.aio.pagination import paginate
+from src.controllers.places import parse_expand, place_detail_to_dict
+from src.models.place import Place
+
+
+async def get_places():
+    places, headers = await paginate("place")
+
+    return [place.to_dict() for place in places], 200, headers
+
+
+async def get_place_by_id(place_id: str):
+    try:
+        expand = parse_expand(request.args.get("expand", ""))
+    except ValueError as e:
+        abort(400, str(e))
+
+    if not expand:
+        place: Place | None = await repository().get("place", place_id)
+        if not place:
+            abort(404, f"Place with ID {place_id} not found")
+        return place.to_dict(), 200
+
+    detail = await repository().get_place_detail(place_id, expand)
+
+    if not detail:
+        abort(404, f"Place with ID {place_id} not found")
+
+    return place_detail_to_dict(detail), 200
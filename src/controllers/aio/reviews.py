@@ -0,0 +1,65 @@
+from quart import abort, request
+from src.controllers.aio import repository
+from src.controllers.aio.pagination import paginate
+from src.models.review import Review
+
+
+async def get_reviews():
+    reviews, headers = await paginate("review")
+
+    return [review.to_dict() for review in reviews], 200, headers
+
+
+async def get_reviews_from_place(place_id: str):
+    reviews = await repository().find("review", place_id=place_id)
+
+    return [review.to_dict() for review in reviews], 200
+
+
+async def get_place_review_stats(place_id: str):
+    if not await repository().get("place", place_id):
+        abort(404, f"Place with ID {place_id} not found")
+
+    return await repository().get_rating_stats(place_id), 200
+
+
+async def get_reviews_from_user(user_id: str):
+    reviews = await repository().find("review", user_id=user_id)
+
+    return [review.to_dict() for review in reviews], 200
+
+
+async def get_review_by_id(review_id: str):
+    review: Review | None = await repository().get("review", review_id)
+
+    if not review:
+        abort(404, f"Review with ID {review_id} not found")
+
+    return review.to_dict(), 200
+
+
+async def update_review(review_id: str):
+    data = await request.get_json()
+
+    review: Review | None = await repository().get("review", review_id)
+
+    if not review:
+        abort(404, f"Review with ID {review_id} not found")
+
+    for key, value in data.items():
+        setattr(review, key, value)
+
+    await repository().update(review)
+
+    return review.to_dict(), 200
+
+
+async def delete_review(review_id: str):
+    review: Review | None = await repository().get("review", review_id)
+
+    if not review:
+        abort(404, f"Review with ID {review_id} not found")
+
+    await repository().delete(review)
+
+    return "", 204
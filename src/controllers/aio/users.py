@@ -0,0 +1,54 @@
+import asyncio
+
+from flask_jwt_extended import create_access_token
+from quart import abort, request
+from src.controllers.aio import jwt_context, repository
+from src.controllers.aio.pagination import paginate
+from src.models.user import User
+
+
+async def get_users():
+    users, headers = await paginate("user")
+
+    return [user.to_dict() for user in users], 200, headers
+
+
+async def create_user():
+    data = await request.get_json()
+
+    try:
+        if await repository().get_by_email(data["email"]):
+            abort(400, "User already exists")
+        # Hashing the password takes a while, so keep it off the event loop
+        user = await asyncio.to_thread(lambda: User(**data))
+    except KeyError as e:
+        abort(400, f"Missing field: {e}")
+    except (TypeError, ValueError) as e:
+        # TypeError when a field of the User constructor is missing or unknown
+        abort(400, str(e))
+
+    await repository().save(user)
+
+    return user.to_dict(), 201
+
+
+async def login():
+    data = await request.get_json()
+
+    user: User | None = await repository().get_by_email(data.get("email"))
+
+    if user and await asyncio.to_thread(user.check_password, data.get("password")):
+        with jwt_context():
+            access_token = create_access_token(identity=user.id, additional_claims={"is_admin": user.is_admin})
+        return {"access_token": access_token}, 200
+
+    return {"msg": "Bad username or password"}, 401
+
+
+async def get_user_by_id(user_id: str):
+    user: User | None = await repository().get("user", user_id)
+
+    if not user:
+        abort(404, f"User with ID {user_id} not found")
+
+    return user.to_dict()
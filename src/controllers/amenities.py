@@ -1,11 +1,12 @@
 from flask import abort, request
 from src.models.amenity import Amenity
+from src.controllers.pagination import paginate
 
 
 def get_amenities():
-    amenities: list[Amenity] = Amenity.get_all()
+    amenities, headers = paginate(Amenity)
 
-    return [amenity.to_dict() for amenity in amenities]
+    return [amenity.to_dict() for amenity in amenities], 200, headers
 
 
 def create_amenity():
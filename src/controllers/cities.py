@@ -1,11 +1,12 @@
 from flask import request, abort
 from src.models.city import City
+from src.controllers.pagination import paginate
 
 
 def get_cities():
-    cities: list[City] = City.get_all()
+    cities, headers = paginate(City)
 
-    return [city.to_dict() for city in cities]
+    return [city.to_dict() for city in cities], 200, headers
 
 
 def create_city():
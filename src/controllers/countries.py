@@ -25,10 +25,6 @@ def get_country_cities(code: str):
     if not country:
         abort(404, f"Country with ID {code} not found")
 
-    cities: list[City] = City.get_all()
+    cities: list[City] = City.find(country_code=country.code)
 
-    country_cities = [
-        city.to_dict() for city in cities if city.country_code == country.code
-    ]
-
-    return country_cities
+    return [city.to_dict() for city in cities]
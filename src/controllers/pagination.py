@@ -0,0 +1,59 @@
+from flask import abort, request
+
+from src.persistence.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    MAX_PAGE_LIMIT,
+    ORDERS,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def page_args(args) -> tuple[tuple | None, int, str]:
+    """
+    Get the (after, limit, order) of a page from the query parameters of a
+    request. Without them, it is the first DEFAULT_PAGE_LIMIT objects.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_LIMIT))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+
+    after, order = None, args.get("order", "asc")
+    if "cursor" in args:
+        after, order = decode_cursor(args["cursor"])
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {', '.join(ORDERS)}")
+
+    return after, limit, order
+
+
+def trim_page(objects: list, limit: int, order: str) -> tuple[list, dict]:
+    """Trim the limit + 1 objects fetched for a page, and point X-Next-Cursor past it if there is more"""
+    if len(objects) <= limit:
+        return objects, {}
+
+    objects = objects[:limit]
+    return objects, {"X-Next-Cursor": encode_cursor(objects[-1], order)}
+
+
+def paginate(model) -> tuple[list, dict]:
+    """
+    Get the objects of a list endpoint and its response headers.
+
+    Returns one page of at most ``limit`` objects (DEFAULT_PAGE_LIMIT if not
+    given), ordered by creation time, so no request reads a whole table.
+    The ``X-Next-Cursor`` header holds the cursor of the next page, if any.
+    """
+    try:
+        after, limit, order = page_args(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    # One extra object tells whether there is a next page
+    return trim_page(model.page(after, limit + 1, order), limit, order)
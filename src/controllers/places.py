@@ -1,11 +1,13 @@
 from flask import abort, request
 from src.models.place import Place
+from src.controllers.pagination import paginate
+from src.persistence.repository import PLACE_EXPANSIONS
 
 
 def get_places():
-    places: list[Place] = Place.get_all()
+    places, headers = paginate(Place)
 
-    return [place.to_dict() for place in places], 200
+    return [place.to_dict() for place in places], 200, headers
 
 
 def create_place():
@@ -21,13 +23,49 @@ def create_place():
     return place.to_dict(), 201
 
 
+def parse_expand(value: str) -> list[str]:
+    """
+    Get the related rows an ``expand`` query parameter names.
+
+    Raises:
+        ValueError: If it names something other than PLACE_EXPANSIONS.
+    """
+    expand = [name for name in value.split(",") if name]
+    unknown = set(expand) - set(PLACE_EXPANSIONS)
+    if unknown:
+        raise ValueError(f"Cannot expand {', '.join(sorted(unknown))}; expected any of {', '.join(PLACE_EXPANSIONS)}")
+    return expand
+
+
+def place_detail_to_dict(detail: dict) -> dict:
+    """Serialize a place detail, with the related rows nested in the place"""
+    result = detail.pop("place").to_dict()
+    for name, related in detail.items():
+        if isinstance(related, list):
+            result[name] = [obj.to_dict() for obj in related]
+        else:
+            result[name] = related.to_dict() if related else None
+    return result
+
+
 def get_place_by_id(place_id: str):
-    place: Place | None = Place.get(place_id)
+    try:
+        expand = parse_expand(request.args.get("expand", ""))
+    except ValueError as e:
+        abort(400, str(e))
 
-    if not place:
+    if not expand:
+        place: Place | None = Place.get(place_id)
+        if not place:
+            abort(404, f"Place with ID {place_id} not found")
+        return place.to_dict(), 200
+
+    detail = Place.get_detail(place_id, expand)
+
+    if not detail:
         abort(404, f"Place with ID {place_id} not found")
 
-    return place.to_dict(), 200
+    return place_detail_to_dict(detail), 200
 
 
 def update_place(place_id: str):
@@ -1,11 +1,13 @@
 from flask import abort, request
+from src.models.place import Place
 from src.models.review import Review
+from src.controllers.pagination import paginate
 
 
 def get_reviews():
-    reviews = Review.get_all()
+    reviews, headers = paginate(Review)
 
-    return [review.to_dict() for review in reviews], 200
+    return [review.to_dict() for review in reviews], 200, headers
 
 
 def create_review(place_id: str):
@@ -25,15 +27,22 @@ def create_review(place_id: str):
 
 
 def get_reviews_from_place(place_id: str):
-    reviews = Review.get_all()
+    reviews = Review.find(place_id=place_id)
+
+    return [review.to_dict() for review in reviews], 200
 
-    return [review.to_dict() for review in reviews if review.place_id == place_id], 200
+
+def get_place_review_stats(place_id: str):
+    if not Place.get(place_id):
+        abort(404, f"Place with ID {place_id} not found")
+
+    return Review.get_stats(place_id), 200
 
 
 def get_reviews_from_user(user_id: str):
-    reviews = Review.get_all()
+    reviews = Review.find(user_id=user_id)
 
-    return [review.to_dict() for review in reviews if review.user_id == user_id], 200
+    return [review.to_dict() for review in reviews], 200
 
 
 def get_review_by_id(review_id: str):
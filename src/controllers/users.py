@@ -1,12 +1,13 @@
 from flask import abort, request
 
 from src.models.user import User
+from src.controllers.pagination import paginate
 
 
 def get_users():
-    users = User.get_all()
+    users, headers = paginate(User)
 
-    return [user.to_dict() for user in users]
+    return [user.to_dict() for user in users], 200, headers
 
 
 def create_user():
@@ -1 +1,5 @@
 from .user import User
+# Imported so relationships between models can be resolved by name
+from .place import Place
+from .review import Review
+from .amenity import Amenity, PlaceAmenity
@@ -10,7 +10,7 @@ class Amenity(Base):
     __tablename__ = 'amenities'
 
     id = db.Column(db.String(36), primary_key=True)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False, index=True)
     name = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
@@ -60,8 +60,8 @@ class Amenity(Base):
 
 class PlaceAmenity(Base):
   
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
-    amenity_id = db.Column(db.String(36), db.ForeignKey('amenities.id'), nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False, index=True)
+    amenity_id = db.Column(db.String(36), db.ForeignKey('amenities.id'), nullable=False, index=True)
 
     def __init__(self, place_id: str, amenity_id: str, **kw) -> None:
         super().__init__(**kw)
@@ -85,16 +85,9 @@ class PlaceAmenity(Base):
     def get(place_id: str, amenity_id: str) -> "PlaceAmenity | None":  # type: ignore
         from src.persistence import db
 
-        place_amenities: list[PlaceAmenity] = db.get_all("placeamenity")
+        place_amenities: list[PlaceAmenity] = db.find("placeamenity", place_id=place_id, amenity_id=amenity_id)
 
-        for place_amenity in place_amenities:
-            if (
-                place_amenity.place_id == place_id
-                and place_amenity.amenity_id == amenity_id
-            ):
-                return place_amenity
-
-        return None
+        return place_amenities[0] if place_amenities else None
 
     @staticmethod
     def create(data: dict) -> "PlaceAmenity":
@@ -3,6 +3,7 @@ from typing import Any, Optional
 from uuid import uuid4
 from abc import ABC, abstractmethod
 from sqlalchemy import DateTime, String, Column
+from sqlalchemy.orm import declared_attr
 from sqlalchemy.sql import func
 from src import db
 
@@ -14,6 +15,11 @@ class Base(db.Model):
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
+    @declared_attr.directive
+    def __table_args__(cls) -> tuple:
+        # Keyset pagination orders and seeks by (created_at, id)
+        return (db.Index(f"ix_{cls.__tablename__}_created_at_id", "created_at", "id"),)
+
     def __init__(
         self,
         id: Optional[str] = None,
@@ -43,6 +49,30 @@ class Base(db.Model):
 
         return db.get_all(cls.__name__.lower())
 
+    @classmethod
+    def get_by(cls, field: str, value) -> list["Any"]:
+        from src.persistence import db
+
+        return db.get_by(cls.__name__.lower(), field, value)
+
+    @classmethod
+    def find(cls, **criteria) -> list["Any"]:
+        from src.persistence import db
+
+        return db.find(cls.__name__.lower(), **criteria)
+
+    @classmethod
+    def count(cls, **criteria) -> int:
+        from src.persistence import db
+
+        return db.count(cls.__name__.lower(), **criteria)
+
+    @classmethod
+    def page(cls, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list["Any"]:
+        from src.persistence import db
+
+        return db.page(cls.__name__.lower(), after, limit, order)
+
     @classmethod
     def delete(cls, id) -> bool:
         from src.persistence import db
@@ -11,7 +11,7 @@ class City(Base):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    country_code = db.Column(db.String(2), db.ForeignKey('countries.code'), nullable=False)
+    country_code = db.Column(db.String(2), db.ForeignKey('countries.code'), nullable=False, index=True)
     country = db.relationship('Country', backref=db.backref('cities', lazy=True))
 
     def __init__(self, name: str, country_code: str, **kw) -> None:
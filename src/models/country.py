@@ -32,10 +32,9 @@ class Country(db.Model):
 
     @staticmethod
     def get(code: str) -> "Country | None":
-        for country in Country.get_all():
-            if country.code == code:
-                return country
-        return None
+        from src.persistence import db
+
+        return db.get("country", code)
 
     @staticmethod
     def create(name: str, code: str) -> "Country":
@@ -22,13 +22,19 @@ class Place(Base):
     address = db.Column(db.String(255), nullable=False)  # Address of the place
     latitude = db.Column(db.Float, nullable=False)  # Latitude for location
     longitude = db.Column(db.Float, nullable=False)  # Longitude for location
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)  # Foreign key to Host
-    city_id = db.Column(db.String(36), db.ForeignKey('cities.id'), nullable=False)  # Foreign key to City
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)  # Foreign key to Host
+    city_id = db.Column(db.String(36), db.ForeignKey('cities.id'), nullable=False, index=True)  # Foreign key to City
     price_per_night = db.Column(db.Integer, nullable=False)  # Price per night
     number_of_rooms = db.Column(db.Integer, nullable=False)  # Number of rooms
     number_of_bathrooms = db.Column(db.Integer, nullable=False)  # Number of bathrooms
     max_guests = db.Column(db.Integer, nullable=False)  # Maximum number of guests
 
+    # Related rows, loaded on access unless a query asks for them eagerly (see DBRepository.get_place_detail)
+    city = db.relationship("City", viewonly=True)
+    host = db.relationship("User", viewonly=True)
+    amenities = db.relationship("Amenity", secondary="place_amenity", viewonly=True)
+    reviews = db.relationship("Review", viewonly=True, order_by="Review.created_at")
+
     def __init__(self, data: dict | None = None, **kw) -> None:
         """
         Initialize a Place instance.
@@ -157,6 +163,19 @@ class Place(Base):
 
         return db.get(cls.__name__.lower(), place_id)
 
+    @classmethod
+    def get_detail(cls, place_id: str, expand: list[str]) -> dict | None:
+        """
+        Get a Place instance with the related rows named in expand.
+
+        :param place_id: ID of the Place
+        :param expand: Names out of PLACE_EXPANSIONS: city, host, amenities, reviews
+        :return: {"place": Place} plus one key per expansion, or None if not found
+        """
+        from src.persistence import db
+
+        return db.get_place_detail(place_id, expand)
+
     @classmethod
     def get_all(cls) -> list["Place"]:
         """
@@ -183,3 +202,45 @@ class Place(Base):
             return False
 
         return db.delete(place)
+
+
+class PlaceRatingStats(db.Model):
+    """
+    PlaceRatingStats model:
+    The review rating aggregates of a place, adjusted in the same transaction
+    as every review write (see src/persistence/db.py).
+    """
+
+    __tablename__ = 'place_rating_stats'
+
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<PlaceRatingStats {self.place_id} ({self.review_count} reviews)>"
+
+    def to_dict(self) -> dict:
+        from src.persistence.ratings import STARS, stats_dict
+
+        histogram = [getattr(self, f"rating_{stars}") for stars in STARS]
+        return stats_dict(self.review_count, self.rating_sum, histogram)
+
+    @staticmethod
+    def for_place(place_id: str, session) -> dict:
+        """
+        Get the rating stats of a place with a primary key lookup.
+
+        :param place_id: ID of the Place
+        :param session: Session to read with
+        :return: The stats, all zero if the place has no reviews
+        """
+        from src.persistence.ratings import RatingStats
+
+        stats = session.get(PlaceRatingStats, place_id)
+        return stats.to_dict() if stats else RatingStats().to_dict()
@@ -10,8 +10,8 @@ class Review(Base):
 
     __tablename__ = 'reviews'
     id = db.Column(db.Integer, primary_key=True)
-    place_id = db.Column(db.Integer, db.ForeignKey('places.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    place_id = db.Column(db.Integer, db.ForeignKey('places.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     comment = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -75,4 +75,11 @@ class Review(Base):
 
         db.update(review)
 
-        return review
\ No newline at end of file
+        return review
+
+    @staticmethod
+    def get_stats(place_id: str) -> dict:
+        """Get the count, sum, mean and 1-5 star histogram of the ratings of a place"""
+        from src.persistence import db
+
+        return db.get_rating_stats(place_id)
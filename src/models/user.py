@@ -22,7 +22,7 @@ class User(Base):
 
     def __init__(self, email: str, first_name: str, last_name: str, password: str, is_admin: bool = False, **kw):
         super().__init__(**kw)
-        self.email = email
+        self.email = User.normalize_email(email)
         self.first_name = first_name
         self.last_name = last_name
         self.is_admin = is_admin
@@ -42,6 +42,24 @@ class User(Base):
             "updated_at": self.updated_at.isoformat(),
         }
 
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """
+        Normalize an email so lookups ignore case and surrounding spaces.
+
+        Raises:
+            ValueError: If the email is not a string.
+        """
+        if not isinstance(email, str):
+            raise ValueError("email must be a string")
+        return email.strip().lower()
+
+    @staticmethod
+    def get_by_email(email: str) -> "User | None":
+        from src.persistence import db
+
+        return db.get_by_email(email)
+
     def set_password(self, password: str):
         """Set password method"""
         self.password = bcrypt.generate_password_hash(password).decode('utf-8')
@@ -54,11 +72,8 @@ class User(Base):
     def create(user: dict) -> "User":
         from src.persistence import db
 
-        users: list["User"] = User.get_all()
-
-        for u in users:
-            if u.email == user["email"]:
-                raise ValueError("User already exists")
+        if User.get_by_email(user["email"]):
+            raise ValueError("User already exists")
 
         new_user = User(**user)
 
@@ -76,7 +91,10 @@ class User(Base):
             return None
 
         if "email" in data:
-            user.email = data["email"]
+            existing = User.get_by_email(data["email"])
+            if existing and existing.id != user.id:
+                raise ValueError("User already exists")
+            user.email = User.normalize_email(data["email"])
         if "first_name" in data:
             user.first_name = data["first_name"]
         if "last_name" in data:
@@ -9,9 +9,9 @@ if os.getenv(REPOSITORY_ENV_VAR) == "db":
     from src.persistence.db import DBRepository
     db = DBRepository()
 elif os.getenv(REPOSITORY_ENV_VAR) == "file":
-    from src.persistence.file import FileRepository
+    from src.persistence.file import DataManager
     print("Using file repository")
-    db = FileRepository()
+    db = DataManager()
 else:
     from src.persistence.memory import MemoryRepository
     db = MemoryRepository()
@@ -0,0 +1,205 @@
+""" Asyncio database repository
+
+AsyncDBRepository runs the queries of DBRepository on SQLAlchemy's async
+engine, so a request waiting on the database leaves the event loop free
+for other requests instead of holding a worker thread. The ASGI app of
+create_asgi_app serves the async controllers with it.
+
+SQLALCHEMY_DATABASE_URI is opened with the asyncio driver of its backend,
+aiosqlite for SQLite and asyncpg for PostgreSQL; see async_url. Requires
+SQLAlchemy's asyncio extension (greenlet) and that driver.
+"""
+
+from asyncio import current_task
+from typing import Collection
+
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
+
+from src import db
+from src.models import Place, Review, User
+from src.models.place import PlaceRatingStats
+from src.persistence.criteria import parse_criteria, where_clause
+from src.persistence.db import PLACE_LOADERS, DBRepository, count_out_reviews
+from src.persistence.engine import engine_options, pool_stats
+from src.persistence.indexes import get_key
+from src.persistence.pagination import keyset_query
+from src.persistence.repository import AsyncRepository
+
+# Asyncio driver of each backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(uri: str) -> URL:
+    """
+    Get the URL of a database with the asyncio driver of its backend.
+
+    Raises:
+        ValueError: If the backend has no asyncio driver.
+    """
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for {backend} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncDBRepository(AsyncRepository):
+    """
+    Asyncio database repository implementation
+
+    Each asyncio task, so each request of the ASGI app, gets its own session;
+    remove_session ends it. Every write commits on its own, and objects stay
+    loaded after the commit, since they cannot be refreshed lazily.
+    """
+
+    def __init__(self, config) -> None:
+        self.engine = create_async_engine(
+            async_url(config["SQLALCHEMY_DATABASE_URI"]), **engine_options(config, asyncio=True)
+        )
+        self.session = async_scoped_session(
+            async_sessionmaker(self.engine, expire_on_commit=False), scopefunc=current_task
+        )
+
+    async def create_all(self) -> None:
+        """Create the tables of every model, as create_app does with db.create_all"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+
+    async def remove_session(self) -> None:
+        """Close the session of the current task, rolling back anything uncommitted"""
+        await self.session.remove()
+
+    async def dispose(self) -> None:
+        """Close every pooled connection"""
+        await self.engine.dispose()
+
+    def pool_stats(self) -> dict:
+        """Get the pool size, usage and checkout wait times of the engine"""
+        return pool_stats(self.engine.sync_engine)
+
+    async def _commit(self) -> None:
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def get_all(self, model_name: str) -> list:
+        """Get all objects of a model"""
+        model_class = DBRepository._get_model_class(model_name)
+        if model_class:
+            return list(await self.session.scalars(select(model_class)))
+        return []
+
+    async def get(self, model_name: str, obj_id: str):
+        """Get an object by id"""
+        model_class = DBRepository._get_model_class(model_name)
+        if model_class:
+            return await self.session.get(model_class, obj_id)
+        return None
+
+    async def get_by(self, model_name: str, field: str, value) -> list:
+        """Get all objects of a model whose attribute equals a value"""
+        return await self.find(model_name, **{field: value})
+
+    async def find(self, model_name: str, **criteria) -> list:
+        """Get the objects of a model matching every criterion, filtered by the database"""
+        model_class = DBRepository._get_model_class(model_name)
+        if model_class:
+            query = select(model_class).where(*where_clause(model_class, parse_criteria(criteria)))
+            return list(await self.session.scalars(query))
+        return []
+
+    async def count(self, model_name: str, **criteria) -> int:
+        """Count the objects of a model matching every criterion with a single COUNT query"""
+        model_class = DBRepository._get_model_class(model_name)
+        if model_class:
+            query = select(func.count()).select_from(model_class)
+            return await self.session.scalar(query.where(*where_clause(model_class, parse_criteria(criteria))))
+        return 0
+
+    async def get_by_email(self, email: str):
+        """Get a user object by email, using the unique email column"""
+        if not email or not isinstance(email, str):
+            return None
+        return await self.session.scalar(select(User).where(User.email == User.normalize_email(email)))
+
+    async def get_place_detail(self, place_id: str, expand: Collection[str] = ()) -> dict | None:
+        """Get a place and its related rows in a constant number of queries, as DBRepository does"""
+        options = [loader for name, loader in PLACE_LOADERS.items() if name in expand]
+        place = await self.session.get(Place, place_id, options=options, populate_existing=bool(options))
+        if place is None:
+            return None
+
+        detail = {"place": place}
+        for name in PLACE_LOADERS:
+            if name in expand:
+                related = getattr(place, name)
+                detail[name] = list(related) if isinstance(related, list) else related
+        return detail
+
+    async def get_rating_stats(self, place_id: str) -> dict:
+        """Get the review rating stats of a place from its place_rating_stats row"""
+        return await self.session().run_sync(lambda session: PlaceRatingStats.for_place(place_id, session))
+
+    async def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list:
+        """Get one page of the objects of a model ordered by (created_at, id), seeking past `after`"""
+        model_class = DBRepository._get_model_class(model_name)
+        if model_class:
+            return list(await self.session.scalars(keyset_query(select(model_class), model_class, after, limit, order)))
+        return []
+
+    async def save(self, obj) -> None:
+        """Save an object"""
+        self.session.add(obj)
+        await self._commit()
+
+    async def update(self, obj) -> None:
+        """Update an object"""
+        if obj not in self.session:
+            await self.session.merge(obj)
+        await self._commit()
+
+    async def delete(self, obj) -> bool:
+        """Delete an object"""
+        await self.session.delete(obj)
+        await self._commit()
+        return True
+
+    async def save_many(self, objs: list) -> list:
+        """Save several objects in one transaction"""
+        self.session.add_all(objs)
+        await self._commit()
+        return objs
+
+    async def update_many(self, objs: list) -> list:
+        """Update several objects in one transaction, and return their persistent instances"""
+        # merge returns the persistent copy of a detached object, not the object itself
+        objs = [obj if obj in self.session else await self.session.merge(obj) for obj in objs]
+        await self._commit()
+        return objs
+
+    async def delete_many(self, objs: list) -> int:
+        """Delete several objects in one transaction, with one DELETE per table"""
+        keys: dict[type, list] = {}
+        for obj in objs:
+            keys.setdefault(type(obj), []).append(get_key(obj))
+
+        deleted = 0
+        try:
+            for model_class, ids in keys.items():
+                primary_key = inspect(model_class).primary_key[0]
+                if model_class is Review:
+                    # A bulk DELETE skips the flush events, so count the reviews out here
+                    await self.session().run_sync(count_out_reviews, ids)
+                result = await self.session.execute(
+                    delete(model_class).where(primary_key.in_(ids)).execution_options(synchronize_session="fetch")
+                )
+                deleted += result.rowcount
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self._commit()
+        return deleted
@@ -0,0 +1,149 @@
+""" Columnar side store for places, used by the in-memory repository
+
+Requires numpy, which is listed in requirements.txt but optional at
+runtime: MemoryRepository only builds the store with columnar_places
+enabled. Numeric place attributes are kept in contiguous arrays so
+multi-criteria searches are evaluated as vectorized masks instead of
+Python attribute access per place.
+
+Searches give the results criteria.matches would: nothing is coerced, so
+a string never equals or compares with a number.
+"""
+
+from numbers import Real
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Place attributes stored as columns. Everything is float64 so a missing
+# or non-numeric value can be NaN, which never matches a predicate.
+PLACE_COLUMNS = (
+    "latitude",
+    "longitude",
+    "price_per_night",
+    "number_of_rooms",
+    "number_of_bathrooms",
+    "max_guests",
+)
+
+INITIAL_CAPACITY = 1024
+
+
+class ColumnarPlaceStore:
+    """
+    Array-backed copy of the numeric columns of every place.
+
+    Rows are appended in insertion order and addressed through an {id: row}
+    map. Deleting a place leaves a dead row behind; once more than half the
+    rows are dead the arrays are compacted, keeping the order of live rows.
+    """
+
+    columns = PLACE_COLUMNS
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        if np is None:
+            raise RuntimeError("The columnar place store requires numpy")
+
+        # Rows in use, live or dead
+        self.__size = 0
+        self.__rows: dict[str, int] = {}
+        self.__ids = np.empty(capacity, dtype=object)
+        self.__live = np.zeros(capacity, dtype=bool)
+        self.__columns = {name: np.full(capacity, np.nan) for name in self.columns}
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    @staticmethod
+    def _number(value) -> float:
+        """The column value of an attribute: NaN unless it is a number, as "100" != 100"""
+        return float(value) if isinstance(value, Real) else np.nan
+
+    def _resize(self, capacity: int) -> None:
+        """Move the live rows, in order, into arrays of a new capacity"""
+        live = self.__live[: self.__size]
+        count = int(live.sum())
+
+        ids = np.empty(capacity, dtype=object)
+        ids[:count] = self.__ids[: self.__size][live]
+        self.__ids = ids
+
+        for name, column in self.__columns.items():
+            resized = np.full(capacity, np.nan)
+            resized[:count] = column[: self.__size][live]
+            self.__columns[name] = resized
+
+        self.__live = np.zeros(capacity, dtype=bool)
+        self.__live[:count] = True
+        self.__size = count
+        self.__rows = {place_id: row for row, place_id in enumerate(ids[:count])}
+
+    def add(self, place) -> None:
+        """Insert a place, or overwrite its row if already present"""
+        row = self.__rows.get(place.id)
+
+        if row is None:
+            if self.__size == len(self.__ids):
+                self._resize(max(INITIAL_CAPACITY, len(self.__rows) * 2))
+            row = self.__size
+            self.__size += 1
+            self.__rows[place.id] = row
+            self.__ids[row] = place.id
+            self.__live[row] = True
+
+        for name, column in self.__columns.items():
+            column[row] = self._number(getattr(place, name, None))
+
+    def remove(self, place_id: str) -> None:
+        """Drop a place's row"""
+        row = self.__rows.pop(place_id, None)
+        if row is None:
+            return
+
+        self.__ids[row] = None
+        self.__live[row] = False
+
+        if len(self.__rows) < self.__size // 2:
+            self._resize(len(self.__ids))
+
+    def supports(self, conditions: list[tuple[str, str, Any]]) -> bool:
+        """
+        Check whether every condition is on a stored column and against
+        numbers. Other values, such as strings or None, are left to
+        criteria.matches.
+        """
+        return all(
+            field in self.__columns
+            and all(isinstance(v, Real) for v in (value if lookup == "in" else [value]))
+            for field, lookup, value in conditions
+        )
+
+    def search(self, conditions: list[tuple[str, str, Any]]) -> list[str]:
+        """
+        Get the ids of the places satisfying every condition, in insertion
+        order.
+
+        Conditions are (field, lookup, value) tuples as returned by
+        parse_criteria, that the store supports.
+        """
+        mask = self.__live[: self.__size].copy()
+
+        for field, lookup, value in conditions:
+            column = self.__columns[field][: self.__size]
+            if lookup == "in":
+                mask &= np.isin(column, [float(v) for v in value])
+            elif lookup == "eq":
+                mask &= column == float(value)
+            elif lookup == "gt":
+                mask &= column > float(value)
+            elif lookup == "gte":
+                mask &= column >= float(value)
+            elif lookup == "lt":
+                mask &= column < float(value)
+            elif lookup == "lte":
+                mask &= column <= float(value)
+
+        return self.__ids[: self.__size][mask].tolist()
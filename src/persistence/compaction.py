@@ -0,0 +1,83 @@
+""" Snapshot compaction for the file repository """
+
+import os
+import threading
+from typing import Callable, IO
+
+from src.persistence.journal import Journal
+
+# Compact once the journal holds this many bytes or entries
+DEFAULT_MAX_JOURNAL_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_JOURNAL_ENTRIES = 100_000
+
+
+def write_atomically(path: str, write: Callable[[IO], None], mode: str = "w") -> None:
+    """
+    Write a file through a temporary file and a rename, so readers and
+    crashes only ever see the old or the new content.
+    """
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, mode) as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+    # Make the rename itself durable
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class Compactor:
+    """
+    Runs a compaction function on a background thread once the journal
+    passes a size or entry-count threshold.
+
+    Only one compaction runs at a time; requests made while one is running
+    are ignored, since the running one will leave a short journal anyway.
+    """
+
+    def __init__(
+        self,
+        compact: Callable[[], None],
+        max_bytes: int = DEFAULT_MAX_JOURNAL_BYTES,
+        max_entries: int = DEFAULT_MAX_JOURNAL_ENTRIES,
+    ) -> None:
+        self.__compact = compact
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.__thread: threading.Thread | None = None
+        self.__lock = threading.Lock()
+
+    def should_compact(self, journal: Journal) -> bool:
+        """Whether the journal has passed either threshold"""
+        return journal.size >= self.max_bytes or journal.entries >= self.max_entries
+
+    def request(self) -> bool:
+        """
+        Start a background compaction unless one is already running.
+
+        Returns:
+            bool: True if a compaction was started.
+        """
+        with self.__lock:
+            if self.__thread is not None and self.__thread.is_alive():
+                return False
+
+            self.__thread = threading.Thread(
+                target=self.__compact, name="file-compaction", daemon=True
+            )
+            self.__thread.start()
+            return True
+
+    def wait(self) -> None:
+        """Block until the running compaction, if any, has finished"""
+        thread = self.__thread
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,82 @@
+""" Query criteria shared by the repository backends
+
+Criteria are keyword arguments naming a field and, optionally, a lookup
+after a double underscore:
+
+    price_per_night__lte=100, max_guests__gte=2, city_id__in=[...], user_id=...
+
+A bare field name means equality. The memory and file backends evaluate
+them with matches; the database backend compiles them into a WHERE clause
+with where_clause.
+"""
+
+import operator
+from typing import Any
+
+OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda value, options: value in options,
+}
+
+
+def parse_criteria(criteria: dict[str, Any]) -> list[tuple[str, str, Any]]:
+    """
+    Split criteria into (field, lookup, value) conditions.
+
+    Raises:
+        ValueError: If a lookup is not one of OPERATORS.
+    """
+    conditions = []
+
+    for key, value in criteria.items():
+        field, _, lookup = key.partition("__")
+        lookup = lookup or "eq"
+
+        if lookup not in OPERATORS:
+            raise ValueError(f"Unsupported lookup: {key}")
+
+        conditions.append((field, lookup, value))
+
+    return conditions
+
+
+def matches(obj, conditions: list[tuple[str, str, Any]]) -> bool:
+    """Check whether an object satisfies every condition"""
+    for field, lookup, value in conditions:
+        attr = getattr(obj, field, None)
+        try:
+            if not OPERATORS[lookup](attr, value):
+                return False
+        except TypeError:
+            # Comparing against a missing or mistyped attribute
+            return False
+    return True
+
+
+def where_clause(model: type, conditions: list[tuple[str, str, Any]]) -> list:
+    """
+    Compile conditions into SQLAlchemy expressions on the columns of a mapped model.
+
+    Raises:
+        ValueError: If a field is not a column of the model.
+    """
+    columns = model.__table__.columns
+    clauses = []
+
+    for field, lookup, value in conditions:
+        if field not in columns:
+            raise ValueError(f"Unknown field for {model.__name__}: {field}")
+
+        column = getattr(model, field)
+        if lookup == "in":
+            clauses.append(column.in_(list(value)))
+        elif lookup == "eq" and value is None:
+            clauses.append(column.is_(None))
+        else:
+            clauses.append(OPERATORS[lookup](column, value))
+
+    return clauses
@@ -1,11 +1,215 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Collection, Iterator
+from flask import Flask, Response, current_app, has_request_context
 from src.models.base import Base
 from src.persistence.repository import Repository
 from src import db
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.orm.exc import NoResultFound
-from src.models import User
+from src.persistence.criteria import parse_criteria, where_clause
+from src.persistence.engine import pool_stats
+from src.persistence.indexes import get_key
+from src.persistence.pagination import keyset_query
+from src.persistence.ratings import STARS, RatingStats
+from src.replicas import replica_engines
+from src.models import Place, Review, User
+from src.models.place import PlaceRatingStats
+
+# How get_place_detail loads each of the PLACE_EXPANSIONS with the place
+PLACE_LOADERS = {
+    "city": joinedload(Place.city),
+    "host": joinedload(Place.host),
+    "amenities": selectinload(Place.amenities),
+    "reviews": selectinload(Place.reviews),
+}
+
+# Whether the current context is inside DBRepository.transaction()
+_in_transaction: ContextVar[bool] = ContextVar("in_transaction", default=False)
+
+
+def _rating_columns(stats: RatingStats) -> dict:
+    """The place_rating_stats column values of some stats, or of a change to them"""
+    columns = {"review_count": stats.count, "rating_sum": stats.total}
+    columns.update({f"rating_{stars}": stats.histogram[stars - 1] for stars in STARS})
+    return columns
+
+
+def _committed(session, review: Review) -> tuple:
+    """The place_id and rating of a review as last flushed"""
+    state = inspect(review)
+    values = []
+    for field in ("place_id", "rating"):
+        history = state.attrs[field].history
+        old = history.deleted or history.unchanged
+        if not old:
+            # Expired, or set while expired, so the flushed values were never loaded
+            query = select(Review.place_id, Review.rating).where(Review.id == state.identity[0])
+            return tuple(session.execute(query).one_or_none() or (None, None))
+        values.append(old[0])
+    return tuple(values)
+
+
+# On every session class, so the sessions of AsyncDBRepository keep the stats too
+@event.listens_for(Session, "before_flush")
+def _collect_rating_changes(session, flush_context, instances) -> None:
+    """Sum up how the reviews about to be flushed change the rating stats of their places"""
+    changes: dict[str, RatingStats] = {}
+
+    def count(place_id, rating, sign: int) -> None:
+        if place_id is not None and rating is not None:
+            changes.setdefault(place_id, RatingStats()).add(rating, sign)
+
+    for review in session.new:
+        if isinstance(review, Review):
+            count(review.place_id, review.rating, 1)
+    for review in session.dirty:
+        if isinstance(review, Review) and session.is_modified(review):
+            count(*_committed(session, review), -1)
+            count(review.place_id, review.rating, 1)
+    for review in session.deleted:
+        if isinstance(review, Review):
+            count(*_committed(session, review), -1)
+
+    # Replaces the changes of an earlier flush that failed before after_flush
+    session.info["rating_changes"] = changes
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rating_changes(session, flush_context) -> None:
+    _upsert_rating_stats(session, session.info.pop("rating_changes", {}))
+
+
+def _upsert_rating_stats(session, changes: dict[str, RatingStats]) -> None:
+    """
+    Add changes to the place_rating_stats rows of their places, in the
+    transaction of the writes they come from. The increments are done by the
+    database, so concurrent writers do not overwrite each other.
+    """
+    table = PlaceRatingStats.__table__
+    dialect = session.get_bind(mapper=inspect(PlaceRatingStats)).dialect.name
+    for place_id, stats in changes.items():
+        if not stats.count and not stats.total and not any(stats.histogram):
+            continue
+
+        columns = _rating_columns(stats)
+        increments = {name: table.c[name] + value for name, value in columns.items()}
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = insert(table).values(place_id=place_id, **columns)
+            session.execute(statement.on_conflict_do_update(index_elements=[table.c.place_id], set_=increments))
+        elif not session.execute(update(table).where(table.c.place_id == place_id).values(increments)).rowcount:
+            session.execute(table.insert().values(place_id=place_id, **columns))
+
+
+def count_out_reviews(session, ids: list) -> None:
+    """Remove the ratings of the reviews with these ids from the stats of their places"""
+    changes: dict[str, RatingStats] = {}
+    for place_id, rating in session.execute(
+        select(Review.place_id, Review.rating).where(Review.id.in_(ids)).with_for_update()
+    ):
+        if place_id is not None and rating is not None:
+            changes.setdefault(place_id, RatingStats()).add(rating, -1)
+    _upsert_rating_stats(session, changes)
+
 
 class DBRepository(Repository):
-    """Database repository implementation"""
+    """
+    Database repository implementation
+
+    Writes are grouped into units of work. Inside DBRepository.transaction(),
+    or during a request when DB_UNIT_OF_WORK is enabled (see init_app), save,
+    update and delete only flush; the whole unit is committed once at the end,
+    or rolled back on error. Elsewhere every write commits on its own.
+
+    With DB_REPLICA_URIS set, reads go to a read replica and writes to the
+    primary. After its first write a session reads from the primary, so a
+    request always sees its own writes (see src/replicas.py).
+
+    Every flush that writes reviews also adjusts the place_rating_stats rows
+    of their places (see PlaceRatingStats), so get_rating_stats is a single
+    primary key lookup.
+    """
+
+    @staticmethod
+    def init_app(app: Flask) -> None:
+        """
+        Commit the unit of work of each request once it has produced a successful
+        response, and end its read-your-writes pinning.
+        """
+
+        @app.after_request
+        def commit_unit_of_work(response: Response) -> Response:
+            if app.config.get("DB_UNIT_OF_WORK"):
+                # A failed commit raises here, so the client gets a 500 instead of this response
+                if response.status_code < 400:
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+            return response
+
+        @app.teardown_request
+        def rollback_unit_of_work(error: BaseException | None) -> None:
+            if error is not None and app.config.get("DB_UNIT_OF_WORK"):
+                db.session.rollback()
+            # Read-your-writes pinning lasts for one request, even when the session outlives it
+            db.session().reset_routing()
+
+    @staticmethod
+    @contextmanager
+    def transaction() -> Iterator[None]:
+        """
+        Run the repository calls of a block as one unit of work, for scripts and
+        other code outside requests. Nested blocks join the outer one.
+        """
+        if _in_transaction.get():
+            yield
+            return
+
+        token = _in_transaction.set(True)
+        try:
+            yield
+            db.session.commit()
+        except BaseException:
+            db.session.rollback()
+            raise
+        finally:
+            _in_transaction.reset(token)
+
+    @staticmethod
+    def pool_stats() -> dict:
+        """Get the pool size, usage and checkout wait times of each engine, by bind key"""
+        stats = {key or "default": pool_stats(engine) for key, engine in db.engines.items()}
+        stats.update({f"replica_{n}": pool_stats(engine) for n, engine in enumerate(replica_engines())})
+        return stats
+
+    @staticmethod
+    def _in_unit_of_work() -> bool:
+        if _in_transaction.get():
+            return True
+        return has_request_context() and current_app.config.get("DB_UNIT_OF_WORK", False)
+
+    def _commit(self) -> None:
+        """Commit, or only flush when a unit of work will commit later"""
+        if self._in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
+
+    def _rollback(self) -> None:
+        """Roll back a failed write, unless it belongs to a unit of work, whose owner rolls it back"""
+        if not self._in_unit_of_work():
+            db.session.rollback()
+
+    @staticmethod
+    def _get_model_class(model_name: str):
+        """Get the mapped class for a lowercase model name"""
+        for mapper in db.Model.registry.mappers:
+            if mapper.class_.__name__.lower() == model_name:
+                return mapper.class_
+        return None
 
     def reload(self) -> None:
         """Reload data to the repository"""
@@ -14,36 +218,138 @@ class DBRepository(Repository):
 
     def get_all(self, model_name: str) -> list:
         """Get all objects of a model"""
-        model_class = Base._decl_class_registry.get(model_name.capitalize())
+        model_class = self._get_model_class(model_name)
         if model_class:
             return model_class.query.all()
         return []
 
     def get(self, model_name: str, obj_id: str) -> Base | None:
         """Get an object by id"""
-        model_class = Base._decl_class_registry.get(model_name.capitalize())
+        model_class = self._get_model_class(model_name)
         if model_class:
             return model_class.query.get(obj_id)
         return None
 
+    def get_by(self, model_name: str, field: str, value) -> list:
+        """Get all objects of a model whose attribute equals a value"""
+        model_class = self._get_model_class(model_name)
+        if model_class:
+            return model_class.query.filter_by(**{field: value}).all()
+        return []
+
+    def find(self, model_name: str, **criteria) -> list:
+        """Get the objects of a model matching every criterion, filtered by the database"""
+        model_class = self._get_model_class(model_name)
+        if model_class:
+            return model_class.query.filter(*where_clause(model_class, parse_criteria(criteria))).all()
+        return []
+
+    def count(self, model_name: str, **criteria) -> int:
+        """Count the objects of a model matching every criterion with a single COUNT query"""
+        model_class = self._get_model_class(model_name)
+        if model_class:
+            query = select(func.count()).select_from(model_class)
+            return db.session.scalar(query.where(*where_clause(model_class, parse_criteria(criteria))))
+        return 0
+
+    def get_place_detail(self, place_id: str, expand: Collection[str] = ()) -> dict | None:
+        """
+        Get a place and its related rows in a constant number of queries: the city
+        and host are joined to the place, amenities and reviews each take one
+        SELECT ... IN.
+        """
+        options = [loader for name, loader in PLACE_LOADERS.items() if name in expand]
+        place = db.session.get(Place, place_id, options=options, populate_existing=bool(options))
+        if place is None:
+            return None
+
+        detail = {"place": place}
+        for name in PLACE_LOADERS:
+            if name in expand:
+                related = getattr(place, name)
+                detail[name] = list(related) if isinstance(related, list) else related
+        return detail
+
+    def get_rating_stats(self, place_id: str) -> dict:
+        """Get the review rating stats of a place from its place_rating_stats row"""
+        return PlaceRatingStats.for_place(place_id, db.session)
+
+    def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list:
+        """Get one page of the objects of a model ordered by (created_at, id), seeking past `after`"""
+        model_class = self._get_model_class(model_name)
+        if model_class:
+            return keyset_query(model_class.query, model_class, after, limit, order).all()
+        return []
+
     def save(self, obj: Base) -> None:
         """Save an object"""
         db.session.add(obj)
-        db.session.commit()
+        self._commit()
 
     def update(self, obj: Base) -> None:
         """Update an object"""
-        db.session.commit()
+        self._commit()
 
     def delete(self, obj: Base) -> bool:
         """Delete an object"""
         db.session.delete(obj)
-        db.session.commit()
+        self._commit()
         return True
     
+    def save_many(self, objs: list[Base]) -> list[Base]:
+        """
+        Save several objects in one transaction.
+
+        The flush sends the rows of each table as batched multi-row INSERTs
+        (SQLAlchemy's insertmanyvalues), since ids are set client-side.
+        """
+        try:
+            db.session.add_all(objs)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return objs
+
+    def update_many(self, objs: list[Base]) -> list[Base]:
+        """Update several objects in one transaction, and return their persistent instances"""
+        try:
+            # merge returns the persistent copy of a detached object, not the object itself
+            objs = [obj if obj in db.session else db.session.merge(obj) for obj in objs]
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return objs
+
+    def delete_many(self, objs: list[Base]) -> int:
+        """Delete several objects in one transaction, with one DELETE per table"""
+        keys: dict[type, list] = {}
+        for obj in objs:
+            keys.setdefault(type(obj), []).append(get_key(obj))
+
+        deleted = 0
+        try:
+            for model_class, ids in keys.items():
+                primary_key = inspect(model_class).primary_key[0]
+                if model_class is Review:
+                    # A bulk DELETE skips the flush events, so count the reviews out here
+                    count_out_reviews(db.session, ids)
+                result = db.session.execute(
+                    delete(model_class).where(primary_key.in_(ids)).execution_options(synchronize_session="fetch")
+                )
+                deleted += result.rowcount
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return deleted
+
     def get_by_email(self, email: str) -> Base | None:
-        """Get a user object by email"""
+        """Get a user object by email, using the unique email column"""
+        if not email or not isinstance(email, str):
+            return None
         try:
-            return User.query.filter_by(email=email).one()
+            return User.query.filter_by(email=User.normalize_email(email)).one()
         except NoResultFound:
             return None
\ No newline at end of file
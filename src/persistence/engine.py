@@ -0,0 +1,168 @@
+""" Engine and connection pool setup for the database repository
+
+Engine options come from the DB_POOL_* settings of the app config, and
+every SQLite connection runs the SQLITE_* PRAGMAs when it is opened.
+Queue pools record how long checkouts wait for a connection, so workers
+can be sized against the pool; see pool_stats. The async engine of
+AsyncDBRepository gets the same options with the asyncio variant of the
+pool.
+"""
+
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+SQLITE_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SQLITE_SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class PoolStats:
+    """Checkout counters of one pool, shared by the pools it is recreated as"""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, wait: float, checked_out: int) -> None:
+        with self.__lock:
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, wait: float) -> None:
+        with self.__lock:
+            self.timeouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def to_dict(self) -> dict:
+        with self.__lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait_seconds,
+                "mean_wait_seconds": self.wait_seconds / self.checkouts if self.checkouts else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """
+    A QueuePool that records the time each checkout takes, including waiting
+    for a connection to be returned and opening a new one.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.stats.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """A TimedQueuePool for async engines"""
+
+
+def _is_memory_sqlite(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(config, asyncio: bool = False) -> dict:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings of a config,
+    or the options of an async engine with asyncio.
+
+    In-memory SQLite databases get a single shared connection from
+    Flask-SQLAlchemy, so only pre-ping and recycle apply to them.
+    """
+    options = {
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", -1),
+    }
+
+    if not _is_memory_sqlite(config["SQLALCHEMY_DATABASE_URI"]):
+        options.update(
+            poolclass=TimedAsyncQueuePool if asyncio else TimedQueuePool,
+            pool_size=config.get("DB_POOL_SIZE", 5),
+            max_overflow=config.get("DB_MAX_OVERFLOW", 10),
+            pool_timeout=config.get("DB_POOL_TIMEOUT", 30),
+        )
+
+    return options
+
+
+def sqlite_pragmas(config) -> list[str]:
+    """
+    Get the PRAGMA statements to run on new SQLite connections.
+
+    Raises:
+        ValueError: If the journal mode or synchronous level is unknown.
+    """
+    journal_mode = config.get("SQLITE_JOURNAL_MODE", "WAL").upper()
+    synchronous = config.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLite journal mode: {journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Unknown SQLite synchronous level: {synchronous}")
+
+    return [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 0))}",
+        f"PRAGMA cache_size={int(config.get('SQLITE_CACHE_SIZE', -2000))}",
+    ]
+
+
+def install_sqlite_pragmas(app: Flask, engines: list[Engine]) -> None:
+    """Run the configured PRAGMAs on every connection the SQLite engines open"""
+    pragmas = sqlite_pragmas(app.config)
+
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", set_pragmas)
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Get the size, usage and checkout wait times of the pool of an engine"""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.stats.to_dict())
+
+    return stats
@@ -1,15 +1,34 @@
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
 import os
+import threading
+import time
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from src.models.base import Base
+from src.persistence.compaction import (
+    DEFAULT_MAX_JOURNAL_BYTES,
+    DEFAULT_MAX_JOURNAL_ENTRIES,
+    Compactor,
+    write_atomically,
+)
+from src.persistence.criteria import matches, parse_criteria, where_clause
+from src.persistence.indexes import INDEXED_FIELDS, OrderedIndex, SecondaryIndex, UniqueIndex, get_key
+from src.persistence.pagination import keyset_query
+from src.persistence.journal import DEFAULT_DURABILITY, DEFAULT_FLUSH_INTERVAL_MS, Journal
+from src.persistence.ratings import RatingAggregates
+from src.persistence.records import record_type, to_record
 from src.persistence.repository import Repository
-from utils.constants import FILE_STORAGE_FILENAME
+from src.persistence.serializers import detect_serializer, get_serializer
+from src.persistence.shards import ShardSet
+from src.persistence.streaming import peak_rss_bytes
+from utils.constants import FILE_STORAGE_FILENAME, FILE_STORAGE_FORMAT, FILE_STORAGE_LAYOUT
 
 from src.models.amenity import Amenity, PlaceAmenity
 from src.models.city import City
 from src.models.country import Country
-from src.models.place import Place
+from src.models.place import Place, PlaceRatingStats
 from src.models.review import Review
 from src.models.user import User
 
@@ -20,9 +39,42 @@ class DataManager(Repository):
     This class provides methods for CRUD operations (Create, Read, Update, Delete) on data objects.
     It can switch between file-based storage and database storage based on an environment variable.
 
+    File-based storage is log-structured: the data file holds a snapshot, and every save, update
+    or delete is appended as one entry to a journal next to it (``<filename>.journal``). Reloading
+    reads the snapshot and replays the journal on top of it, so a single write costs O(1) I/O.
+
+    Once the journal passes a size or entry-count threshold, a background thread compacts it:
+    the records are captured and the journal sealed under the write lock, then a fresh snapshot
+    is written atomically (temp file + rename) without holding up further writes.
+
+    The durability mode (FILE_STORAGE_DURABILITY) picks when journal entries reach the disk:
+    ``always`` fsyncs every write, ``interval`` group-commits every FILE_STORAGE_FLUSH_INTERVAL_MS,
+    and ``off`` only flushes on shutdown or compaction.
+
+    Snapshots are written in the FILE_STORAGE_FORMAT format, JSON text or a compact binary
+    encoding (see src.persistence.serializers). Journal entries are always JSON lines.
+
+    With FILE_STORAGE_LAYOUT set to ``sharded`` the snapshot is instead split into one binary
+    shard per model, or per model and hash bucket (FILE_STORAGE_BUCKETS), in ``<filename>.shards``
+    (see src.persistence.shards). Models are then loaded lazily, the first time they are used,
+    and ``get`` reads a single record through the offset index of a shard until then.
+
     Attributes:
-        __filename (str): The filename for file-based storage.
-        __data (dict): A dictionary to store data in memory for file-based operations.
+        __filename (str): The filename of the snapshot for file-based storage.
+        __serializer (Serializer): Writes snapshots in the configured storage format.
+        __shards (ShardSet): The shard files, with the sharded layout.
+        __loaded (set): The models held in memory. Other models are still only in their shards.
+        __pending (dict): Journal entries of models not loaded yet, as {model: {id: record or None}}.
+        __dirty (set): The models changed since the last compaction, the only shards it rewrites.
+        __journal (Journal): The journal of mutations made since the snapshot.
+        __compactor (Compactor): Starts background compactions when the journal grows too large.
+        __data (dict): A dictionary mapping each model to an {id: record} dictionary for file-based operations.
+            Objects are held as compact Records and hydrated into model instances when read.
+        __indexes (dict): Secondary indexes on the foreign keys listed in INDEXED_FIELDS.
+        __emails (UniqueIndex): Case-insensitive index of users by email.
+        __ordered (dict): Every model sorted by (created_at, id), for keyset pagination.
+        __ratings (RatingAggregates): The review rating stats of every place.
+        load_stats (dict): The record count, duration and peak RSS of the last reload.
         use_database (bool): Flag to determine whether to use database or file-based storage.
         db_session (Session): SQLAlchemy database session for database operations.
 
@@ -33,17 +85,6 @@ class DataManager(Repository):
             data_manager = DataManager(db_session)
     """
 
-    __filename = FILE_STORAGE_FILENAME
-    __data: dict[str, list] = {
-        "country": [],
-        "user": [],
-        "amenity": [],
-        "city": [],
-        "review": [],
-        "place": [],
-        "placeamenity": [],
-    }
-
     models = {
         "amenity": Amenity,
         "city": City,
@@ -54,30 +95,332 @@ class DataManager(Repository):
         "user": User,
     }
 
-    def __init__(self, db_session: Session = None) -> None:
+    def __init__(
+        self,
+        db_session: Session = None,
+        filename: str = FILE_STORAGE_FILENAME,
+        max_journal_bytes: int | None = None,
+        max_journal_entries: int | None = None,
+        durability: str | None = None,
+        flush_interval_ms: int | None = None,
+        storage_format: str | None = None,
+        layout: str | None = None,
+        buckets: int | None = None,
+        reload_workers: int | None = None,
+    ) -> None:
         """
         Initialize the DataManager.
 
         Args:
             db_session (Session, optional): SQLAlchemy database session for database operations.
+            filename (str, optional): The file used for file-based storage.
+            max_journal_bytes (int, optional): Journal size that triggers a compaction.
+                Defaults to the FILE_COMPACT_MAX_BYTES environment variable, or 64 MiB.
+            max_journal_entries (int, optional): Journal entry count that triggers a compaction.
+                Defaults to the FILE_COMPACT_MAX_ENTRIES environment variable, or 100000.
+            durability (str, optional): 'always', 'interval' or 'off'.
+                Defaults to the FILE_STORAGE_DURABILITY environment variable, or 'always'.
+            flush_interval_ms (int, optional): Group commit window for the 'interval' mode.
+                Defaults to the FILE_STORAGE_FLUSH_INTERVAL_MS environment variable, or 100.
+            storage_format (str, optional): Snapshot format written by compactions, 'json' or 'binary'.
+                Defaults to the FILE_STORAGE_FORMAT environment variable, or FILE_STORAGE_FORMAT.
+                Snapshots in either format are read whatever this is set to.
+            layout (str, optional): 'single' for one snapshot file, 'sharded' for one file per model.
+                Defaults to the FILE_STORAGE_LAYOUT environment variable, or FILE_STORAGE_LAYOUT.
+            buckets (int, optional): Number of hash buckets each model is sharded into.
+                Defaults to the FILE_STORAGE_BUCKETS environment variable, or 1.
+            reload_workers (int, optional): With the sharded layout, load every model on reload by
+                decoding shards in this many processes, instead of loading models lazily.
+                Defaults to the FILE_STORAGE_RELOAD_WORKERS environment variable, or 0 (lazy).
         """
+        if max_journal_bytes is None:
+            max_journal_bytes = int(os.getenv('FILE_COMPACT_MAX_BYTES', DEFAULT_MAX_JOURNAL_BYTES))
+        if max_journal_entries is None:
+            max_journal_entries = int(os.getenv('FILE_COMPACT_MAX_ENTRIES', DEFAULT_MAX_JOURNAL_ENTRIES))
+        if durability is None:
+            durability = os.getenv('FILE_STORAGE_DURABILITY', DEFAULT_DURABILITY)
+        if flush_interval_ms is None:
+            flush_interval_ms = int(os.getenv('FILE_STORAGE_FLUSH_INTERVAL_MS', DEFAULT_FLUSH_INTERVAL_MS))
+
+        if storage_format is None:
+            storage_format = os.getenv('FILE_STORAGE_FORMAT', FILE_STORAGE_FORMAT)
+
+        if layout is None:
+            layout = os.getenv('FILE_STORAGE_LAYOUT', FILE_STORAGE_LAYOUT)
+        if buckets is None:
+            buckets = int(os.getenv('FILE_STORAGE_BUCKETS', 1))
+        if reload_workers is None:
+            reload_workers = int(os.getenv('FILE_STORAGE_RELOAD_WORKERS', 0))
+        if layout not in ("single", "sharded"):
+            raise ValueError(f"Unknown storage layout: {layout}")
+
+        self.__filename = filename
+        self.__serializer = get_serializer(storage_format)
+        self.__shards = ShardSet(f"{filename}.shards", buckets, self.models) if layout == "sharded" else None
+        self.__reload_workers = reload_workers
+        self.__loaded: set[str] = set()
+        self.__pending: dict[str, dict] = {}
+        self.__dirty: set[str] = set()
+        self.__journal = Journal(f"{filename}.journal", durability, flush_interval_ms)
+        self.__compactor = Compactor(self.compact, max_journal_bytes, max_journal_entries)
+        # Held by writers, and by compaction while it captures the records
+        self.__lock = threading.RLock()
+        # Held for the whole of a compaction, so only one runs at a time
+        self.__compact_lock = threading.Lock()
+        self.__data: dict[str, dict] = {model: {} for model in self.models}
+        self.__indexes: dict[str, SecondaryIndex] = {
+            model: SecondaryIndex(fields) for model, fields in INDEXED_FIELDS.items()
+        }
+        self.__emails = UniqueIndex("email")
+        self.__ordered: dict[str, OrderedIndex] = {model: OrderedIndex() for model in self.models}
+        self.__ratings = RatingAggregates()
+        self.load_stats: dict = {}
         self.use_database = os.getenv('USE_DATABASE', 'false').lower() == 'true'
         self.db_session = db_session
         if not self.use_database:
             self.reload()
+            atexit.register(self.close)
 
-    def _save_to_file(self):
+    def compact(self) -> list[str]:
         """
-        Save the current data to a file in JSON format.
+        Save the current data to a file in the configured storage format, and drop the journal entries it now covers.
         This method is used for file-based storage.
+
+        Writers are only held up while the records are captured and the journal is sealed;
+        serializing and writing the snapshot happen outside the lock.
+
+        With the sharded layout only the models changed since the last compaction are rewritten,
+        each shard atomically and on its own thread.
+
+        Returns:
+            list: The names of the models that were written.
+        """
+        with self.__compact_lock:
+            with self.__lock:
+                # The journal entries of models not loaded yet must make it into their shards
+                for model in list(self.__pending):
+                    self._ensure_loaded(model)
+
+                if self.__shards:
+                    models, self.__dirty = self.__dirty, set()
+                else:
+                    models = self.__loaded
+
+                # Records are never modified in place, so copying the references is enough
+                captured = {k: list(self.__data[k].values()) for k in sorted(models)}
+                self.__journal.seal()
+
+            if self.__shards:
+                try:
+                    self._write_shards(captured)
+                except BaseException:
+                    with self.__lock:
+                        self.__dirty.update(captured)
+                    raise
+
+                # Only drop the single-file snapshot once every model has its shard
+                if os.path.exists(self.__filename):
+                    os.remove(self.__filename)
+            else:
+                write_atomically(
+                    self.__filename,
+                    lambda file: self.__serializer.dump(captured, file),
+                    "w" + self.__serializer.mode,
+                )
+
+            self.__journal.drop_sealed()
+
+        return list(captured)
+
+    def _write_shards(self, captured: dict[str, list]) -> None:
+        """Rewrite the shards of several models in parallel"""
+        if len(captured) <= 1:
+            for model, records in captured.items():
+                self.__shards.write(model, records)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(captured), os.cpu_count() or 1)) as executor:
+            # Consume the results so a failed write is raised here
+            list(executor.map(self.__shards.write, captured.keys(), captured.values()))
+
+    def _journal(self, *entries: dict) -> None:
         """
-        serialized = {
-            k: [v.to_dict() for v in l if isinstance(v, Base)]
-            for k, l in self.__data.items()
+        Append entries to the journal, starting a background compaction if it has grown too large.
+        Must be called with the write lock held.
+        """
+        self.__journal.append_many(list(entries))
+
+        if self.__compactor.should_compact(self.__journal):
+            self.__compactor.request()
+
+    def storage_stats(self) -> dict:
+        """
+        Get the on-disk size of the file storage.
+
+        Returns:
+            dict: The snapshot and journal sizes in bytes, and the number of journal entries.
+        """
+        def size(path):
+            return os.path.getsize(path) if os.path.exists(path) else 0
+
+        return {
+            "snapshot_bytes": size(self.__filename) + (self.__shards.size() if self.__shards else 0),
+            "journal_bytes": size(self.__journal.path) + size(self.__journal.sealed_path),
+            "journal_entries": self.__journal.entries,
         }
 
-        with open(self.__filename, "w") as file:
-            json.dump(serialized, file)
+    @property
+    def loaded_models(self) -> frozenset:
+        """The models held in memory. With the sharded layout, others are only read from their shards."""
+        return frozenset(self.__loaded)
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished"""
+        self.__compactor.wait()
+
+    def flush(self) -> None:
+        """Make every journaled write durable now, whatever the durability mode"""
+        self.__journal.flush()
+
+    def close(self) -> None:
+        """Finish any running compaction and flush and close the journal"""
+        self.wait_for_compaction()
+        self.__journal.close()
+        if self.__shards:
+            self.__shards.close()
+
+    def _store(self, model: str, record) -> None:
+        """
+        Put a record in memory and in the indexes, replacing any previous version.
+
+        Args:
+            model (str): The name of the model.
+            record (Record): The record to store.
+        """
+        if model not in self.__data:
+            self.__data[model] = {}
+
+        key = get_key(record)
+        if model == "review":
+            self.__ratings.replace(self.__data[model].get(key), record)
+
+        self.__data[model][key] = record
+        self.__dirty.add(model)
+
+        self.__ordered.setdefault(model, OrderedIndex()).add(record)
+        if model in self.__indexes:
+            self.__indexes[model].add(record)
+        if model == "user":
+            self.__emails.add(record)
+
+    def _rebuild_indexes(self, model: str) -> None:
+        """Rebuild the indexes of a model from its records in memory, in one pass"""
+        indexes = [self.__ordered.setdefault(model, OrderedIndex())]
+        if model in self.__indexes:
+            indexes.append(self.__indexes[model])
+        if model == "user":
+            indexes.append(self.__emails)
+
+        if model == "review":
+            indexes.append(self.__ratings)
+
+        for index in indexes:
+            index.clear()
+            for record in self.__data.get(model, {}).values():
+                index.add(record)
+
+    def _ensure_loaded(self, model: str) -> None:
+        """Load every record of a model from its shards, then apply its pending journal entries"""
+        if model in self.__loaded or model not in self.models:
+            return
+
+        with self.__lock:
+            if model in self.__loaded:
+                return
+
+            # Built aside, so lock-free readers keep using the shards until it is complete
+            records = {get_key(record): record for record in self.__shards.load(model)}
+            for key, record in self.__pending.get(model, {}).items():
+                if record is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = record
+
+            self.__data[model] = records
+            self._rebuild_indexes(model)
+            self.__loaded.add(model)
+            # Shards written with another bucket count are rewritten with the current one
+            if self.__pending.pop(model, None) or not self.__shards.seekable(model):
+                self.__dirty.add(model)
+
+    def _load_all_shards(self) -> int:
+        """
+        Load every model from its shards, decoding them in a pool of reload_workers processes.
+
+        Returns:
+            int: The number of records loaded.
+        """
+        loaded = {model: {} for model in self.models}
+        count = 0
+        for model, records in self.__shards.load_parallel(list(self.models), self.__reload_workers):
+            target = loaded[model]
+            for record in records:
+                target[get_key(record)] = record
+            count += len(records)
+
+        for model, records in loaded.items():
+            self.__data[model] = records
+            self._rebuild_indexes(model)
+            self.__loaded.add(model)
+            if not self.__shards.seekable(model):
+                self.__dirty.add(model)
+
+        return count
+
+    def _replay(self, entry: dict) -> None:
+        """Apply a journal entry, or keep it for later if its model is not loaded yet"""
+        model = entry["model"]
+
+        if entry["op"] == "delete":
+            key, record = entry["id"], None
+        else:
+            record = record_type(self.models[model]).from_dict(entry["data"])
+            key = get_key(record)
+
+        if model in self.__loaded:
+            if record is None:
+                self._discard(model, key)
+            else:
+                self._store(model, record)
+        else:
+            self.__pending.setdefault(model, {})[key] = record
+
+    def _discard(self, model: str, obj_id) -> bool:
+        """
+        Remove a record from memory and from the indexes.
+
+        Args:
+            model (str): The name of the model.
+            obj_id: The key of the record.
+
+        Returns:
+            bool: True if the record was present, False otherwise.
+        """
+        record = self.__data.get(model, {}).pop(obj_id, None)
+        if record is None:
+            return False
+        self.__dirty.add(model)
+
+        if model == "review":
+            self.__ratings.remove(record)
+        if model in self.__ordered:
+            self.__ordered[model].remove(obj_id)
+        if model in self.__indexes:
+            self.__indexes[model].remove(obj_id)
+        if model == "user":
+            self.__emails.remove(obj_id)
+
+        return True
 
     def get_all(self, model_name: str):
         """
@@ -92,7 +435,11 @@ class DataManager(Repository):
         if self.use_database:
             return self.db_session.query(self.models[model_name]).all()
         else:
-            return self.__data.get(model_name, [])
+            self._ensure_loaded(model_name)
+            # Writers replace records under the lock, so iterate over a snapshot
+            with self.__lock:
+                records = list(self.__data.get(model_name, {}).values())
+            return [record.to_object() for record in records]
 
     def get(self, model_name: str, obj_id: str):
         """
@@ -108,34 +455,210 @@ class DataManager(Repository):
         if self.use_database:
             return self.db_session.query(self.models[model_name]).get(obj_id)
         else:
-            for obj in self.get_all(model_name):
-                if obj.id == obj_id:
-                    return obj
-        return None
+            record = self._find(model_name, obj_id)
+            return record.to_object() if record else None
+
+    def _find(self, model_name: str, obj_id):
+        """Get a record by key, from memory, or from the model's shard if it is not loaded yet"""
+        if model_name not in self.__loaded:
+            pending = self.__pending.get(model_name, {})
+            if obj_id in pending:
+                return pending[obj_id]
+            if self.__shards and self.__shards.seekable(model_name):
+                return self.__shards.find(model_name, obj_id)
+
+            self._ensure_loaded(model_name)
+
+        return self.__data.get(model_name, {}).get(obj_id)
+
+    def get_by(self, model_name: str, field: str, value):
+        """
+        Get all objects of a model whose attribute equals a value.
+
+        Args:
+            model_name (str): The name of the model.
+            field (str): The attribute to match.
+            value: The value the attribute must have.
+
+        Returns:
+            list: The matching objects.
+        """
+        return self.find(model_name, **{field: value})
+
+    def find(self, model_name: str, **criteria):
+        """
+        Get the objects of a model matching every criterion.
+
+        Criteria use the syntax of src.persistence.criteria. An equality or ``in``
+        criterion on a field in INDEXED_FIELDS is answered from the secondary index;
+        with the database, the criteria become the WHERE clause of the query.
+
+        Args:
+            model_name (str): The name of the model.
+            **criteria: The criteria, e.g. ``place_id=..., rating__gte=4``.
+
+        Returns:
+            list: The matching objects.
+        """
+        conditions = parse_criteria(criteria)
+
+        if self.use_database:
+            model = self.models[model_name]
+            return self.db_session.query(model).filter(*where_clause(model, conditions)).all()
+
+        return [record.to_object() for record in self._select(model_name, conditions)]
+
+    def count(self, model_name: str, **criteria) -> int:
+        """
+        Count the objects of a model matching every criterion, see find.
+
+        Returns:
+            int: The number of matching objects.
+        """
+        conditions = parse_criteria(criteria)
+
+        if self.use_database:
+            model = self.models[model_name]
+            return self.db_session.scalar(
+                select(func.count()).select_from(model).where(*where_clause(model, conditions))
+            )
+
+        if not conditions:
+            self._ensure_loaded(model_name)
+            with self.__lock:
+                return len(self.__data.get(model_name, {}))
+        return len(self._select(model_name, conditions))
+
+    def _select(self, model_name: str, conditions: list) -> list:
+        """Get the records of a model satisfying parsed criteria, through an index when one applies"""
+        self._ensure_loaded(model_name)
+        index = self.__indexes.get(model_name)
+
+        with self.__lock:
+            candidates, conditions = index.select(conditions) if index else (None, conditions)
+            if candidates is None:
+                candidates = list(self.__data.get(model_name, {}).values())
+        return [record for record in candidates if matches(record, conditions)]
+
+    def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc"):
+        """
+        Get one page of the objects of a model, ordered by (created_at, id).
+
+        Args:
+            model_name (str): The name of the model.
+            after (tuple, optional): The page key of the last object of the previous page,
+                see indexes.page_key. None for the first page.
+            limit (int): The maximum number of objects to return.
+            order (str): "asc" for oldest first, "desc" for newest first.
+
+        Returns:
+            list: The objects of the page.
+        """
+        if self.use_database:
+            model = self.models[model_name]
+            return keyset_query(self.db_session.query(model), model, after, limit, order).all()
+
+        self._ensure_loaded(model_name)
+        index = self.__ordered.get(model_name)
+        if index is None:
+            return []
+        with self.__lock:
+            records = index.page(after, limit, order)
+        return [record.to_object() for record in records]
+
+    def get_rating_stats(self, place_id: str) -> dict:
+        """
+        Get the review rating stats of a place.
+
+        Args:
+            place_id (str): The ID of the place.
+
+        Returns:
+            dict: The count, sum, mean and 1-5 histogram of its ratings.
+        """
+        if self.use_database:
+            return PlaceRatingStats.for_place(place_id, self.db_session)
+
+        self._ensure_loaded("review")
+        return self.__ratings.get(place_id)
+
+    def get_by_email(self, email: str):
+        """
+        Get a user by email, ignoring case.
+
+        Args:
+            email (str): The email of the user.
+
+        Returns:
+            User: The user with that email, or None if not found.
+        """
+        if self.use_database:
+            if not email or not isinstance(email, str):
+                return None
+            return self.db_session.query(User).filter_by(email=User.normalize_email(email)).first()
+
+        self._ensure_loaded("user")
+        record = self.__emails.lookup(email)
+        return record.to_object() if record else None
 
     def reload(self):
         """
         Reload data from the file storage.
         This method is used for file-based storage to load data into memory.
-        """
-        if not self.use_database:
-            file_data = {}
-            try:
-                with open(self.__filename, "r") as file:
-                    file_data = json.load(file)
-            except (FileNotFoundError, json.JSONDecodeError):
-                pass
-
-            for model, data in file_data.items():
-                for item in data:
-                    instance: Base = self.models[model](**item)
+        The snapshot is loaded first, then the journal is replayed on top of it.
 
-                    if "created_at" in item:
-                        instance.created_at = datetime.fromisoformat(item["created_at"])
-                    if "updated_at" in item:
-                        instance.updated_at = datetime.fromisoformat(item["updated_at"])
+        The snapshot is streamed one record at a time straight into memory, and the indexes
+        are rebuilt once at the end. The load time and peak RSS are kept in ``load_stats``.
 
-                    self.save(data=instance, save_to_file=False)
+        With the sharded layout nothing is loaded here unless reload_workers is set: journal
+        entries are kept aside until their model is first used. A single-file snapshot left from before switching to the
+        sharded layout is still loaded in full, and split into shards by the next compaction.
+        """
+        if not self.use_database:
+            start = time.perf_counter()
+            records = 0
+
+            with self.__lock:
+                if self.__shards and not os.path.exists(self.__filename):
+                    self.__loaded = set()
+                    if self.__reload_workers > 0:
+                        records = self._load_all_shards()
+                else:
+                    try:
+                        serializer = detect_serializer(self.__filename)
+                        with open(self.__filename, "r" + serializer.mode) as file:
+                            for model, record in serializer.load(file, self.models):
+                                self.__data.setdefault(model, {})[get_key(record)] = record
+                                records += 1
+                    except FileNotFoundError:
+                        pass
+                    except ValueError as e:
+                        print(f"Snapshot {self.__filename} is corrupt, loaded the first {records} records: {e}")
+
+                    self.__loaded = set(self.models)
+                    for model in self.models:
+                        self._rebuild_indexes(model)
+                    if self.__shards:
+                        # Every model still has to be split out of the single-file snapshot
+                        self.__dirty = set(self.models)
+
+                for entry in self.__journal.replay():
+                    self._replay(entry)
+
+            self.load_stats = {
+                "records": records,
+                "journal_entries": self.__journal.entries,
+                "seconds": time.perf_counter() - start,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+            print(
+                f"Loaded {records} records and {self.load_stats['journal_entries']} journal entries "
+                f"in {self.load_stats['seconds']:.3f}s"
+            )
+
+            # A snapshot was interrupted, finish it now
+            if self.__journal.has_sealed:
+                self.compact()
 
     def save(self, data: Base, save_to_file=True):
         """
@@ -143,7 +666,7 @@ class DataManager(Repository):
 
         Args:
             data (Base): The object to save.
-            save_to_file (bool, optional): Whether to save to file immediately (for file-based storage). Defaults to True.
+            save_to_file (bool, optional): Whether to journal the save immediately (for file-based storage). Defaults to True.
 
         Returns:
             Base: The saved object.
@@ -153,14 +676,14 @@ class DataManager(Repository):
             self.db_session.commit()
         else:
             model: str = data.__class__.__name__.lower()
+            record = to_record(data)
 
-            if model not in self.__data:
-                self.__data[model] = []
-
-            self.__data[model].append(data)
+            with self.__lock:
+                self._ensure_loaded(model)
+                self._store(model, record)
 
-            if save_to_file:
-                self._save_to_file()
+                if save_to_file:
+                    self._journal({"op": "save", "model": model, "data": record.to_dict()})
         return data
 
     def update(self, obj: Base):
@@ -179,12 +702,17 @@ class DataManager(Repository):
             return obj
         else:
             cls = obj.__class__.__name__.lower()
+            obj_id = get_key(obj)
 
-            for i, o in enumerate(self.__data[cls]):
-                if o.id == obj.id:
+            with self.__lock:
+                self._ensure_loaded(cls)
+                if obj_id in self.__data[cls]:
                     obj.updated_at = datetime.now()
-                    self.__data[cls][i] = obj
-                    self._save_to_file()
+                    record = to_record(obj)
+
+                    self._store(cls, record)
+
+                    self._journal({"op": "update", "model": cls, "data": record.to_dict()})
                     return obj
 
         return None
@@ -205,12 +733,111 @@ class DataManager(Repository):
             return True
         else:
             class_name = obj.__class__.__name__.lower()
+            obj_id = get_key(obj)
 
-            if obj not in self.__data[class_name]:
-                return False
+            with self.__lock:
+                self._ensure_loaded(class_name)
+                if not self._discard(class_name, obj_id):
+                    return False
 
-            self.__data[class_name].remove(obj)
-
-            self._save_to_file()
+                self._journal({"op": "delete", "model": class_name, "id": obj_id})
 
             return True
+
+    def save_many(self, objs: list[Base]) -> list[Base]:
+        """
+        Save several objects, journaling them with a single write and flush.
+
+        Args:
+            objs (list): The objects to save.
+
+        Returns:
+            list: The saved objects.
+        """
+        if self.use_database:
+            self.db_session.add_all(objs)
+            self.db_session.commit()
+            return objs
+
+        records = [(obj.__class__.__name__.lower(), to_record(obj)) for obj in objs]
+
+        with self.__lock:
+            for model, record in records:
+                self._ensure_loaded(model)
+                self._store(model, record)
+
+            if records:
+                self._journal(*(
+                    {"op": "save", "model": model, "data": record.to_dict()} for model, record in records
+                ))
+
+        return objs
+
+    def update_many(self, objs: list[Base]) -> list[Base]:
+        """
+        Update several existing objects, journaling them with a single write and flush.
+
+        Args:
+            objs (list): The objects to update.
+
+        Returns:
+            list: The objects that were found and updated.
+        """
+        if self.use_database:
+            for obj in objs:
+                self.db_session.merge(obj)
+            self.db_session.commit()
+            return objs
+
+        updated = []
+        entries = []
+
+        with self.__lock:
+            now = datetime.now()
+            for obj in objs:
+                cls = obj.__class__.__name__.lower()
+                self._ensure_loaded(cls)
+                if get_key(obj) not in self.__data[cls]:
+                    continue
+
+                obj.updated_at = now
+                record = to_record(obj)
+                self._store(cls, record)
+                entries.append({"op": "update", "model": cls, "data": record.to_dict()})
+                updated.append(obj)
+
+            if entries:
+                self._journal(*entries)
+
+        return updated
+
+    def delete_many(self, objs: list[Base]) -> int:
+        """
+        Delete several objects, journaling them with a single write and flush.
+
+        Args:
+            objs (list): The objects to delete.
+
+        Returns:
+            int: The number of objects deleted.
+        """
+        if self.use_database:
+            for obj in objs:
+                self.db_session.delete(obj)
+            self.db_session.commit()
+            return len(objs)
+
+        entries = []
+
+        with self.__lock:
+            for obj in objs:
+                class_name = obj.__class__.__name__.lower()
+                obj_id = get_key(obj)
+                self._ensure_loaded(class_name)
+                if self._discard(class_name, obj_id):
+                    entries.append({"op": "delete", "model": class_name, "id": obj_id})
+
+            if entries:
+                self._journal(*entries)
+
+        return len(entries)
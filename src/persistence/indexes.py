@@ -0,0 +1,209 @@
+""" Secondary indexes shared by the in-memory and file repositories """
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Any
+
+# Foreign-key attributes indexed for each model
+INDEXED_FIELDS: dict[str, tuple[str, ...]] = {
+    "review": ("place_id", "user_id"),
+    "place": ("city_id", "user_id"),
+    "city": ("country_code",),
+    "placeamenity": ("place_id",),
+}
+
+
+def get_key(obj) -> Any:
+    """
+    Get the key an object is stored under.
+
+    Countries have no ``id`` column and are keyed by their ``code`` instead.
+    """
+    return getattr(obj, "id", None) or obj.code
+
+
+def page_key(obj) -> tuple[datetime, str]:
+    """
+    Get the (created_at, id) position of an object in keyset pagination.
+
+    Objects without a creation time, such as countries, sort first and by key.
+    """
+    return getattr(obj, "created_at", None) or datetime.min, str(get_key(obj))
+
+
+class SecondaryIndex:
+    """
+    Maps attribute values to the objects holding them, for one model.
+
+    The values each object was indexed under are remembered, so an object
+    mutated in place can be re-indexed without scanning the buckets.
+    """
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        self.fields = fields
+        # {field: {value: {obj_id: obj}}}
+        self.__buckets: dict[str, dict[Any, dict]] = {f: {} for f in fields}
+        # {obj_id: (value of each field when indexed)}
+        self.__indexed: dict[Any, tuple] = {}
+
+    def add(self, obj) -> None:
+        """Index an object, replacing any previous entry for its key"""
+        obj_id = get_key(obj)
+        self.remove(obj_id)
+
+        values = tuple(getattr(obj, field, None) for field in self.fields)
+        for field, value in zip(self.fields, values):
+            self.__buckets[field].setdefault(value, {})[obj_id] = obj
+        self.__indexed[obj_id] = values
+
+    def remove(self, obj_id) -> None:
+        """Drop an object from the index"""
+        values = self.__indexed.pop(obj_id, None)
+        if values is None:
+            return
+
+        for field, value in zip(self.fields, values):
+            bucket = self.__buckets[field][value]
+            del bucket[obj_id]
+            if not bucket:
+                del self.__buckets[field][value]
+
+    def lookup(self, field: str, value) -> list:
+        """Get the objects whose ``field`` equals ``value``"""
+        return list(self.__buckets[field].get(value, {}).values())
+
+    def select(self, conditions: list[tuple[str, str, Any]]) -> tuple[list | None, list]:
+        """
+        Narrow a query down with the index.
+
+        Conditions are (field, lookup, value) tuples as returned by
+        criteria.parse_criteria. The first equality or ``in`` condition on an
+        indexed field is answered from the buckets.
+
+        Returns:
+            tuple: The candidate objects, or None when no condition can use the
+            index, and the conditions the candidates still have to be checked
+            against.
+        """
+        for position, (field, lookup, value) in enumerate(conditions):
+            if field not in self.__buckets or lookup not in ("eq", "in"):
+                continue
+
+            buckets = self.__buckets[field]
+            if lookup == "eq":
+                candidates = self.lookup(field, value)
+            else:
+                candidates = [obj for option in dict.fromkeys(value) for obj in buckets.get(option, {}).values()]
+            return candidates, conditions[:position] + conditions[position + 1 :]
+
+        return None, conditions
+
+    def clear(self) -> None:
+        """Empty the index"""
+        for bucket in self.__buckets.values():
+            bucket.clear()
+        self.__indexed.clear()
+
+
+class UniqueIndex:
+    """
+    Maps a case-normalized attribute value to the single object holding it,
+    for one model.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        # {normalized value: obj}
+        self.__objects: dict[Any, Any] = {}
+        # {obj_id: normalized value when indexed}
+        self.__indexed: dict[Any, Any] = {}
+
+    @staticmethod
+    def normalize(value):
+        """Normalize a value so lookups ignore case and surrounding spaces"""
+        return value.strip().lower() if isinstance(value, str) else value
+
+    def add(self, obj) -> None:
+        """Index an object, replacing any previous entry for its key"""
+        obj_id = get_key(obj)
+        self.remove(obj_id)
+
+        value = self.normalize(getattr(obj, self.field, None))
+        self.__objects[value] = obj
+        self.__indexed[obj_id] = value
+
+    def remove(self, obj_id) -> None:
+        """Drop an object from the index"""
+        if obj_id not in self.__indexed:
+            return
+
+        value = self.__indexed.pop(obj_id)
+        obj = self.__objects.get(value)
+        if obj is not None and get_key(obj) == obj_id:
+            del self.__objects[value]
+
+    def lookup(self, value):
+        """Get the object holding ``value``, or None"""
+        return self.__objects.get(self.normalize(value))
+
+    def clear(self) -> None:
+        """Empty the index"""
+        self.__objects.clear()
+        self.__indexed.clear()
+
+
+class OrderedIndex:
+    """
+    Keeps the objects of one model sorted by page_key, so a page after any
+    position is found by binary search instead of sorting the model.
+    """
+
+    def __init__(self) -> None:
+        # Sorted page keys
+        self.__keys: list[tuple] = []
+        # {page key: obj}
+        self.__objects: dict[tuple, Any] = {}
+        # {obj_id: page key when indexed}
+        self.__indexed: dict[Any, tuple] = {}
+
+    def add(self, obj) -> None:
+        """Index an object, replacing any previous entry for its key"""
+        obj_id = get_key(obj)
+        key = page_key(obj)
+
+        if self.__indexed.get(obj_id) != key:
+            self.remove(obj_id)
+            # Objects mostly arrive in creation order, so this is usually an append
+            insort(self.__keys, key)
+            self.__indexed[obj_id] = key
+        self.__objects[key] = obj
+
+    def remove(self, obj_id) -> None:
+        """Drop an object from the index"""
+        key = self.__indexed.pop(obj_id, None)
+        if key is None:
+            return
+
+        del self.__keys[bisect_left(self.__keys, key)]
+        del self.__objects[key]
+
+    def page(self, after: tuple | None, limit: int, order: str = "asc") -> list:
+        """
+        Get up to ``limit`` objects following the page key ``after``, or from
+        the start when it is None. With order "desc" the objects come newest
+        first and follow ``after`` in that direction.
+        """
+        if order == "desc":
+            end = len(self.__keys) if after is None else bisect_left(self.__keys, after)
+            keys = self.__keys[max(end - limit, 0) : end][::-1]
+        else:
+            start = 0 if after is None else bisect_right(self.__keys, after)
+            keys = self.__keys[start : start + limit]
+
+        return [self.__objects[key] for key in keys]
+
+    def clear(self) -> None:
+        """Empty the index"""
+        self.__keys.clear()
+        self.__objects.clear()
+        self.__indexed.clear()
@@ -0,0 +1,205 @@
+""" Append-only journal of repository mutations for the file repository """
+
+import json
+import os
+import shutil
+import threading
+from typing import Iterator
+
+# When appended entries reach the disk:
+#   always    flush and fsync on every append
+#   interval  group commit: a background thread flushes and fsyncs every
+#             interval_ms, so all appends in that window share one fsync
+#   off       only flush when the journal is closed or sealed
+DURABILITY_MODES = ("always", "interval", "off")
+DEFAULT_DURABILITY = "always"
+DEFAULT_FLUSH_INTERVAL_MS = 100
+
+
+class Journal:
+    """
+    An append-only log with one JSON document per line.
+
+    Each mutation of the file repository is appended as a single entry, so
+    a write costs one small append instead of rewriting the whole data
+    file. On reload the entries are replayed, in order, on top of the last
+    snapshot.
+
+    Entries look like:
+        {"op": "save", "model": "review", "data": {...}}
+        {"op": "update", "model": "review", "data": {...}}
+        {"op": "delete", "model": "review", "id": "..."}
+
+    While a snapshot is being written, the entries it covers are moved to a
+    sealed segment (``<path>.sealed``) and new entries go to a fresh active
+    file. The sealed segment is deleted once the snapshot is in place, and
+    replayed before the active file if a crash left it behind.
+
+    How soon appends reach the disk depends on the durability mode, see
+    DURABILITY_MODES.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        durability: str = DEFAULT_DURABILITY,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+
+        self.path = path
+        self.sealed_path = f"{path}.sealed"
+        self.durability = durability
+        self.flush_interval = flush_interval_ms / 1000
+        self.__file = None
+        # Guards the file against the background flusher
+        self.__lock = threading.Lock()
+        # Whether appends are waiting for the background flusher
+        self.__dirty = False
+        self.__flusher: threading.Thread | None = None
+        self.__stop = threading.Event()
+        # Entries and bytes in the active file, counted on replay and append
+        self.entries = 0
+        self.size = 0
+
+    def append(self, entry: dict) -> None:
+        """Append an entry, making it durable according to the durability mode"""
+        self.append_many([entry])
+
+    def append_many(self, entries: list[dict]) -> None:
+        """
+        Append several entries with a single write, so in the 'always' mode they share one fsync.
+        A crash mid-write can still keep the first entries and lose the rest.
+        """
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+
+        with self.__lock:
+            if self.__file is None:
+                self.__file = open(self.path, "a", encoding="utf-8")
+
+            self.__file.write(lines)
+            self.entries += len(entries)
+            self.size += len(lines)
+
+            if self.durability == "always":
+                self._sync()
+            elif self.durability == "interval":
+                self.__dirty = True
+                self._start_flusher()
+
+    def _sync(self) -> None:
+        """Flush and fsync the open file. Must be called with the lock held."""
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def _start_flusher(self) -> None:
+        if self.__flusher is None or not self.__flusher.is_alive():
+            self.__stop.clear()
+            self.__flusher = threading.Thread(
+                target=self._flush_periodically, name="journal-flusher", daemon=True
+            )
+            self.__flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self.__stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Make every appended entry durable now"""
+        with self.__lock:
+            if self.__file is not None and (self.__dirty or self.durability != "interval"):
+                self._sync()
+            self.__dirty = False
+
+    def replay(self) -> Iterator[dict]:
+        """
+        Yield the journal entries in the order they were written, starting
+        with a sealed segment left behind by an interrupted snapshot.
+
+        A last line cut short by a crash mid-append is skipped and cut off
+        the file, so later appends start on a clean line.
+        """
+        yield from self._replay_file(self.sealed_path)
+
+        self.entries = 0
+        self.size = 0
+        for entry in self._replay_file(self.path):
+            self.entries += 1
+            yield entry
+        self.size = self._file_size(self.path)
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _replay_file(self, path: str) -> Iterator[dict]:
+        valid = 0
+
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return
+
+        with file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                valid += len(line)
+                yield entry
+
+        if valid < self._file_size(path):
+            os.truncate(path, valid)
+
+    @property
+    def has_sealed(self) -> bool:
+        """Whether a sealed segment is waiting for a snapshot"""
+        return os.path.exists(self.sealed_path)
+
+    def seal(self) -> None:
+        """
+        Move the active entries to the sealed segment and start a new
+        active file. Entries already sealed by an interrupted snapshot are
+        kept ahead of them.
+        """
+        with self.__lock:
+            self._close()
+            self._seal()
+
+    def _seal(self) -> None:
+        if os.path.exists(self.path):
+            if os.path.exists(self.sealed_path):
+                with open(self.sealed_path, "ab") as sealed, open(self.path, "rb") as active:
+                    shutil.copyfileobj(active, sealed)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.sealed_path)
+        self.entries = 0
+        self.size = 0
+
+    def drop_sealed(self) -> None:
+        """Delete the sealed segment, once a snapshot covers it"""
+        try:
+            os.remove(self.sealed_path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Make pending entries durable and close the journal file, if open"""
+        self.__stop.set()
+        with self.__lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self.__file is not None:
+            self._sync()
+            self.__file.close()
+            self.__file = None
+        self.__dirty = False
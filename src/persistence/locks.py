@@ -0,0 +1,62 @@
+""" Locks used by the in-memory repositories """
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    A lock that lets many readers in at once, or a single writer.
+
+    Waiting writers block new readers, so a steady stream of reads cannot
+    starve writes. The lock is not reentrant.
+    """
+
+    def __init__(self) -> None:
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writing = False
+        self.__waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared for the duration of the block"""
+        with self.__cond:
+            while self.__writing or self.__waiting_writers:
+                self.__cond.wait()
+            self.__readers += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively for the duration of the block"""
+        with self.__cond:
+            self.__waiting_writers += 1
+            while self.__writing or self.__readers:
+                self.__cond.wait()
+            self.__waiting_writers -= 1
+            self.__writing = True
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writing = False
+                self.__cond.notify_all()
+
+
+class NullLock:
+    """A ReadWriteLock stand-in that does no locking, for single-threaded use"""
+
+    @contextmanager
+    def read(self):
+        yield
+
+    @contextmanager
+    def write(self):
+        yield
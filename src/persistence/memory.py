@@ -1,5 +1,13 @@
+import os
 from datetime import datetime
+from src.persistence.columnar import ColumnarPlaceStore
+from src.persistence.criteria import matches, parse_criteria
+from src.persistence.indexes import INDEXED_FIELDS, OrderedIndex, SecondaryIndex, UniqueIndex, get_key
+from src.persistence.locks import NullLock, ReadWriteLock
+from src.persistence.ratings import RatingAggregates
+from src.persistence.records import to_record
 from src.persistence.repository import Repository
+from src.persistence.snapshot import Snapshot
 from utils.populate import populate_db
 from src.models.base import Base
 
@@ -8,23 +16,83 @@ class MemoryRepository(Repository):
     In-memory repository implementation for storing and managing data in memory.
     This class provides methods to get, save, update, and delete objects, as well as
     reload the in-memory database with initial data.
-    """
 
-    # Dictionary to hold lists of objects for each model type
-    __data: dict[str, list] = {
-        "country": [],
-        "user": [],
-        "amenity": [],
-        "city": [],
-        "review": [],
-        "place": [],
-        "placeamenity": [],
-    }
+    Objects are stored per model in a dictionary keyed by their ID, so lookups,
+    updates and deletions take constant time. Dictionaries keep insertion order,
+    so get_all still returns objects in the order they were saved.
+
+    The dictionaries hold compact slotted Records (see records.py) rather than
+    model instances. Every read hydrates fresh model instances, so callers
+    never share state with the store and changes only land through update.
+
+    Foreign-key attributes listed in INDEXED_FIELDS are kept in secondary
+    indexes, so find and get_by on them do not scan the whole model. User
+    emails are kept in a case-insensitive unique index for get_by_email,
+    and every model in an OrderedIndex by (created_at, id) for page. The
+    rating stats of every place are updated as reviews are stored.
+
+    When thread safe (the default, see MEMORY_THREAD_SAFE), reads share a
+    reader/writer lock and writes hold it exclusively, so threaded workers
+    can call the repository concurrently.
+
+    Reads of a whole collection go through versioned snapshots: every write
+    to a model publishes a new version, and the first reader of that version
+    freezes the collection into an immutable Snapshot that later readers
+    share. get_all copies from the snapshot outside the lock, so serializing
+    a large collection never holds up writers or sees a half-applied write.
+
+    The snapshot is copied lazily, on read, rather than by the writer on
+    commit. The first reader after a write copies the collection under the
+    read lock, so a writer arriving then waits O(n) for it, once per
+    version. Copying on commit would instead make every write O(n) under
+    the exclusive lock, stalling all readers and writers even when no one
+    reads the whole collection, and make a loop of n single writes O(n^2).
+
+    With columnar_places enabled (MEMORY_COLUMNAR_PLACES), the numeric place
+    attributes are mirrored into a numpy-backed ColumnarPlaceStore, and
+    find evaluates place criteria on them as vectorized masks.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, thread_safe: bool | None = None, columnar_places: bool | None = None) -> None:
         """
         Initialize the memory repository and populate it with initial data.
+
+        Parameters:
+        thread_safe (bool, optional): Whether to lock around reads and writes.
+            Defaults to the MEMORY_THREAD_SAFE environment variable, or True.
+        columnar_places (bool, optional): Whether to keep the columnar place store.
+            Defaults to the MEMORY_COLUMNAR_PLACES environment variable, or False.
         """
+        if thread_safe is None:
+            thread_safe = os.getenv('MEMORY_THREAD_SAFE', 'true').lower() == 'true'
+        if columnar_places is None:
+            columnar_places = os.getenv('MEMORY_COLUMNAR_PLACES', 'false').lower() == 'true'
+
+        self.__lock = ReadWriteLock() if thread_safe else NullLock()
+        # Dictionary mapping each model type to an {id: record} dictionary
+        self.__data: dict[str, dict] = {
+            "country": {},
+            "user": {},
+            "amenity": {},
+            "city": {},
+            "review": {},
+            "place": {},
+            "placeamenity": {},
+        }
+        # Secondary indexes for the models that have foreign keys
+        self.__indexes: dict[str, SecondaryIndex] = {
+            model: SecondaryIndex(fields) for model, fields in INDEXED_FIELDS.items()
+        }
+        self.__emails = UniqueIndex("email")
+        # Every model sorted by (created_at, id), for keyset pagination
+        self.__ordered: dict[str, OrderedIndex] = {model: OrderedIndex() for model in self.__data}
+        # Review rating aggregates of every place
+        self.__ratings = RatingAggregates()
+        # Current version of each model and its published snapshot, if any
+        self.__versions: dict[str, int] = {model: 0 for model in self.__data}
+        self.__snapshots: dict[str, Snapshot] = {}
+        self.__places = ColumnarPlaceStore() if columnar_places else None
+
         self.reload()
 
     def get_all(self, model_name: str) -> list:
@@ -37,7 +105,51 @@ class MemoryRepository(Repository):
         Returns:
         list: A list of all objects of the specified model.
         """
-        return self.__data.get(model_name, [])
+        return [record.to_object() for record in self.snapshot(model_name)]
+
+    def snapshot(self, model_name: str) -> Snapshot:
+        """
+        Get an immutable view of the records of a given model.
+
+        The snapshot is shared by every reader until the next write to the
+        model, and is never modified afterwards. The first call after a write
+        copies the collection under the read lock, holding up writers for
+        that long; see the class docstring.
+
+        Parameters:
+        model_name (str): The name of the model.
+
+        Returns:
+        Snapshot: The records of the model at its current version.
+        """
+        snapshot = self.__snapshots.get(model_name)
+        if snapshot is not None:
+            return snapshot
+
+        with self.__lock.read():
+            # Writers are excluded here, so the collection cannot change
+            # while it is copied. Concurrent readers may build the same
+            # snapshot twice, which is harmless.
+            snapshot = self.__snapshots.get(model_name)
+            if snapshot is None:
+                snapshot = Snapshot(
+                    self.__data.get(model_name, {}).values(),
+                    self.__versions.get(model_name, 0),
+                )
+                if model_name in self.__versions:
+                    self.__snapshots[model_name] = snapshot
+
+        return snapshot
+
+    def _publish(self, model_name: str) -> None:
+        """
+        Start a new version of a model after a write.
+
+        Must be called with the write lock held. The previous snapshot stays
+        valid for readers that already hold it.
+        """
+        self.__versions[model_name] += 1
+        self.__snapshots.pop(model_name, None)
 
     def get(self, model_name: str, obj_id: str):
         """
@@ -50,12 +162,129 @@ class MemoryRepository(Repository):
         Returns:
         The object if found, otherwise None.
         """
-        # Iterate through the list of objects for the given model
-        for obj in self.get_all(model_name):
-            # Return the object if the ID matches
-            if obj.id == obj_id:
-                return obj
-        return None
+        with self.__lock.read():
+            record = self.__data.get(model_name, {}).get(obj_id)
+
+        return record.to_object() if record else None
+
+    def get_by(self, model_name: str, field: str, value) -> list:
+        """
+        Get all objects of a model whose attribute equals a value.
+
+        Parameters:
+        model_name (str): The name of the model.
+        field (str): The attribute to match.
+        value: The value the attribute must have.
+
+        Returns:
+        list: The matching objects, in insertion order.
+        """
+        return self.find(model_name, **{field: value})
+
+    def find(self, model_name: str, **criteria) -> list:
+        """
+        Get the objects of a model matching every criterion.
+
+        Criteria use the syntax of src.persistence.criteria, e.g.
+        ``place_id=..., rating__gte=4``. An equality or ``in`` criterion on a
+        field in INDEXED_FIELDS is answered from the secondary index, so only
+        the objects it returns are checked against the other criteria. Place
+        criteria on columnar fields are evaluated as numpy masks when the
+        columnar store is enabled. Other queries check each object.
+
+        Returns:
+        list: The matching objects.
+        """
+        return [record.to_object() for record in self._select(model_name, parse_criteria(criteria))]
+
+    def count(self, model_name: str, **criteria) -> int:
+        """
+        Count the objects of a model matching every criterion, without hydrating them.
+
+        See find for the criteria.
+        """
+        if not criteria:
+            with self.__lock.read():
+                return len(self.__data.get(model_name, {}))
+        return len(self._select(model_name, parse_criteria(criteria)))
+
+    def _select(self, model_name: str, conditions: list) -> list:
+        """Get the records of a model satisfying parsed criteria, through an index when one applies"""
+        index = self.__indexes.get(model_name)
+
+        with self.__lock.read():
+            candidates, conditions = index.select(conditions) if index else (None, conditions)
+
+            if candidates is None and model_name == "place" and self.__places is not None:
+                if self.__places.supports(conditions):
+                    places = self.__data["place"]
+                    return [places[place_id] for place_id in self.__places.search(conditions)]
+
+        if candidates is None:
+            candidates = self.snapshot(model_name)
+        if not conditions:
+            return list(candidates)
+        return [record for record in candidates if matches(record, conditions)]
+
+    def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list:
+        """
+        Get one page of the objects of a model, ordered by (created_at, id).
+
+        Parameters:
+        model_name (str): The name of the model.
+        after (tuple, optional): The page key of the last object of the
+            previous page, see indexes.page_key. None for the first page.
+        limit (int): The maximum number of objects to return.
+        order (str): "asc" for oldest first, "desc" for newest first.
+
+        Returns:
+        list: The objects of the page.
+        """
+        index = self.__ordered.get(model_name)
+        if index is None:
+            return []
+
+        with self.__lock.read():
+            records = index.page(after, limit, order)
+
+        return [record.to_object() for record in records]
+
+    def search_places(self, **criteria) -> list:
+        """
+        Get the places matching every criterion, see find.
+
+        Returns:
+        list: The matching places, in insertion order.
+        """
+        return self.find("place", **criteria)
+
+    def get_rating_stats(self, place_id: str) -> dict:
+        """
+        Get the review rating stats of a place, kept up to date on every review write.
+
+        Parameters:
+        place_id (str): The ID of the place.
+
+        Returns:
+        dict: The count, sum, mean and 1-5 histogram of its ratings.
+        """
+        with self.__lock.read():
+            return self.__ratings.get(place_id)
+
+    def get_by_email(self, email: str):
+        """
+        Get a user by email, ignoring case.
+
+        Parameters:
+        email (str): The email of the user.
+
+        Returns:
+        The user if found, otherwise None.
+        """
+        with self.__lock.read():
+            record = self.__emails.lookup(email)
+
+        return record.to_object() if record else None
 
     def reload(self):
         """
@@ -63,6 +292,41 @@ class MemoryRepository(Repository):
         """
         populate_db(self)
 
+    def _store(self, cls: str, record) -> None:
+        """Put a record in the data and the indexes. Must be called with the write lock held."""
+        key = get_key(record)
+        if cls == "review":
+            self.__ratings.replace(self.__data[cls].get(key), record)
+
+        self.__data[cls][key] = record
+        self.__ordered[cls].add(record)
+
+        # Foreign keys may have changed, so index the record again
+        if cls in self.__indexes:
+            self.__indexes[cls].add(record)
+        if cls == "user":
+            self.__emails.add(record)
+        if cls == "place" and self.__places is not None:
+            self.__places.add(record)
+
+    def _discard(self, cls: str, obj_id) -> bool:
+        """Remove a record from the data and the indexes. Must be called with the write lock held."""
+        record = self.__data[cls].pop(obj_id, None)
+        if record is None:
+            return False
+
+        self.__ordered[cls].remove(obj_id)
+        if cls == "review":
+            self.__ratings.remove(record)
+        if cls in self.__indexes:
+            self.__indexes[cls].remove(obj_id)
+        if cls == "user":
+            self.__emails.remove(obj_id)
+        if cls == "place" and self.__places is not None:
+            self.__places.remove(obj_id)
+
+        return True
+
     def save(self, obj: Base):
         """
         Save an object to the in-memory database.
@@ -75,10 +339,11 @@ class MemoryRepository(Repository):
         """
         # Get the model name from the object's class name
         cls = obj.__class__.__name__.lower()
+        record = to_record(obj)
 
-        # Add the object to the list if it is not already present
-        if obj not in self.__data[cls]:
-            self.__data[cls].append(obj)
+        with self.__lock.write():
+            self._store(cls, record)
+            self._publish(cls)
 
         return obj
 
@@ -94,16 +359,17 @@ class MemoryRepository(Repository):
         """
         # Get the model name from the object's class name
         cls = obj.__class__.__name__.lower()
+        obj_id = get_key(obj)
 
-        # Iterate through the list of objects for the given model
-        for i, o in enumerate(self.__data[cls]):
-            # Update the object if the ID matches
-            if o.id == obj.id:
-                obj.updated_at = datetime.now()
-                self.__data[cls][i] = obj
-                return obj
+        with self.__lock.write():
+            if obj_id not in self.__data[cls]:
+                return None
 
-        return None
+            obj.updated_at = datetime.now()
+            self._store(cls, to_record(obj))
+            self._publish(cls)
+
+        return obj
 
     def delete(self, obj: Base) -> bool:
         """
@@ -118,9 +384,83 @@ class MemoryRepository(Repository):
         # Get the model name from the object's class name
         cls = obj.__class__.__name__.lower()
 
-        # Remove the object from the list if it is present
-        if obj in self.__data[cls]:
-            self.__data[cls].remove(obj)
-            return True
+        with self.__lock.write():
+            if not self._discard(cls, get_key(obj)):
+                return False
+
+            self._publish(cls)
+
+        return True
+
+    def save_many(self, objs: list[Base]) -> list[Base]:
+        """
+        Save several objects under a single acquisition of the write lock.
+
+        Parameters:
+        objs (list): The objects to save.
+
+        Returns:
+        list: The saved objects.
+        """
+        records = [(obj.__class__.__name__.lower(), to_record(obj)) for obj in objs]
+
+        with self.__lock.write():
+            for cls, record in records:
+                self._store(cls, record)
+            for cls in {cls for cls, _ in records}:
+                self._publish(cls)
+
+        return objs
+
+    def update_many(self, objs: list[Base]) -> list[Base]:
+        """
+        Update several objects under a single acquisition of the write lock.
+
+        Parameters:
+        objs (list): The objects to update.
+
+        Returns:
+        list: The objects that were found and updated.
+        """
+        updated = []
+
+        with self.__lock.write():
+            now = datetime.now()
+            for obj in objs:
+                cls = obj.__class__.__name__.lower()
+                if get_key(obj) not in self.__data[cls]:
+                    continue
+
+                obj.updated_at = now
+                self._store(cls, to_record(obj))
+                updated.append(obj)
+
+            for cls in {obj.__class__.__name__.lower() for obj in updated}:
+                self._publish(cls)
+
+        return updated
+
+    def delete_many(self, objs: list[Base]) -> int:
+        """
+        Delete several objects under a single acquisition of the write lock.
+
+        Parameters:
+        objs (list): The objects to delete.
+
+        Returns:
+        int: The number of objects deleted.
+        """
+        deleted = set()
+        count = 0
+
+        with self.__lock.write():
+            for obj in objs:
+                cls = obj.__class__.__name__.lower()
+                if self._discard(cls, get_key(obj)):
+                    deleted.add(cls)
+                    count += 1
+
+            for cls in deleted:
+                self._publish(cls)
 
-        return False
+        return count
@@ -0,0 +1,74 @@
+""" Opaque cursors for keyset pagination of list endpoints
+
+A page is requested with the page key, (created_at, id), of the last
+object of the previous page, so every page is a seek on an ordered index
+instead of an offset scan. Clients get that position as an opaque cursor
+that also remembers the sort order.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+import json
+
+from sqlalchemy import and_, inspect, or_
+
+from src.persistence.indexes import page_key
+
+ORDERS = ("asc", "desc")
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(obj, order: str = "asc") -> str:
+    """Get the cursor of the page following an object"""
+    created_at, obj_id = page_key(obj)
+    data = json.dumps([order, created_at.isoformat(), obj_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[tuple[datetime, str], str]:
+    """
+    Get the page key and the sort order a cursor stands for.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        order, created_at, obj_id = json.loads(data)
+        after = (datetime.fromisoformat(created_at), str(obj_id))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if order not in ORDERS:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return after, order
+
+
+def keyset_query(query, model: type, after: tuple | None, limit: int, order: str = "asc"):
+    """
+    Restrict a SQLAlchemy query to one page of a model ordered by (created_at, primary key).
+
+    The page starts with a range condition on the ordering columns, so the
+    database seeks to it instead of skipping rows with OFFSET. Models without
+    a created_at column, such as countries, are ordered by primary key only.
+    """
+    primary_key = inspect(model).primary_key[0]
+    created_at = getattr(model, "created_at", None)
+    descending = order == "desc"
+
+    if after is not None:
+        after_created_at, after_id = after
+        if descending:
+            after_row = primary_key < after_id
+            if created_at is not None:
+                after_row = or_(created_at < after_created_at, and_(created_at == after_created_at, after_row))
+        else:
+            after_row = primary_key > after_id
+            if created_at is not None:
+                after_row = or_(created_at > after_created_at, and_(created_at == after_created_at, after_row))
+        query = query.filter(after_row)
+
+    columns = [primary_key] if created_at is None else [created_at, primary_key]
+    return query.order_by(*(column.desc() if descending else column.asc() for column in columns)).limit(limit)
@@ -0,0 +1,95 @@
+""" Per-place review rating aggregates
+
+Every place keeps the count and sum of its review ratings and a histogram
+of ratings rounded to 1-5 stars, adjusted as reviews are written, so the
+stats of a place are read in constant time. The memory and file
+repositories keep them in a RatingAggregates map; the database keeps them
+in the place_rating_stats table (see PlaceRatingStats).
+"""
+
+import math
+from typing import Any
+
+STARS = range(1, 6)
+
+
+def star(rating) -> int:
+    """Get the histogram bucket of a rating: rounded half up, and clamped to 1-5"""
+    return min(max(math.floor(float(rating) + 0.5), 1), 5)
+
+
+def stats_dict(count: int, total: float, histogram: list[int]) -> dict:
+    """The stats of a place as returned by the repositories"""
+    return {
+        "count": count,
+        "sum": total,
+        "mean": total / count if count else None,
+        "histogram": {str(stars): histogram[stars - 1] for stars in STARS},
+    }
+
+
+class RatingStats:
+    """The running rating aggregates of one place"""
+
+    __slots__ = ("count", "total", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.histogram = [0] * len(STARS)
+
+    def add(self, rating, sign: int = 1) -> None:
+        """Count a rating in, or out with sign -1"""
+        self.count += sign
+        self.total += sign * float(rating)
+        self.histogram[star(rating) - 1] += sign
+
+    def to_dict(self) -> dict:
+        return stats_dict(self.count, self.total, self.histogram)
+
+
+class RatingAggregates:
+    """
+    The rating stats of every place, kept up to date from the reviews stored
+    and discarded by a repository.
+    """
+
+    def __init__(self) -> None:
+        self.__places: dict[Any, RatingStats] = {}
+
+    def add(self, review) -> None:
+        """Count a review in"""
+        if review.place_id is None or review.rating is None:
+            return
+        self.__places.setdefault(review.place_id, RatingStats()).add(review.rating)
+
+    def remove(self, review) -> None:
+        """Count a review out, as it was when added"""
+        if review.place_id is None or review.rating is None:
+            return
+
+        stats = self.__places.get(review.place_id)
+        if stats is None:
+            return
+
+        stats.add(review.rating, -1)
+        if not stats.count:
+            del self.__places[review.place_id]
+
+    def replace(self, previous, review) -> None:
+        """
+        Count a stored review out, if any, and its new version in. A rating
+        that is not a number raises before the stats change.
+        """
+        if review.place_id is not None and review.rating is not None:
+            star(review.rating)
+        if previous is not None:
+            self.remove(previous)
+        self.add(review)
+
+    def get(self, place_id) -> dict:
+        """Get the stats of a place, all zero if it has no reviews"""
+        return (self.__places.get(place_id) or RatingStats()).to_dict()
+
+    def clear(self) -> None:
+        self.__places.clear()
@@ -0,0 +1,94 @@
+""" Compact records used by the in-memory and file repositories
+
+Model instances carry SQLAlchemy instance state and attribute
+instrumentation even when no session is involved. The non-SQL backends
+store a slotted Record per object instead, holding only the mapped column
+values, and hydrate model instances when objects leave the repository.
+"""
+
+from datetime import datetime
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm.base import manager_of_class
+
+
+class Record:
+    """
+    Base class for the per-model record types built by record_type.
+
+    Subclasses have one slot per mapped column. Records stored in a
+    repository are never modified; updates replace them.
+    """
+
+    __slots__ = ()
+
+    model: type
+    fields: tuple[str, ...]
+    datetime_fields: frozenset[str]
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.to_dict()}>"
+
+    @classmethod
+    def from_object(cls, obj) -> "Record":
+        """Copy the column values of a model instance"""
+        record = cls.__new__(cls)
+        for field in cls.fields:
+            setattr(record, field, getattr(obj, field, None))
+        return record
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Record":
+        """Build a record from a dictionary produced by to_dict"""
+        record = cls.__new__(cls)
+        for field in cls.fields:
+            value = data.get(field)
+            if value is not None and field in cls.datetime_fields:
+                value = datetime.fromisoformat(value)
+            setattr(record, field, value)
+        return record
+
+    def to_dict(self) -> dict:
+        """Get the column values, with datetimes as ISO strings"""
+        data = {}
+        for field in self.fields:
+            value = getattr(self, field)
+            if value is not None and field in self.datetime_fields:
+                value = value.isoformat()
+            data[field] = value
+        return data
+
+    def to_object(self):
+        """Hydrate a model instance without running its constructor"""
+        obj = manager_of_class(self.model).new_instance()
+        for field in self.fields:
+            setattr(obj, field, getattr(self, field))
+        return obj
+
+
+_record_types: dict[type, type[Record]] = {}
+
+
+def record_type(model: type) -> type[Record]:
+    """Get the Record subclass for a model, building it on first use"""
+    if model not in _record_types:
+        columns = inspect(model).column_attrs
+        fields = tuple(column.key for column in columns)
+        _record_types[model] = type(
+            f"{model.__name__}Record",
+            (Record,),
+            {
+                "__slots__": fields,
+                "model": model,
+                "fields": fields,
+                "datetime_fields": frozenset(
+                    column.key for column in columns
+                    if isinstance(column.columns[0].type, DateTime)
+                ),
+            },
+        )
+    return _record_types[model]
+
+
+def to_record(obj) -> Record:
+    """Convert a model instance to its record"""
+    return record_type(type(obj)).from_object(obj)
@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from typing import Collection
+
+# Related rows get_place_detail can load with a place
+PLACE_EXPANSIONS = ("city", "host", "amenities", "reviews")
 
 
 class Repository(ABC):
@@ -11,6 +15,24 @@ class Repository(ABC):
     @abstractmethod
     def get(self, model_name: str, id: str): ...
 
+    @abstractmethod
+    def get_by(self, model_name: str, field: str, value) -> list: ...
+
+    @abstractmethod
+    def find(self, model_name: str, **criteria) -> list: ...
+
+    @abstractmethod
+    def count(self, model_name: str, **criteria) -> int: ...
+
+    @abstractmethod
+    def get_by_email(self, email: str): ...
+
+    @abstractmethod
+    def get_rating_stats(self, place_id: str) -> dict: ...
+
+    @abstractmethod
+    def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list: ...
+
     @abstractmethod
     def save(self, obj): ...
 
@@ -19,3 +41,112 @@ class Repository(ABC):
 
     @abstractmethod
     def delete(self, obj) -> bool: ...
+
+    @abstractmethod
+    def save_many(self, objs: list) -> list: ...
+
+    @abstractmethod
+    def update_many(self, objs: list) -> list: ...
+
+    @abstractmethod
+    def delete_many(self, objs: list) -> int: ...
+
+    def get_place_detail(self, place_id: str, expand: Collection[str] = ()) -> dict | None:
+        """
+        Get a place and the related rows named in expand, out of PLACE_EXPANSIONS.
+
+        Returns {"place": place} plus one key per expansion: "city" and "host"
+        hold an object or None, "amenities" and "reviews" lists. Returns None
+        if the place does not exist.
+
+        This version looks everything up by key or through find, so backends
+        with indexes on the foreign keys never scan a model.
+        """
+        place = self.get("place", place_id)
+        if place is None:
+            return None
+
+        detail = {"place": place}
+        if "city" in expand:
+            detail["city"] = self.get("city", place.city_id)
+        if "host" in expand:
+            detail["host"] = self.get("user", place.user_id)
+        if "amenities" in expand:
+            amenities = (self.get("amenity", link.amenity_id) for link in self.find("placeamenity", place_id=place_id))
+            detail["amenities"] = [amenity for amenity in amenities if amenity is not None]
+        if "reviews" in expand:
+            detail["reviews"] = self.find("review", place_id=place_id)
+
+        return detail
+
+
+class AsyncRepository(ABC):
+    """
+    The Repository interface for asyncio code, such as the ASGI app: the
+    same methods as coroutines, which never block the event loop while
+    waiting on storage.
+    """
+
+    @abstractmethod
+    async def get_all(self, model_name: str) -> list: ...
+
+    @abstractmethod
+    async def get(self, model_name: str, id: str): ...
+
+    @abstractmethod
+    async def get_by(self, model_name: str, field: str, value) -> list: ...
+
+    @abstractmethod
+    async def find(self, model_name: str, **criteria) -> list: ...
+
+    @abstractmethod
+    async def count(self, model_name: str, **criteria) -> int: ...
+
+    @abstractmethod
+    async def get_by_email(self, email: str): ...
+
+    @abstractmethod
+    async def get_rating_stats(self, place_id: str) -> dict: ...
+
+    @abstractmethod
+    async def page(self, model_name: str, after: tuple | None = None, limit: int = 50, order: str = "asc") -> list: ...
+
+    @abstractmethod
+    async def save(self, obj): ...
+
+    @abstractmethod
+    async def update(self, obj): ...
+
+    @abstractmethod
+    async def delete(self, obj) -> bool: ...
+
+    @abstractmethod
+    async def save_many(self, objs: list) -> list: ...
+
+    @abstractmethod
+    async def update_many(self, objs: list) -> list: ...
+
+    @abstractmethod
+    async def delete_many(self, objs: list) -> int: ...
+
+    async def get_place_detail(self, place_id: str, expand: Collection[str] = ()) -> dict | None:
+        """Get a place and the related rows named in expand, as Repository.get_place_detail does"""
+        place = await self.get("place", place_id)
+        if place is None:
+            return None
+
+        detail = {"place": place}
+        if "city" in expand:
+            detail["city"] = await self.get("city", place.city_id)
+        if "host" in expand:
+            detail["host"] = await self.get("user", place.user_id)
+        if "amenities" in expand:
+            amenities = [
+                await self.get("amenity", link.amenity_id)
+                for link in await self.find("placeamenity", place_id=place_id)
+            ]
+            detail["amenities"] = [amenity for amenity in amenities if amenity is not None]
+        if "reviews" in expand:
+            detail["reviews"] = await self.find("review", place_id=place_id)
+
+        return detail
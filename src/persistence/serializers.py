@@ -0,0 +1,348 @@
+""" Snapshot formats for the file repository
+
+A serializer writes the records of every model to a snapshot file and
+streams them back. Two formats are available:
+
+- ``json``: a JSON object mapping model names to lists of records, with
+  datetimes as ISO strings. Readable, and the format of older snapshots.
+- ``binary``: length-prefixed records of tagged values. Datetimes are
+  stored as 64-bit microseconds, floats as IEEE doubles and UUID strings
+  as their 16 raw bytes, so files are smaller and load without parsing
+  text.
+
+Readers pick the format from the first bytes of the file, so a repository
+configured for one format still loads a snapshot written in the other.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import json
+import re
+import struct
+from typing import IO, Iterator
+
+from src.persistence.records import Record, record_type
+from src.persistence.streaming import iter_snapshot
+
+
+class Serializer(ABC):
+    """Writes and reads snapshots of {model name: [records]}"""
+
+    name: str
+    # Added to the file mode, "b" for binary formats
+    mode: str = ""
+
+    @abstractmethod
+    def dump(self, records: dict[str, list[Record]], file: IO) -> None:
+        """Write the records of every model to a file"""
+
+    @abstractmethod
+    def load(self, file: IO, models: dict[str, type]) -> Iterator[tuple[str, Record]]:
+        """
+        Yield (model name, record) pairs from a file, in file order.
+
+        Raises:
+            ValueError: If the file is malformed or truncated.
+        """
+
+
+class JSONSerializer(Serializer):
+    """The JSON text format"""
+
+    name = "json"
+
+    def dump(self, records: dict[str, list[Record]], file: IO) -> None:
+        json.dump({model: [record.to_dict() for record in items] for model, items in records.items()}, file)
+
+    def load(self, file: IO, models: dict[str, type]) -> Iterator[tuple[str, Record]]:
+        for model, item in iter_snapshot(file):
+            yield model, record_type(models[model]).from_dict(item)
+
+
+MAGIC = b"HBNB\x01"
+# A zero-length model name ends a binary snapshot
+END = b"\x00"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# Value tags
+_NONE = ord("N")
+_TRUE = ord("T")
+_FALSE = ord("F")
+_INT = ord("i")
+_BIG_INT = ord("I")
+_FLOAT = ord("f")
+_DATETIME = ord("t")
+_AWARE_DATETIME = ord("z")
+_UUID = ord("u")
+_STR = ord("s")
+
+
+# UUIDs in the canonical form str(uuid4()) produces, the only form that round-trips through 16 bytes
+_CANONICAL_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def _encode(value, out: bytearray) -> None:
+    """Append one tagged value"""
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        if -(2**63) <= value < 2**63:
+            out.append(_INT)
+            out += _I64.pack(value)
+        else:
+            _encode_text(_BIG_INT, str(value), out)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, datetime):
+        if value.tzinfo is None:
+            out.append(_DATETIME)
+            out += _I64.pack((value - _EPOCH) // _MICROSECOND)
+        else:
+            _encode_text(_AWARE_DATETIME, value.isoformat(), out)
+    elif isinstance(value, str):
+        if len(value) == 36 and _CANONICAL_UUID.fullmatch(value):
+            out.append(_UUID)
+            out += bytes.fromhex(value.replace("-", ""))
+        else:
+            _encode_text(_STR, value, out)
+    else:
+        raise TypeError(f"Cannot serialize {type(value).__name__} value {value!r}")
+
+
+def _encode_text(tag: int, value: str, out: bytearray) -> None:
+    data = value.encode()
+    out.append(tag)
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _decode(payload: bytes, count: int) -> list:
+    """Decode the first count tagged values of a record"""
+    values = []
+    pos = 0
+    for _ in range(count):
+        tag = payload[pos]
+        pos += 1
+        if tag == _STR or tag == _BIG_INT or tag == _AWARE_DATETIME:
+            (length,) = _U32.unpack_from(payload, pos)
+            pos += 4
+            text = payload[pos : pos + length].decode()
+            pos += length
+            if tag == _STR:
+                values.append(text)
+            elif tag == _BIG_INT:
+                values.append(int(text))
+            else:
+                values.append(datetime.fromisoformat(text))
+        elif tag == _UUID:
+            digits = payload[pos : pos + 16].hex()
+            values.append(f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}")
+            pos += 16
+        elif tag == _DATETIME:
+            values.append(_EPOCH + _I64.unpack_from(payload, pos)[0] * _MICROSECOND)
+            pos += 8
+        elif tag == _FLOAT:
+            values.append(_F64.unpack_from(payload, pos)[0])
+            pos += 8
+        elif tag == _INT:
+            values.append(_I64.unpack_from(payload, pos)[0])
+            pos += 8
+        elif tag == _NONE:
+            values.append(None)
+        elif tag == _TRUE:
+            values.append(True)
+        elif tag == _FALSE:
+            values.append(False)
+        else:
+            raise ValueError(f"Unknown value tag {tag!r} in snapshot")
+    return values
+
+
+class Section:
+    """The header of one model section of a binary snapshot"""
+
+    def __init__(self, model: str, record_cls: type[Record], fields: list[str], count: int) -> None:
+        self.model = model
+        self.record_cls = record_cls
+        self.fields = fields
+        self.count = count
+        # Columns dropped since the snapshot was written are skipped, new ones are None
+        self.__known = [field if field in record_cls.fields else None for field in fields]
+        self.__missing = [field for field in record_cls.fields if field not in fields]
+
+    def decode(self, payload: bytes) -> Record:
+        """Build a record from its encoded values"""
+        return self.build(_decode(payload, len(self.fields)))
+
+    def build(self, values: list) -> Record:
+        """Build a record from its values, in the order of the section's fields"""
+        record = self.record_cls.__new__(self.record_cls)
+        for field, value in zip(self.__known, values):
+            if field is not None:
+                setattr(record, field, value)
+        for field in self.__missing:
+            setattr(record, field, None)
+        return record
+
+    def decode_at(self, buffer, offset: int) -> Record:
+        """Decode the record at an offset of a buffer holding the whole snapshot, such as an mmap"""
+        (length,) = _U32.unpack_from(buffer, offset)
+        return self.decode(buffer[offset + 4 : offset + 4 + length])
+
+
+class BinarySerializer(Serializer):
+    """
+    The binary format.
+
+    After the MAGIC header the file holds one section per model: the model
+    name, its field names, and the record count, followed by the records.
+    Each record is a 32-bit length and one tagged value per field. Field
+    names are stored so snapshots stay readable when columns are added or
+    removed. A zero-length model name ends the file.
+    """
+
+    name = "binary"
+    mode = "b"
+
+    def dump(self, records: dict[str, list[Record]], file: IO) -> None:
+        file.write(MAGIC)
+        for model, items in records.items():
+            self.dump_section(model, items, file)
+        file.write(END)
+
+    def dump_section(self, model: str, items: list[Record], file: IO) -> list[int]:
+        """
+        Write the section of one model.
+
+        Returns:
+            list[int]: The file offset of each record, in the order of items.
+        """
+        fields = record_type(items[0].model).fields if items else ()
+        header = bytearray()
+        self._write_name(model, header)
+        header += _U16.pack(len(fields))
+        for field in fields:
+            self._write_name(field, header)
+        header += _U32.pack(len(items))
+        file.write(header)
+
+        offsets = []
+        offset = file.tell()
+        for record in items:
+            payload = bytearray()
+            for field in fields:
+                _encode(getattr(record, field), payload)
+            file.write(_U32.pack(len(payload)))
+            file.write(payload)
+            offsets.append(offset)
+            offset += 4 + len(payload)
+        return offsets
+
+    def load(self, file: IO, models: dict[str, type]) -> Iterator[tuple[str, Record]]:
+        if self._read(file, len(MAGIC)) != MAGIC:
+            raise ValueError("Not a binary snapshot")
+
+        while True:
+            section = self.read_section(file, models)
+            if section is None:
+                return
+
+            for _ in range(section.count):
+                (length,) = _U32.unpack(self._read(file, 4))
+                yield section.model, section.decode(self._read(file, length))
+
+    def load_rows(self, file: IO) -> Iterator[tuple[str, list[str], list[list]]]:
+        """
+        Like load, without building records: yield the model, field names and record values
+        of each section. Model classes are not needed, so this can run in processes that never
+        import them.
+        """
+        if self._read(file, len(MAGIC)) != MAGIC:
+            raise ValueError("Not a binary snapshot")
+
+        while True:
+            header = self.read_section_header(file)
+            if header is None:
+                return
+
+            model, fields, count = header
+            rows = []
+            for _ in range(count):
+                (length,) = _U32.unpack(self._read(file, 4))
+                rows.append(_decode(self._read(file, length), len(fields)))
+            yield model, fields, rows
+
+    def read_section(self, file: IO, models: dict[str, type]) -> Section | None:
+        """Read the header of the next section, or None at the end of the snapshot"""
+        header = self.read_section_header(file)
+        if header is None:
+            return None
+
+        model, fields, count = header
+        return Section(model, record_type(models[model]), fields, count)
+
+    def read_section_header(self, file: IO) -> tuple[str, list[str], int] | None:
+        """Read the model name, field names and record count of the next section, or None at the end"""
+        model = self._read_name(file)
+        if not model:
+            return None
+
+        (field_count,) = _U16.unpack(self._read(file, 2))
+        fields = [self._read_name(file) for _ in range(field_count)]
+        (count,) = _U32.unpack(self._read(file, 4))
+
+        return model, fields, count
+
+    @staticmethod
+    def _read(file: IO, size: int) -> bytes:
+        data = file.read(size)
+        if len(data) != size:
+            raise ValueError("Binary snapshot is truncated")
+        return data
+
+    @staticmethod
+    def _write_name(name: str, out: bytearray) -> None:
+        data = name.encode()
+        out += _U8.pack(len(data))
+        out += data
+
+    def _read_name(self, file: IO) -> str:
+        (length,) = _U8.unpack(self._read(file, 1))
+        return self._read(file, length).decode()
+
+
+SERIALIZERS: dict[str, Serializer] = {
+    serializer.name: serializer for serializer in (JSONSerializer(), BinarySerializer())
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Get a serializer by format name.
+
+    Raises:
+        ValueError: If there is no such format.
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown storage format: {name}")
+    return SERIALIZERS[name]
+
+
+def detect_serializer(path: str) -> Serializer:
+    """Get the serializer that wrote a snapshot file, from its first bytes"""
+    with open(path, "rb") as file:
+        head = file.read(len(MAGIC))
+    return SERIALIZERS["binary"] if head == MAGIC else SERIALIZERS["json"]
@@ -0,0 +1,240 @@
+""" Sharded snapshot layout for the file repository
+
+With the sharded layout the snapshot is split into one file per model, or
+per model and hash bucket, in a directory next to the journal. Each shard
+is a binary snapshot with a single section, followed by an offset index:
+
+    MAGIC | section header | records | END | index entries | footer
+
+Index entries are fixed width, the record key padded with NULs followed by
+the 64-bit offset of the record, and sorted by key. The footer says where
+they start, so a single record is found by binary search over a memory map
+of the shard without reading the rest of it.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import zlib
+from typing import Iterator
+
+from src.persistence.compaction import write_atomically
+from src.persistence.indexes import get_key
+from src.persistence.records import Record, record_type
+from src.persistence.serializers import END, MAGIC, BinarySerializer, Section
+
+SHARD_SUFFIX = ".shard"
+INDEX_MAGIC = b"HBNBIX"
+
+_OFFSET = struct.Struct("<Q")
+# Index start, entry count, key width
+_FOOTER = struct.Struct("<QIH")
+
+_binary = BinarySerializer()
+
+
+def _index_key(key) -> bytes:
+    return str(key).encode()
+
+
+class Shard:
+    """A read-only, memory-mapped shard file"""
+
+    def __init__(self, path: str, models: dict[str, type]) -> None:
+        self.path = path
+
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a shard")
+            self.__section = _binary.read_section(file, models)
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        footer_start = len(self.__map) - _FOOTER.size - len(INDEX_MAGIC)
+        if self.__map[footer_start + _FOOTER.size :] != INDEX_MAGIC:
+            raise ValueError(f"{path} has no offset index")
+
+        self.__index_start, self.__count, self.__key_width = _FOOTER.unpack_from(self.__map, footer_start)
+        self.__entry_width = self.__key_width + _OFFSET.size
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def find(self, key) -> Record | None:
+        """Get the record with a key by binary search of the offset index, or None"""
+        wanted = _index_key(key)
+        if len(wanted) > self.__key_width:
+            return None
+        wanted = wanted.ljust(self.__key_width, b"\0")
+
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            start = self.__index_start + middle * self.__entry_width
+            found = self.__map[start : start + self.__key_width]
+
+            if found == wanted:
+                (offset,) = _OFFSET.unpack_from(self.__map, start + self.__key_width)
+                return self.__section.decode_at(self.__map, offset)
+            if found < wanted:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def close(self) -> None:
+        self.__map.close()
+
+
+def read_shard_rows(path: str) -> tuple[str, list[str], list[list]]:
+    """Decode a whole shard into its model, field names and record values. Runs in reload workers."""
+    with open(path, "rb") as file:
+        return next(_binary.load_rows(file))
+
+
+def write_shard(path: str, model: str, records: list[Record]) -> None:
+    """Write the records of a model to a shard file atomically"""
+
+    def write(file):
+        file.write(MAGIC)
+        offsets = _binary.dump_section(model, records, file)
+        file.write(END)
+
+        index_start = file.tell()
+        keys = [_index_key(get_key(record)) for record in records]
+        width = max(map(len, keys), default=0)
+        for key, offset in sorted(zip(keys, offsets)):
+            file.write(key.ljust(width, b"\0"))
+            file.write(_OFFSET.pack(offset))
+
+        file.write(_FOOTER.pack(index_start, len(keys), width))
+        file.write(INDEX_MAGIC)
+
+    write_atomically(path, write, "wb")
+
+
+class ShardSet:
+    """
+    The shard files of every model in a directory.
+
+    A model with N buckets is stored in files named ``<model>.<bucket>-of-<N>.shard``,
+    each record going to the bucket picked by the CRC32 of its key. Full loads read
+    every shard file of a model, whatever its bucket count; lookups by key need the
+    files to have been written with the current count.
+    """
+
+    def __init__(self, directory: str, buckets: int, models: dict[str, type]) -> None:
+        if buckets < 1:
+            raise ValueError(f"Shard bucket count must be at least 1, got {buckets}")
+
+        self.directory = directory
+        self.buckets = buckets
+        self.__models = models
+        self.__open: dict[str, Shard] = {}
+        self.__seekable: dict[str, bool] = {}
+        self.__lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, model: str, bucket: int) -> str:
+        return os.path.join(self.directory, f"{model}.{bucket}-of-{self.buckets}{SHARD_SUFFIX}")
+
+    def bucket(self, key) -> int:
+        return zlib.crc32(_index_key(key)) % self.buckets
+
+    def paths(self, model: str) -> list[str]:
+        """Get the existing shard files of a model"""
+        return sorted(glob.glob(os.path.join(glob.escape(self.directory), f"{model}.*{SHARD_SUFFIX}")))
+
+    def exists(self) -> bool:
+        """Whether any model has been written yet"""
+        return any(name.endswith(SHARD_SUFFIX) for name in os.listdir(self.directory))
+
+    def seekable(self, model: str) -> bool:
+        """Whether records of a model can be looked up by key with the current bucket count"""
+        if model not in self.__seekable:
+            paths = self.paths(model)
+            self.__seekable[model] = not paths or paths == sorted(
+                self.path(model, bucket) for bucket in range(self.buckets)
+            )
+        return self.__seekable[model]
+
+    def find(self, model: str, key) -> Record | None:
+        """Get one record of a model by key, through the offset index of its shard"""
+        path = self.path(model, self.bucket(key))
+
+        with self.__lock:
+            shard = self.__open.get(path)
+            if shard is None:
+                if not os.path.exists(path):
+                    return None
+                shard = self.__open[path] = Shard(path, self.__models)
+
+        return shard.find(key)
+
+    def load(self, model: str) -> Iterator[Record]:
+        """Yield every record of a model, one shard file after the other"""
+        for path in self.paths(model):
+            with open(path, "rb") as file:
+                for _, record in _binary.load(file, self.__models):
+                    yield record
+
+    def load_parallel(self, models: list[str], workers: int) -> Iterator[tuple[str, list[Record]]]:
+        """
+        Yield (model, records) for every shard file of some models, decoding the files in a pool
+        of worker processes. Records are built in this process from the decoded values.
+
+        Workers are forked, so they neither re-import the app nor open repositories of their own.
+        Where fork is not available the shards are read in this process.
+        """
+        paths = [path for model in models for path in self.paths(model)]
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                yield from self._build(executor.map(read_shard_rows, paths))
+        else:
+            yield from self._build(map(read_shard_rows, paths))
+
+    def _build(self, shards) -> Iterator[tuple[str, list[Record]]]:
+        for model, fields, rows in shards:
+            section = Section(model, record_type(self.__models[model]), fields, len(rows))
+            yield model, [section.build(values) for values in rows]
+
+    def write(self, model: str, records: list[Record]) -> None:
+        """Replace the shard files of a model with ones holding these records"""
+        buckets: list[list[Record]] = [[] for _ in range(self.buckets)]
+        for record in records:
+            buckets[self.bucket(get_key(record))].append(record)
+
+        paths = [self.path(model, bucket) for bucket in range(self.buckets)]
+        for path, items in zip(paths, buckets):
+            write_shard(path, model, items)
+
+        # Files written with a different bucket count are now out of date
+        for path in self.paths(model):
+            if path not in paths:
+                os.remove(path)
+
+        with self.__lock:
+            self.__seekable[model] = True
+            for path in paths:
+                shard = self.__open.pop(path, None)
+                if shard:
+                    shard.close()
+
+    def size(self) -> int:
+        """Get the total size of the shard files in bytes"""
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith(SHARD_SUFFIX)
+        )
+
+    def close(self) -> None:
+        with self.__lock:
+            for shard in self.__open.values():
+                shard.close()
+            self.__open.clear()
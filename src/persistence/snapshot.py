@@ -0,0 +1,18 @@
+""" Immutable, versioned views of a model collection """
+
+
+class Snapshot(tuple):
+    """
+    The objects of one model as they were at a given version.
+
+    Snapshots are plain tuples, so they are immutable and can be shared
+    between any number of readers. Writers never modify a published
+    snapshot; they publish a new version instead.
+    """
+
+    version: int
+
+    def __new__(cls, objects, version: int) -> "Snapshot":
+        snapshot = super().__new__(cls, objects)
+        snapshot.version = version
+        return snapshot
@@ -0,0 +1,131 @@
+""" Incremental reader for the JSON snapshot of the file repository
+
+The snapshot is a single JSON object mapping model names to lists of
+records. json.load would build the whole tree in memory before the first
+record could be used; iter_snapshot decodes one record at a time from a
+fixed-size read buffer instead.
+"""
+
+import json
+import sys
+from typing import IO, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """A read buffer over a text file that decodes one JSON value at a time"""
+
+    def __init__(self, file: IO[str], chunk_size: int) -> None:
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__buffer = ""
+        self.__pos = 0
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping what was consumed. False at end of file."""
+        chunk = self.__file.read(self.__chunk_size)
+        if not chunk:
+            return False
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            buffer, pos = self.__buffer, self.__pos
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            self.__pos = pos
+            if pos < len(buffer) or not self._fill():
+                return
+
+    def token(self) -> str:
+        """Consume the next structural character"""
+        self._skip_whitespace()
+        if self.__pos >= len(self.__buffer):
+            raise json.JSONDecodeError("Unexpected end of snapshot", self.__buffer, self.__pos)
+        char = self.__buffer[self.__pos]
+        self.__pos += 1
+        return char
+
+    def peek(self) -> str:
+        """Get the next structural character without consuming it"""
+        self._skip_whitespace()
+        return self.__buffer[self.__pos : self.__pos + 1]
+
+    def expect(self, char: str) -> None:
+        found = self.token()
+        if found != char:
+            raise json.JSONDecodeError(f"Expected {char!r}, found {found!r}", self.__buffer, self.__pos)
+
+    def value(self):
+        """Decode the next JSON value, reading more of the file as needed"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                # The value may just be cut by the end of the buffer
+                if not self._fill():
+                    raise
+                continue
+            self.__pos = end
+            return value
+
+
+def iter_snapshot(file: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, dict]]:
+    """
+    Yield (model name, record dict) pairs from a snapshot file, in file order.
+
+    Raises:
+        json.JSONDecodeError: If the snapshot is malformed or truncated.
+    """
+    reader = _Reader(file, chunk_size)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        model = reader.value()
+        reader.expect(":")
+        reader.expect("[")
+
+        if reader.peek() == "]":
+            reader.token()
+        else:
+            while True:
+                yield model, reader.value()
+                if reader.token() == "]":
+                    break
+
+        if reader.token() == "}":
+            return
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Get the peak resident set size of this process in bytes, or None where unsupported"""
+    # On Linux, prefer the high-water mark of this address space: ru_maxrss survives exec,
+    # so a process started from a large parent would report the parent's peak
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
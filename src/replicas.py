@@ -0,0 +1,79 @@
+""" Read/write splitting between the primary database and its read replicas
+
+Replicas are listed in DB_REPLICA_URIS. init_app creates an engine for
+each in the extensions of the app, apart from the Flask-SQLAlchemy binds,
+so no model metadata is tied to them and create_all never reaches them.
+The session reads from one of them and writes to the primary. Once a
+session has written, it reads from the primary too until reset_routing,
+so a request sees its own writes even before they reach the replicas.
+DBRepository.init_app resets the pin when a request ends.
+"""
+
+import random
+
+from flask import Flask, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, create_engine
+from sqlalchemy.engine import Engine
+
+# Key of the replica engines of an app in app.extensions
+EXTENSION_KEY = "replicas"
+
+
+def init_app(app: Flask) -> list[Engine]:
+    """Create the engines of the DB_REPLICA_URIS of an app, with the pool options of the primary"""
+    from src.persistence.engine import engine_options
+
+    engines = [
+        create_engine(uri, **engine_options({**app.config, "SQLALCHEMY_DATABASE_URI": uri}))
+        for uri in app.config.get("DB_REPLICA_URIS", [])
+    ]
+    app.extensions[EXTENSION_KEY] = engines
+    return engines
+
+
+def replica_engines() -> list[Engine]:
+    """Get the replica engines of the current app"""
+    return current_app.extensions.get(EXTENSION_KEY, [])
+
+
+class RoutingSession(Session):
+    """
+    A session that sends plain SELECTs to a read replica and everything else,
+    flushes included, to the primary. SELECT ... FOR UPDATE goes to the
+    primary, since it is part of a write.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or (clause is not None and not isinstance(clause, Select)):
+                self.pin_to_primary()
+            elif isinstance(clause, Select) and clause._for_update_arg is None and not self.pinned:
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    @property
+    def pinned(self) -> bool:
+        """Whether reads go to the primary, because this session has written"""
+        return self.info.get("pinned", False)
+
+    def pin_to_primary(self) -> None:
+        """Send the reads of this session to the primary from now on"""
+        self.info["pinned"] = True
+
+    def reset_routing(self) -> None:
+        """Read from a replica again, picked anew"""
+        self.info.pop("pinned", None)
+        self.info.pop("replica", None)
+
+    def _replica(self):
+        """Get the replica engine of this session, picked once so its reads stay consistent"""
+        engines = replica_engines()
+        if "replica" not in self.info:
+            self.info["replica"] = random.randrange(len(engines)) if engines else None
+
+        index = self.info["replica"]
+        return engines[index] if index is not None and index < len(engines) else None
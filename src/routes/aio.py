@@ -0,0 +1,56 @@
+"""Blueprints of the ASGI app, routing to the async controllers
+
+Every endpoint that needs no JWT is served asynchronously, sign-up and
+login included; writes behind jwt_required stay on the WSGI app of
+create_app.
+"""
+
+from quart import Blueprint
+from src.controllers.aio.amenities import get_amenities, get_amenity_by_id
+from src.controllers.aio.cities import get_cities, get_city_by_id
+from src.controllers.aio.countries import get_countries, get_country_by_code, get_country_cities
+from src.controllers.aio.places import get_place_by_id, get_places
+from src.controllers.aio.reviews import (
+    delete_review,
+    get_place_review_stats,
+    get_review_by_id,
+    get_reviews,
+    get_reviews_from_place,
+    get_reviews_from_user,
+    update_review,
+)
+from src.controllers.aio.users import create_user, get_user_by_id, get_users, login
+
+users_bp = Blueprint("users", __name__, url_prefix="/users")
+users_bp.route("/", methods=["GET"])(get_users)
+users_bp.route("/", methods=["POST"])(create_user)
+users_bp.route("/login", methods=["POST"])(login)
+users_bp.route("/<user_id>", methods=["GET"])(get_user_by_id)
+
+countries_bp = Blueprint("countries", __name__, url_prefix="/countries")
+countries_bp.route("/", methods=["GET"])(get_countries)
+countries_bp.route("/<code>", methods=["GET"])(get_country_by_code)
+countries_bp.route("/<code>/cities", methods=["GET"])(get_country_cities)
+
+cities_bp = Blueprint("cities", __name__, url_prefix="/cities")
+cities_bp.route("/", methods=["GET"])(get_cities)
+cities_bp.route("/<city_id>", methods=["GET"])(get_city_by_id)
+
+places_bp = Blueprint("places", __name__, url_prefix="/places")
+places_bp.route("/", methods=["GET"])(get_places)
+places_bp.route("/<place_id>", methods=["GET"])(get_place_by_id)
+
+amenities_bp = Blueprint("amenities", __name__, url_prefix="/amenities")
+amenities_bp.route("/", methods=["GET"])(get_amenities)
+amenities_bp.route("/<amenity_id>", methods=["GET"])(get_amenity_by_id)
+
+reviews_bp = Blueprint("reviews", __name__)
+reviews_bp.route("/places/<place_id>/reviews")(get_reviews_from_place)
+reviews_bp.route("/places/<place_id>/reviews/stats")(get_place_review_stats)
+reviews_bp.route("/users/<user_id>/reviews")(get_reviews_from_user)
+reviews_bp.route("/reviews", methods=["GET"])(get_reviews)
+reviews_bp.route("/reviews/<review_id>", methods=["GET"])(get_review_by_id)
+reviews_bp.route("/reviews/<review_id>", methods=["PUT"])(update_review)
+reviews_bp.route("/reviews/<review_id>", methods=["DELETE"])(delete_review)
+
+blueprints = [users_bp, countries_bp, cities_bp, places_bp, reviews_bp, amenities_bp]
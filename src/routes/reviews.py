@@ -4,6 +4,7 @@ from src.controllers.reviews import (
     create_review,
     delete_review,
     get_reviews_from_place,
+    get_place_review_stats,
     get_reviews_from_user,
     get_review_by_id,
     get_reviews,
@@ -21,6 +22,9 @@ reviews_bp.route("/places/<place_id>/reviews", methods=["POST"])(jwt_required()(
 # Route to get all reviews for a specific place
 reviews_bp.route("/places/<place_id>/reviews")(get_reviews_from_place)
 
+# Route to get the rating count, mean and histogram of a specific place
+reviews_bp.route("/places/<place_id>/reviews/stats")(get_place_review_stats)
+
 # Route to get all reviews from a specific user
 reviews_bp.route("/users/<user_id>/reviews")(get_reviews_from_user)
 
@@ -10,10 +10,6 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from src.models.user import User
 from src import bcrypt
 from functools import wraps
-from src.persistence.db import DBRepository
-
-# Initialize the DBRepository as 'db'
-db = DBRepository()
 
 # Custom decorator to check user permissions
 def check_user_permission(func):
@@ -21,7 +17,7 @@ def check_user_permission(func):
     @jwt_required()
     def decorated_function(user_id, *args, **kwargs):
         current_user_id = get_jwt_identity()
-        user = db.get('user', user_id)  # Assuming db.get() retrieves user by ID
+        user = User.get(user_id)
 
         if not user:
             return jsonify({"msg": "User not found"}), 404
@@ -63,7 +59,7 @@ def login():
     email = request.json.get('email', None)
     password = request.json.get('password', None)
     
-    user = User.query.filter_by(email=email).first()
+    user = User.get_by_email(email)
     if user and user.check_password(password):
         access_token = create_access_token(identity=user.id, additional_claims={"is_admin": user.is_admin})
         return jsonify(access_token=access_token), 200
@@ -84,7 +80,7 @@ def admin_only():
 @jwt_required()
 def admin_endpoint():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = User.get(user_id)
     if not user or not user.is_admin:
         return jsonify({"msg": "Forbidden"}), 403
     return jsonify({"msg": "Welcome Admin"}), 200
\ No newline at end of file
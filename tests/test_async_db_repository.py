@@ -0,0 +1,143 @@
+import asyncio
+import importlib.util
+import os
+import tempfile
+import unittest
+from src.config import TestingConfig
+from src.models.country import Country
+from src.models.review import Review
+
+ASYNC_STACK = all(importlib.util.find_spec(name) for name in ("greenlet", "aiosqlite"))
+QUART = importlib.util.find_spec("quart") is not None
+
+
+@unittest.skipUnless(ASYNC_STACK, "greenlet and aiosqlite are not installed")
+class TestAsyncDBRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        from src.persistence.async_db import AsyncDBRepository
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uri = f"sqlite:///{os.path.join(self.tmpdir.name, 'hbnb.db')}"
+        self.repo = AsyncDBRepository({"SQLALCHEMY_DATABASE_URI": self.uri})
+        await self.repo.create_all()
+
+    async def asyncTearDown(self):
+        from sqlalchemy.ext.asyncio import close_all_sessions
+
+        # Each test runs in its own task, so its session is not this task's
+        await close_all_sessions()
+        await self.repo.dispose()
+        self.tmpdir.cleanup()
+
+    def test_async_url(self):
+        from src.persistence.async_db import async_url
+
+        self.assertEqual(async_url("sqlite:///hbnb.db").drivername, "sqlite+aiosqlite")
+        self.assertEqual(async_url("postgresql://u:p@db/hbnb").drivername, "postgresql+asyncpg")
+        with self.assertRaises(ValueError):
+            async_url("mysql://u:p@db/hbnb")
+
+    async def test_save_find_and_page(self):
+        await self.repo.save_many([Country(name="Uruguay", code="UY"), Country(name="Argentina", code="AR")])
+        # Review ids are integer columns
+        reviews = [Review(place_id="p1", user_id="u1", comment="Nice", rating=4, id=i) for i in range(1, 6)]
+        await self.repo.save_many(reviews)
+
+        self.assertEqual((await self.repo.get("country", "UY")).name, "Uruguay")
+        self.assertEqual([c.code for c in await self.repo.find("country", code__gt="AR")], ["UY"])
+        self.assertEqual(await self.repo.count("review", place_id="p1"), 5)
+        self.assertEqual(len(await self.repo.get_by("review", "user_id", "u1")), 5)
+
+        first = await self.repo.page("review", limit=3)
+        self.assertEqual([r.id for r in first], [1, 2, 3])
+        self.assertEqual(await self.repo.delete_many(first), 3)
+        self.assertEqual(await self.repo.count("review"), 2)
+
+    async def test_rating_stats(self):
+        reviews = [
+            Review(place_id="p1", user_id="u1", comment="Nice", rating=rating, id=i)
+            for i, rating in enumerate([5, 4, 2], 1)
+        ]
+        await self.repo.save_many(reviews)
+
+        reviews[1].rating = 1
+        await self.repo.update(reviews[1])
+        await self.repo.delete(reviews[2])
+
+        self.assertEqual(await self.repo.get_rating_stats("p1"), {
+            "count": 2, "sum": 6.0, "mean": 3.0, "histogram": {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1},
+        })
+
+    async def test_each_task_has_its_own_session(self):
+        async def session():
+            return self.repo.session()
+
+        first, second = await asyncio.gather(session(), session())
+        self.assertIsNot(first, second)
+
+    @unittest.skipUnless(QUART, "quart is not installed")
+    async def test_asgi_app(self):
+        from src import create_asgi_app
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = self.uri
+
+        await self.repo.save_many([
+            Review(place_id="p1", user_id="u1", comment="Nice", rating=4, id=i) for i in range(1, 4)
+        ])
+
+        app = create_asgi_app(FileConfig)
+        async with app.test_app() as test_app:
+            client = test_app.test_client()
+
+            response = await client.get("/reviews?limit=2")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(await response.get_json()), 2)
+            self.assertIn("X-Next-Cursor", response.headers)
+
+            self.assertEqual((await client.get("/places/missing/reviews/stats")).status_code, 404)
+            self.assertEqual((await client.get("/reviews?limit=0")).status_code, 400)
+
+            # Requests in flight together each get their own session
+            responses = await asyncio.gather(*(client.get(f"/reviews/{i}") for i in range(1, 4)))
+            self.assertEqual([(await r.get_json())["id"] for r in responses], [1, 2, 3])
+
+            response = await client.put("/reviews/1", json={"rating": 2})
+            self.assertEqual((await response.get_json())["rating"], 2)
+            self.assertEqual((await client.delete("/reviews/2")).status_code, 204)
+            self.assertEqual((await client.get("/reviews/2")).status_code, 404)
+
+    @unittest.skipUnless(QUART, "quart is not installed")
+    async def test_asgi_sign_up_and_login(self):
+        from flask_jwt_extended import decode_token
+        from src import create_app, create_asgi_app
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = self.uri
+
+        user = {"email": "Ana@Example.com", "password": "secret", "first_name": "Ana", "last_name": "Diaz"}
+
+        app = create_asgi_app(FileConfig)
+        async with app.test_app() as test_app:
+            client = test_app.test_client()
+
+            response = await client.post("/users", json=user)
+            self.assertEqual(response.status_code, 201)
+            user_id = (await response.get_json())["id"]
+            self.assertEqual((await client.post("/users", json=user)).status_code, 400)
+            self.assertEqual((await client.post("/users", json={"email": "x@example.com"})).status_code, 400)
+
+            wrong = await client.post("/users/login", json={"email": "ana@example.com", "password": "nope"})
+            self.assertEqual(wrong.status_code, 401)
+            response = await client.post("/users/login", json={"email": "ana@example.com", "password": "secret"})
+            self.assertEqual(response.status_code, 200)
+            token = (await response.get_json())["access_token"]
+
+        # The token is valid on the WSGI app, which serves the authenticated writes
+        with create_app(FileConfig).app_context():
+            self.assertEqual(decode_token(token)["sub"], user_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
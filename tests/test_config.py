@@ -16,6 +16,12 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(app.config['JWT_SECRET_KEY'], 'hohohoitsasecret')
         self.assertEqual(app.config['JWT_ACCESS_TOKEN_EXPIRES'], 3600)
         self.assertEqual(app.config['SQLALCHEMY_DATABASE_URI'], 'sqlite:///hbnb.db')
+        self.assertEqual(app.config['DB_POOL_SIZE'], 5)
+        self.assertEqual(app.config['DB_MAX_OVERFLOW'], 10)
+        self.assertTrue(app.config['DB_POOL_PRE_PING'])
+        self.assertEqual(app.config['SQLITE_JOURNAL_MODE'], 'WAL')
+        self.assertEqual(app.config['SQLITE_SYNCHRONOUS'], 'NORMAL')
+        self.assertEqual(app.config['DB_REPLICA_URIS'], [])
 
     def test_config_development(self):
         app = Flask(__name__)
@@ -11,7 +11,6 @@ class TestDatabaseConnections(unittest.TestCase):
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
-        db.init_app(self.app)
         db.create_all()
 
     def tearDown(self):
@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+import unittest
+from sqlalchemy import event, inspect
+from sqlalchemy.orm.exc import UnmappedInstanceError
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.amenity import Amenity, PlaceAmenity
+from src.models.city import City
+from src.models.country import Country
+from src.models.place import Place
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.db import DBRepository
+from src.persistence.indexes import page_key
+
+
+def make_user(i: int) -> User:
+    return User(email=f"user{i}@example.com", password="secret", first_name="Ana", last_name="Diaz")
+
+
+class TestDBRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.repo = DBRepository()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_commits(self) -> list:
+        commits = []
+        event.listen(db.session(), "after_commit", lambda session: commits.append(session))
+        return commits
+
+    def test_save_and_get(self):
+        user = make_user(1)
+        self.repo.save(user)
+
+        self.assertEqual(self.repo.get("user", user.id).email, "user1@example.com")
+        self.assertEqual(self.repo.get_by_email("USER1@example.com").id, user.id)
+        self.assertIsNone(self.repo.get_by_email(5))
+        self.assertIsNone(self.repo.get("user", "missing"))
+
+    def test_batch_operations(self):
+        users = [make_user(i) for i in range(5)]
+        country = Country(name="Uruguay", code="UY")
+
+        self.repo.save_many(users + [country])
+        self.assertEqual(len(self.repo.get_all("user")), 5)
+
+        for user in users:
+            user.first_name = "Renamed"
+        self.repo.update_many(users)
+        self.assertEqual({user.first_name for user in self.repo.get_all("user")}, {"Renamed"})
+
+        self.assertEqual(self.repo.delete_many(users[:2] + [country]), 3)
+        self.assertEqual(len(self.repo.get_all("user")), 3)
+        self.assertIsNone(self.repo.get("country", "UY"))
+
+    def test_update_many_returns_persistent_objects(self):
+        users = [make_user(i) for i in range(3)]
+        self.repo.save_many(users)
+        user_ids = [user.id for user in users]
+        db.session.expunge(users[0])
+        users[0].first_name = "Detached"
+
+        updated = self.repo.update_many(users)
+
+        self.assertEqual([user.id for user in updated], user_ids)
+        for user in updated:
+            self.assertTrue(inspect(user).persistent)
+            self.assertIn(user, db.session)
+        self.assertEqual(self.repo.get("user", user_ids[0]).first_name, "Detached")
+
+    def test_find(self):
+        users = [make_user(i) for i in range(4)]
+        users[0].is_admin = True
+        self.repo.save_many(users + [Country(name="Uruguay", code="UY"), Country(name="Argentina", code="AR")])
+
+        self.assertEqual([u.id for u in self.repo.find("user", is_admin=True)], [users[0].id])
+        self.assertEqual(self.repo.count("user", email__in=[u.email for u in users[1:3]]), 2)
+        self.assertEqual(self.repo.count("user"), 4)
+        self.assertEqual([c.code for c in self.repo.find("country", code__gt="AR")], ["UY"])
+        self.assertEqual(self.repo.find("country", name=None), [])
+        with self.assertRaises(ValueError):
+            self.repo.find("user", nickname="ana")
+
+    def test_page(self):
+        users = [make_user(i) for i in range(5)]
+        for i, user in enumerate(users):
+            # The last two users are created at the same time and ordered by id
+            user.created_at = datetime(2024, 1, 1) + timedelta(minutes=min(i, 3))
+        users = sorted(users, key=page_key)
+        self.repo.save_many(users[::-1])
+
+        first = self.repo.page("user", limit=2)
+        self.assertEqual([u.id for u in first], [u.id for u in users[:2]])
+        rest = self.repo.page("user", page_key(first[-1]), limit=10)
+        self.assertEqual([u.id for u in rest], [u.id for u in users[2:]])
+        older = self.repo.page("user", page_key(users[-1]), limit=10, order="desc")
+        self.assertEqual([u.id for u in older], [u.id for u in users[-2::-1]])
+
+        # Models without created_at are ordered by primary key
+        self.repo.save_many([Country(name="Uruguay", code="UY"), Country(name="Argentina", code="AR")])
+        self.assertEqual([c.code for c in self.repo.page("country", limit=1)], ["AR"])
+        self.assertEqual([c.code for c in self.repo.page("country", (datetime.min, "AR"))], ["UY"])
+
+    def test_place_detail(self):
+        host = make_user(1)
+        # City and review ids are integer columns
+        city = City(name="Montevideo", country_code="UY", id=1)
+        place = Place({"name": "Loft", "address": "Rambla 1", "city_id": "1", "user_id": host.id})
+        amenities = [Amenity(name=name) for name in ("Wifi", "Pool", "Gym")]
+        for amenity in amenities:
+            # amenities.place_id is a required column
+            amenity.place_id = place.id
+        links = [PlaceAmenity(place.id, amenity.id) for amenity in amenities[:2]]
+        reviews = [
+            Review(place_id=place.id, user_id=host.id, comment="Nice", rating=5, id=i) for i in range(1, 6)
+        ]
+        place_id, host_id = place.id, host.id
+        self.repo.save_many([Country(name="Uruguay", code="UY"), host, city, place, *amenities, *links, *reviews])
+        db.session.expunge_all()
+
+        queries = []
+        listener = lambda *args: queries.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            detail = self.repo.get_place_detail(place_id, ["city", "host", "amenities", "reviews"])
+            # Serializing touches no lazy relationship
+            result = {name: [obj.to_dict() for obj in value] if isinstance(value, list) else value.to_dict()
+                      for name, value in detail.items()}
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        # The place joined with its city and host, then one query each for amenities and reviews
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(result["city"]["name"], "Montevideo")
+        self.assertEqual(result["host"]["id"], host_id)
+        self.assertEqual(sorted(a["name"] for a in result["amenities"]), ["Pool", "Wifi"])
+        self.assertEqual(len(result["reviews"]), 5)
+
+        self.assertEqual(set(self.repo.get_place_detail(place_id, ["host"])), {"place", "host"})
+        self.assertIsNone(self.repo.get_place_detail("missing", ["city"]))
+
+    def test_rating_stats(self):
+        # Review ids are integer columns
+        reviews = [
+            Review(place_id="p1", user_id="u1", comment="Nice", rating=rating, id=i)
+            for i, rating in enumerate([5, 4, 4.6, 2], 1)
+        ]
+        self.repo.save_many([*reviews, Review(place_id="p2", user_id="u1", comment="Bad", rating=1, id=5)])
+
+        stats = self.repo.get_rating_stats("p1")
+        self.assertEqual(stats["count"], 4)
+        self.assertAlmostEqual(stats["sum"], 15.6)
+        self.assertEqual(stats["histogram"], {"1": 0, "2": 1, "3": 0, "4": 1, "5": 2})
+
+        # Committed, so these are set on expired instances
+        reviews[1].rating = 1
+        self.repo.update(reviews[1])
+        reviews[0].place_id = "p2"
+        self.repo.update(reviews[0])
+        self.repo.delete(reviews[3])
+        # A bulk DELETE, outside the flush
+        self.repo.delete_many([reviews[2]])
+
+        self.assertEqual(self.repo.get_rating_stats("p1"), {
+            "count": 1, "sum": 1.0, "mean": 1.0, "histogram": {"1": 1, "2": 0, "3": 0, "4": 0, "5": 0},
+        })
+        self.assertEqual(self.repo.get_rating_stats("p2"), {
+            "count": 2, "sum": 6.0, "mean": 3.0, "histogram": {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1},
+        })
+        self.assertEqual(self.repo.get_rating_stats("missing")["mean"], None)
+
+    def test_failed_batch_is_rolled_back(self):
+        self.repo.save(make_user(1))
+
+        with self.assertRaises(Exception):
+            self.repo.save_many([make_user(2), make_user(1)])
+
+        self.assertEqual([user.email for user in self.repo.get_all("user")], ["user1@example.com"])
+
+    def test_transaction_commits_once(self):
+        commits = self.count_commits()
+
+        with DBRepository.transaction():
+            self.repo.save(make_user(1))
+            self.repo.save(make_user(2))
+            # Flushed, so visible inside the transaction
+            self.assertIsNotNone(self.repo.get_by_email("user2@example.com"))
+
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(len(self.repo.get_all("user")), 2)
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with DBRepository.transaction():
+                self.repo.save(make_user(1))
+                raise RuntimeError("boom")
+
+        self.assertEqual(self.repo.get_all("user"), [])
+
+    def test_batch_error_rolls_back_outside_a_unit_of_work(self):
+        with self.assertRaises(UnmappedInstanceError):
+            self.repo.save_many([make_user(1), object()])
+
+        self.assertEqual(self.repo.get_all("user"), [])
+
+    def test_batch_error_leaves_the_unit_of_work_to_its_owner(self):
+        with DBRepository.transaction():
+            self.repo.save(make_user(1))
+            with self.assertRaises(UnmappedInstanceError):
+                self.repo.update_many([object()])
+
+        self.assertIsNotNone(self.repo.get_by_email("user1@example.com"))
+
+    def add_create_users_route(self):
+        @self.app.route("/_test/users/<int:status>", methods=["POST"])
+        def create_users(status):
+            self.repo.save(make_user(1))
+            self.repo.save(make_user(2))
+            return "", status
+
+    def test_request_commits_each_write_by_default(self):
+        self.add_create_users_route()
+        client = self.app.test_client()
+        commits = self.count_commits()
+
+        self.assertFalse(self.app.config["DB_UNIT_OF_WORK"])
+        self.assertEqual(client.post("/_test/users/400").status_code, 400)
+        self.assertEqual(len(commits), 2)
+        self.assertEqual(len(self.repo.get_all("user")), 2)
+
+    def test_request_is_one_unit_of_work(self):
+        self.app.config["DB_UNIT_OF_WORK"] = True
+        self.add_create_users_route()
+        client = self.app.test_client()
+        commits = self.count_commits()
+
+        self.assertEqual(client.post("/_test/users/400").status_code, 400)
+        self.assertEqual(self.repo.get_all("user"), [])
+
+        self.assertEqual(client.post("/_test/users/201").status_code, 201)
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(len(self.repo.get_all("user")), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import exc, text
+from src import create_app, db
+from src.config import TestingConfig
+from src.persistence.db import DBRepository
+from src.persistence.engine import TimedQueuePool, engine_options, sqlite_pragmas
+
+
+class TestEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.tmpdir.name, 'hbnb.db')}"
+            DB_POOL_SIZE = 1
+            DB_MAX_OVERFLOW = 0
+            DB_POOL_TIMEOUT = 1
+
+        self.app = create_app(FileConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def test_engine_options(self):
+        options = self.app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+        self.assertIs(options["poolclass"], TimedQueuePool)
+        self.assertEqual((options["pool_size"], options["max_overflow"]), (1, 0))
+        self.assertTrue(options["pool_pre_ping"])
+
+        # The single connection of in-memory SQLite takes no queue settings
+        memory = engine_options({"SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+        self.assertEqual(set(memory), {"pool_pre_ping", "pool_recycle"})
+
+    def test_sqlite_pragmas(self):
+        with db.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            # NORMAL
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)
+            self.assertEqual(connection.execute(text("PRAGMA cache_size")).scalar(), -65536)
+
+        with self.assertRaises(ValueError):
+            sqlite_pragmas({"SQLITE_JOURNAL_MODE": "WAL; DROP TABLE users"})
+
+    def test_pool_stats(self):
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            # The only connection is checked out, so another checkout times out
+            with self.assertRaises(exc.TimeoutError):
+                db.engine.connect()
+
+            stats = DBRepository.pool_stats()["default"]
+            self.assertEqual(stats["checked_out"], 1)
+
+        stats = DBRepository.pool_stats()["default"]
+        self.assertEqual(stats["pool"], "TimedQueuePool")
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertGreaterEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["peak_checked_out"], 1)
+        self.assertGreaterEqual(stats["max_wait_seconds"], 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,498 @@
+from datetime import datetime
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from uuid import uuid4
+from unittest import mock
+from src.models.city import City
+from src.models.country import Country
+from src.models.place import Place
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.file import DataManager
+from src.persistence.indexes import page_key
+from src.persistence.records import to_record
+from src.persistence.serializers import MAGIC, SERIALIZERS, detect_serializer, get_serializer
+from src.persistence.shards import ShardSet
+from src.persistence.streaming import iter_snapshot
+
+
+class TestFileRepository(unittest.TestCase):
+
+    def setUp(self):
+        # Other test modules switch DataManager to database mode at import
+        env = mock.patch.dict(os.environ, {"USE_DATABASE": "false"})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "data.json")
+        self.repo = DataManager(filename=self.filename)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_and_reload(self):
+        self.repo.save(Country(name="Uruguay", code="UY"))
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+
+        reloaded = DataManager(filename=self.filename)
+
+        self.assertEqual(reloaded.get("country", "UY").name, "Uruguay")
+        self.assertEqual(reloaded.get("city", city.id).name, "Montevideo")
+        self.assertEqual(reloaded.get("city", city.id).created_at, city.created_at)
+
+    def test_update_and_delete(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+        city.name = "Salto"
+        self.repo.update(city)
+
+        self.assertEqual(DataManager(filename=self.filename).get("city", city.id).name, "Salto")
+
+        self.assertTrue(self.repo.delete(city))
+        self.assertFalse(self.repo.delete(city))
+        self.assertIsNone(DataManager(filename=self.filename).get("city", city.id))
+
+    def test_get_by_indexed_field(self):
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=5)
+        self.repo.save(review)
+
+        self.assertEqual([r.id for r in self.repo.get_by("review", "place_id", "p1")], [review.id])
+
+        review.place_id = "p2"
+        self.repo.update(review)
+        self.assertEqual(self.repo.get_by("review", "place_id", "p1"), [])
+        self.assertEqual([r.id for r in self.repo.get_by("review", "place_id", "p2")], [review.id])
+
+        reloaded = DataManager(filename=self.filename)
+        self.assertEqual(len(reloaded.get_by("review", "user_id", "u1")), 1)
+
+        self.repo.delete(review)
+        self.assertEqual(self.repo.get_by("review", "user_id", "u1"), [])
+
+    def test_get_by_email(self):
+        user = User(email="jane@example.com", first_name="Jane", last_name="Doe", password="pw")
+        self.repo.save(user)
+
+        self.assertEqual(self.repo.get_by_email("Jane@Example.com").id, user.id)
+        self.assertIsNone(self.repo.get_by_email("john@example.com"))
+
+        reloaded = DataManager(filename=self.filename).get_by_email("jane@example.com")
+        self.assertEqual(reloaded.to_dict(), user.to_dict())
+        self.assertTrue(reloaded.check_password("pw"))
+
+        self.repo.delete(user)
+        self.assertIsNone(self.repo.get_by_email("jane@example.com"))
+
+    def test_writes_append_to_journal(self):
+        journal = f"{self.filename}.journal"
+        cities = [City(name=f"City {i}", country_code="UY") for i in range(3)]
+        for city in cities:
+            self.repo.save(city)
+        self.repo.delete(cities[0])
+
+        self.assertFalse(os.path.exists(self.filename))
+        with open(journal) as file:
+            self.assertEqual(len(file.readlines()), 4)
+
+        reloaded = DataManager(filename=self.filename)
+        self.assertEqual([c.id for c in reloaded.get_all("city")], [c.id for c in cities[1:]])
+
+    def test_compact_drops_journal(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+        self.repo.compact()
+
+        self.assertEqual(self.repo.storage_stats()["journal_bytes"], 0)
+        self.assertGreater(self.repo.storage_stats()["snapshot_bytes"], 0)
+        self.assertEqual(DataManager(filename=self.filename).get("city", city.id).name, "Montevideo")
+
+    def test_compacts_in_background_past_threshold(self):
+        repo = DataManager(filename=self.filename, max_journal_entries=10)
+        cities = [City(name=f"City {i}", country_code="UY") for i in range(25)]
+        for city in cities:
+            repo.save(city)
+        repo.wait_for_compaction()
+
+        stats = repo.storage_stats()
+        self.assertGreater(stats["snapshot_bytes"], 0)
+        self.assertLess(stats["journal_entries"], 10)
+        reloaded = DataManager(filename=self.filename)
+        self.assertEqual([c.id for c in reloaded.get_all("city")], [c.id for c in cities])
+
+    def test_interrupted_compaction_is_recovered(self):
+        self.repo.save(City(name="Montevideo", country_code="UY"))
+        self.repo.save(City(name="Salto", country_code="UY"))
+        # A compaction that sealed the first entry but died before writing the snapshot
+        with open(f"{self.filename}.journal") as file:
+            sealed, active = file.readlines()
+        with open(f"{self.filename}.journal.sealed", "w") as file:
+            file.write(sealed)
+        with open(f"{self.filename}.journal", "w") as file:
+            file.write(active)
+
+        reloaded = DataManager(filename=self.filename)
+
+        self.assertEqual([c.name for c in reloaded.get_all("city")], ["Montevideo", "Salto"])
+        self.assertFalse(os.path.exists(f"{self.filename}.journal.sealed"))
+        self.assertEqual(reloaded.storage_stats()["journal_bytes"], 0)
+
+    def test_torn_journal_entry_is_dropped(self):
+        first = City(name="Montevideo", country_code="UY")
+        self.repo.save(first)
+        with open(f"{self.filename}.journal", "a") as file:
+            file.write('{"op": "save", "model": "city", "da')
+
+        reloaded = DataManager(filename=self.filename)
+        second = City(name="Salto", country_code="UY")
+        reloaded.save(second)
+
+        names = [c.name for c in DataManager(filename=self.filename).get_all("city")]
+        self.assertEqual(names, ["Montevideo", "Salto"])
+
+    def test_durability_modes(self):
+        journal = f"{self.filename}.journal"
+
+        repo = DataManager(filename=self.filename, durability="off")
+        repo.save(City(name="Montevideo", country_code="UY"))
+        self.assertEqual(os.path.getsize(journal), 0)
+        repo.close()
+        self.assertGreater(os.path.getsize(journal), 0)
+
+        repo = DataManager(filename=self.filename, durability="interval", flush_interval_ms=10)
+        repo.save(City(name="Salto", country_code="UY"))
+        for _ in range(100):
+            if len(DataManager(filename=self.filename).get_all("city")) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(DataManager(filename=self.filename).get_all("city")), 2)
+
+        with self.assertRaises(ValueError):
+            DataManager(filename=self.filename, durability="sometimes")
+
+    def test_reload_streams_snapshot_and_rebuilds_indexes(self):
+        reviews = [Review(place_id=f"p{i % 3}", user_id="u1", comment="Nice", rating=5) for i in range(30)]
+        for review in reviews:
+            self.repo.save(review)
+        self.repo.save(User(email="Ana@Example.com", password="secret", first_name="Ana", last_name="Diaz"))
+        self.repo.compact()
+        # One more write on top of the snapshot, replayed from the journal
+        self.repo.delete(reviews[0])
+
+        reloaded = DataManager(filename=self.filename)
+
+        self.assertEqual(reloaded.load_stats["records"], 31)
+        self.assertEqual(reloaded.load_stats["journal_entries"], 1)
+        self.assertGreaterEqual(reloaded.load_stats["seconds"], 0)
+        self.assertEqual(len(reloaded.get_all("review")), 29)
+        self.assertEqual(
+            sorted(r.id for r in reloaded.get_by("review", "place_id", "p0")),
+            sorted(r.id for r in reviews[3::3]),
+        )
+        self.assertIsNotNone(reloaded.get_by_email("ana@example.com"))
+
+    def test_iter_snapshot_across_chunks(self):
+        data = {"city": [{"id": str(i), "name": "a]b}" * i} for i in range(20)], "country": []}
+
+        for chunk_size in (1, 7, 4096):
+            loaded = {"city": [], "country": []}
+            for model, item in iter_snapshot(io.StringIO(json.dumps(data)), chunk_size):
+                loaded[model].append(item)
+            self.assertEqual(loaded, data)
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_snapshot(io.StringIO(json.dumps(data)[:50])))
+
+
+    def test_binary_format_round_trip(self):
+        repo = DataManager(filename=self.filename, storage_format="binary")
+        repo.save(Country(name="Uruguay", code="UY"))
+        user = User(email="ana@example.com", password="secret", first_name="Ana", last_name=None)
+        repo.save(user)
+        place = Place({
+            "name": "Loft", "address": "Calle 1", "latitude": -34.9, "longitude": -56.16,
+            "user_id": user.id, "city_id": "c1", "price_per_night": 100, "max_guests": 2,
+        })
+        repo.save(place)
+        repo.compact()
+
+        with open(self.filename, "rb") as file:
+            self.assertEqual(file.read(len(MAGIC)), MAGIC)
+
+        reloaded = DataManager(filename=self.filename, storage_format="binary")
+        for model, obj in (("country", "UY"), ("user", user.id), ("place", place.id)):
+            self.assertEqual(
+                to_record(reloaded.get(model, obj)).to_dict(),
+                to_record(repo.get(model, obj)).to_dict(),
+            )
+        self.assertIsInstance(reloaded.get("place", place.id).latitude, float)
+
+    def test_snapshot_format_is_detected(self):
+        self.repo.save(Country(name="Uruguay", code="UY"))
+        self.repo.compact()
+
+        # A binary repository still reads the JSON snapshot, and its next compaction converts it
+        repo = DataManager(filename=self.filename, storage_format="binary")
+        self.assertEqual(repo.get("country", "UY").name, "Uruguay")
+        repo.compact()
+        self.assertIs(detect_serializer(self.filename), SERIALIZERS["binary"])
+
+        self.assertEqual(DataManager(filename=self.filename).get("country", "UY").name, "Uruguay")
+
+        with self.assertRaises(ValueError):
+            DataManager(filename=self.filename, storage_format="xml")
+
+    def test_binary_values(self):
+        serializer = get_serializer("binary")
+        record = to_record(City(name="Montevideo", country_code="UY"))
+        values = {
+            "id": str(uuid4()),
+            "name": "Montévideo",
+            "country_code": "UY",
+            "created_at": datetime(2024, 2, 29, 23, 59, 59, 999999),
+            "updated_at": None,
+        }
+        for field, value in values.items():
+            setattr(record, field, value)
+
+        file = io.BytesIO()
+        serializer.dump({"city": [record]}, file)
+        file.seek(0)
+        (model, loaded), = serializer.load(file, DataManager.models)
+
+        self.assertEqual(model, "city")
+        self.assertEqual(loaded.to_dict(), record.to_dict())
+
+        with self.assertRaises(ValueError):
+            list(serializer.load(io.BytesIO(file.getvalue()[:-5]), DataManager.models))
+
+
+    def make_places(self, repo, count):
+        places = [
+            Place({
+                "name": f"Place {i}", "address": "Calle 1", "latitude": -34.9, "longitude": -56.16,
+                "user_id": "u1", "city_id": f"c{i % 2}", "price_per_night": 100 + i,
+            })
+            for i in range(count)
+        ]
+        for place in places:
+            repo.save(place)
+        return places
+
+    def test_unknown_model(self):
+        for layout in ("single", "sharded"):
+            with self.subTest(layout=layout):
+                repo = DataManager(filename=f"{self.filename}.{layout}", layout=layout)
+
+                self.assertIsNone(repo.get("unicorn", "1"))
+                self.assertEqual(repo.get_all("unicorn"), [])
+                self.assertEqual(repo.find("unicorn", name="Blue"), [])
+                self.assertEqual(repo.count("unicorn"), 0)
+                repo.close()
+
+    def test_sharded_layout_loads_models_lazily(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        repo.save(Country(name="Uruguay", code="UY"))
+        places = self.make_places(repo, 20)
+        repo.compact()
+
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertIn("place.0-of-1.shard", os.listdir(f"{self.filename}.shards"))
+
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(reloaded.loaded_models, frozenset())
+
+        # Single records come straight from the shard
+        self.assertEqual(reloaded.get("place", places[7].id).price_per_night, 107)
+        self.assertIsNone(reloaded.get("place", "missing"))
+        self.assertEqual(reloaded.get("country", "UY").name, "Uruguay")
+        self.assertEqual(reloaded.loaded_models, frozenset())
+
+        # Anything else loads the whole model
+        self.assertEqual(len(reloaded.get_by("place", "city_id", "c1")), 10)
+        self.assertEqual(reloaded.loaded_models, {"place"})
+
+    def test_sharded_layout_journal_on_unloaded_models(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        places = self.make_places(repo, 5)
+        repo.compact()
+        repo.delete(places[0])
+        places[1].name = "Renamed"
+        repo.update(places[1])
+
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        self.assertIsNone(reloaded.get("place", places[0].id))
+        self.assertEqual(reloaded.get("place", places[1].id).name, "Renamed")
+        self.assertEqual(reloaded.loaded_models, frozenset())
+
+        reloaded.compact()
+        compacted = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(compacted.storage_stats()["journal_entries"], 0)
+        self.assertEqual(len(compacted.get_all("place")), 4)
+        self.assertEqual(compacted.get("place", places[1].id).name, "Renamed")
+
+    def test_sharded_layout_buckets(self):
+        repo = DataManager(filename=self.filename, layout="sharded", buckets=4)
+        places = self.make_places(repo, 20)
+        repo.compact()
+
+        shards = os.listdir(f"{self.filename}.shards")
+        self.assertEqual(sorted(name for name in shards if name.startswith("place.")),
+                         [f"place.{i}-of-4.shard" for i in range(4)])
+        reloaded = DataManager(filename=self.filename, layout="sharded", buckets=4)
+        self.assertEqual(reloaded.get("place", places[3].id).name, "Place 3")
+        self.assertEqual(reloaded.loaded_models, frozenset())
+
+        # With another bucket count, lookups fall back to loading the model
+        rebucketed = DataManager(filename=self.filename, layout="sharded", buckets=2)
+        self.assertEqual(rebucketed.get("place", places[3].id).name, "Place 3")
+        self.assertEqual(rebucketed.loaded_models, {"place"})
+        rebucketed.compact()
+        self.assertEqual(sorted(name for name in os.listdir(f"{self.filename}.shards") if name.startswith("place.")),
+                         ["place.0-of-2.shard", "place.1-of-2.shard"])
+
+    def test_single_snapshot_is_split_into_shards(self):
+        places = self.make_places(self.repo, 3)
+        self.repo.compact()
+
+        repo = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(len(repo.get_all("place")), 3)
+        repo.compact()
+        self.assertFalse(os.path.exists(self.filename))
+
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(reloaded.get("place", places[2].id).name, "Place 2")
+
+
+    def test_compaction_rewrites_only_dirty_shards(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        self.make_places(repo, 3)
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=5)
+        repo.save(review)
+        self.assertEqual(repo.compact(), ["place", "review"])
+
+        shards = f"{self.filename}.shards"
+        place_inode = os.stat(os.path.join(shards, "place.0-of-1.shard")).st_ino
+
+        review.rating = 4
+        repo.update(review)
+        self.assertEqual(repo.compact(), ["review"])
+        self.assertEqual(os.stat(os.path.join(shards, "place.0-of-1.shard")).st_ino, place_inode)
+        self.assertEqual(repo.compact(), [])
+
+        # A failed write leaves the model dirty for the next compaction
+        repo.delete(review)
+        with mock.patch.object(ShardSet, "write", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                repo.compact()
+        self.assertEqual(repo.compact(), ["review"])
+        self.assertEqual(DataManager(filename=self.filename, layout="sharded").get_all("review"), [])
+
+
+    def test_parallel_reload_of_shards(self):
+        repo = DataManager(filename=self.filename, layout="sharded", buckets=3)
+        places = self.make_places(repo, 30)
+        repo.save(User(email="ana@example.com", password="secret", first_name="Ana", last_name="Diaz"))
+        repo.compact()
+        repo.delete(places[0])
+
+        reloaded = DataManager(filename=self.filename, layout="sharded", buckets=3, reload_workers=2)
+
+        self.assertEqual(reloaded.loaded_models, frozenset(DataManager.models))
+        self.assertEqual(reloaded.load_stats["records"], 31)
+        self.assertEqual(len(reloaded.get_all("place")), 29)
+        self.assertEqual(len(reloaded.get_by("place", "city_id", "c1")), 15)
+        self.assertIsNotNone(reloaded.get_by_email("ANA@example.com"))
+        self.assertEqual(
+            to_record(reloaded.get("place", places[5].id)).to_dict(), to_record(places[5]).to_dict()
+        )
+
+
+    def test_batch_operations(self):
+        places = [
+            Place({"name": f"Place {i}", "address": "Calle 1", "city_id": "c1", "user_id": "u1"})
+            for i in range(5)
+        ]
+        with mock.patch("os.fsync") as fsync:
+            self.repo.save_many(places)
+        # The batch is journaled with one write and one fsync
+        self.assertEqual(fsync.call_count, 1)
+        self.assertEqual(self.repo.storage_stats()["journal_entries"], 5)
+
+        for place in places:
+            place.name = "Renamed"
+        self.assertEqual(len(self.repo.update_many(places[:3])), 3)
+        self.assertEqual(self.repo.delete_many(places[3:] + [City(name="Missing", country_code="UY")]), 2)
+
+        reloaded = DataManager(filename=self.filename)
+        self.assertEqual(sorted(p.id for p in reloaded.get_all("place")), sorted(p.id for p in places[:3]))
+        self.assertEqual({p.name for p in reloaded.get_all("place")}, {"Renamed"})
+
+    def test_find(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        places = self.make_places(repo, 10)
+        repo.compact()
+
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(reloaded.count("place"), 10)
+        found = reloaded.find("place", city_id="c1", price_per_night__gte=105)
+        self.assertEqual(sorted(p.id for p in found), sorted(p.id for p in places[5::2]))
+        self.assertEqual(reloaded.count("place", city_id__in=["c0", "c9"]), 5)
+        self.assertEqual(reloaded.count("place", price_per_night__lt=103), 3)
+
+    def test_page(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        places = sorted(self.make_places(repo, 10), key=page_key)
+        repo.delete(places[4])
+        del places[4]
+        repo.compact()
+
+        # Paging a model that is still only in its shards loads it first
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        first = reloaded.page("place", limit=4)
+        self.assertEqual([p.id for p in first], [p.id for p in places[:4]])
+        self.assertEqual(reloaded.loaded_models, {"place"})
+
+        rest = reloaded.page("place", page_key(first[-1]), limit=10)
+        self.assertEqual([p.id for p in rest], [p.id for p in places[4:]])
+        newest = reloaded.page("place", limit=2, order="desc")
+        self.assertEqual([p.id for p in newest], [places[-1].id, places[-2].id])
+
+    def test_rating_stats(self):
+        repo = DataManager(filename=self.filename, layout="sharded")
+        reviews = [Review(place_id="p1", user_id="u1", comment="Nice", rating=rating) for rating in (5, 4, 2)]
+        repo.save_many(reviews)
+        reviews[1].rating = 1
+        repo.update(reviews[1])
+        repo.delete(reviews[2])
+        repo.compact()
+
+        expected = {"count": 2, "sum": 6.0, "mean": 3.0, "histogram": {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1}}
+        self.assertEqual(repo.get_rating_stats("p1"), expected)
+
+        # Rebuilt when the reviews are loaded from their shards
+        reloaded = DataManager(filename=self.filename, layout="sharded")
+        self.assertEqual(reloaded.get_rating_stats("p1"), expected)
+        self.assertEqual(reloaded.loaded_models, {"review"})
+
+
+    def test_failed_update_leaves_rating_stats(self):
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=4)
+        self.repo.save(review)
+        stats = self.repo.get_rating_stats("p1")
+
+        review.rating = "bad"
+        with self.assertRaises(ValueError):
+            self.repo.update(review)
+
+        self.assertEqual(self.repo.get_rating_stats("p1"), stats)
+        # Nothing was journaled
+        self.assertEqual(DataManager(filename=self.filename).get("review", review.id).rating, 4)
+
+if __name__ == '__main__':
+    unittest.main()
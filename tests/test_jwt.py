@@ -1,13 +1,19 @@
 import unittest
+from unittest import mock
 from flask import json
 from src import create_app, db
 from src.models.user import User
 from src.config import TestingConfig
+from src.persistence.db import DBRepository
 
 class TestAuth(unittest.TestCase):
     def setUp(self):
         print("Setting up test...")
         self.app = create_app(TestingConfig)
+        # The users below are written to the database, so the routes must read it
+        repository = mock.patch("src.persistence.db", DBRepository())
+        repository.start()
+        self.addCleanup(repository.stop)
         print("App created")
         self.app.config['DEBUG'] = True
         print("Debug mode enabled")
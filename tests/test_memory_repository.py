@@ -0,0 +1,375 @@
+from datetime import datetime, timedelta
+import threading
+import unittest
+from src.models.amenity import Amenity, PlaceAmenity
+from src.models.city import City
+from src.models.country import Country
+from src.models.place import Place
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.columnar import np
+from src.persistence.indexes import get_key
+from src.persistence.memory import MemoryRepository
+from src.persistence.pagination import decode_cursor, encode_cursor
+
+
+def make_place(price: int, guests: int) -> Place:
+    return Place(data={
+        "name": f"Place {price}",
+        "city_id": "c1",
+        "user_id": "u1",
+        "latitude": -34.9,
+        "longitude": -56.2,
+        "price_per_night": price,
+        "max_guests": guests,
+    })
+
+
+def ids(objects) -> list:
+    return [get_key(obj) for obj in objects]
+
+
+class TestMemoryRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MemoryRepository()
+
+    def test_populated_countries(self):
+        country = self.repo.get("country", "UY")
+        self.assertIsInstance(country, Country)
+        self.assertEqual(country.name, "Uruguay")
+        self.assertEqual(ids(self.repo.get_all("country")), ["UY"])
+
+    def test_save_and_get(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+
+        self.assertEqual(self.repo.get("city", city.id).to_dict(), city.to_dict())
+        self.assertIsNone(self.repo.get("city", "missing"))
+
+    def test_get_all_keeps_insertion_order(self):
+        cities = [City(name=f"City {i}", country_code="UY") for i in range(5)]
+        for city in cities:
+            self.repo.save(city)
+
+        self.assertEqual(ids(self.repo.get_all("city")), ids(cities))
+
+    def test_update(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+        city.name = "Salto"
+
+        self.assertIs(self.repo.update(city), city)
+        self.assertEqual(self.repo.get("city", city.id).name, "Salto")
+        self.assertIsNone(self.repo.update(City(name="Nowhere", country_code="UY")))
+
+    def test_delete(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+
+        self.assertTrue(self.repo.delete(city))
+        self.assertIsNone(self.repo.get("city", city.id))
+        self.assertFalse(self.repo.delete(city))
+
+    def test_get_by_indexed_field(self):
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=5)
+        other = Review(place_id="p2", user_id="u1", comment="Meh", rating=2)
+        self.repo.save(review)
+        self.repo.save(other)
+
+        self.assertEqual(ids(self.repo.get_by("review", "place_id", "p1")), ids([review]))
+        self.assertEqual(ids(self.repo.get_by("review", "user_id", "u1")), ids([review, other]))
+        self.assertEqual(ids(self.repo.get_by("review", "place_id", "p3")), [])
+
+    def test_get_by_follows_update_and_delete(self):
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=5)
+        self.repo.save(review)
+
+        review.place_id = "p2"
+        self.repo.update(review)
+        self.assertEqual(ids(self.repo.get_by("review", "place_id", "p1")), [])
+        self.assertEqual(ids(self.repo.get_by("review", "place_id", "p2")), ids([review]))
+
+        self.repo.delete(review)
+        self.assertEqual(ids(self.repo.get_by("review", "place_id", "p2")), [])
+        self.assertEqual(ids(self.repo.get_by("review", "user_id", "u1")), [])
+
+    def test_get_by_unindexed_field(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+
+        self.assertEqual(ids(self.repo.get_by("city", "name", "Montevideo")), ids([city]))
+        self.assertEqual(ids(self.repo.get_by("city", "country_code", "UY")), ids([city]))
+
+    def test_get_by_email(self):
+        user = User(email="Jane@Example.com", first_name="Jane", last_name="Doe", password="pw")
+        self.repo.save(user)
+
+        self.assertEqual(self.repo.get_by_email("jane@example.com").to_dict(), user.to_dict())
+        self.assertEqual(self.repo.get_by_email(" JANE@example.COM ").to_dict(), user.to_dict())
+        self.assertIsNone(self.repo.get_by_email("john@example.com"))
+
+        user.email = "jane.doe@example.com"
+        self.repo.update(user)
+        self.assertIsNone(self.repo.get_by_email("jane@example.com"))
+        self.assertEqual(self.repo.get_by_email("jane.doe@example.com").to_dict(), user.to_dict())
+
+        self.repo.delete(user)
+        self.assertIsNone(self.repo.get_by_email("jane.doe@example.com"))
+
+    def test_snapshot_is_isolated_from_later_writes(self):
+        first = City(name="Montevideo", country_code="UY")
+        self.repo.save(first)
+
+        snapshot = self.repo.snapshot("city")
+        self.assertIs(self.repo.snapshot("city"), snapshot)
+
+        second = City(name="Salto", country_code="UY")
+        self.repo.save(second)
+        self.repo.delete(first)
+
+        self.assertEqual(ids(snapshot), ids([first]))
+        newer = self.repo.snapshot("city")
+        self.assertEqual(ids(newer), ids([second]))
+        self.assertGreater(newer.version, snapshot.version)
+        self.assertEqual(ids(self.repo.get_all("city")), ids([second]))
+
+    def test_search_places(self):
+        cheap, mid, pricey = make_place(50, 2), make_place(100, 4), make_place(200, 6)
+        for place in (cheap, mid, pricey):
+            self.repo.save(place)
+
+        self.assertEqual(ids(self.repo.search_places(price_per_night__lte=100)), ids([cheap, mid]))
+        self.assertEqual(
+            ids(self.repo.search_places(price_per_night__gt=50, max_guests__gte=6)), ids([pricey])
+        )
+        self.assertEqual(ids(self.repo.search_places(max_guests__in=[2, 6])), ids([cheap, pricey]))
+        with self.assertRaises(ValueError):
+            self.repo.search_places(price_per_night__near=10)
+
+    def test_find(self):
+        reviews = [
+            Review(place_id=f"p{i % 3}", user_id=f"u{i % 2}", comment="Nice", rating=i % 5 + 1)
+            for i in range(12)
+        ]
+        self.repo.save_many(reviews)
+
+        def expected(predicate):
+            return sorted(ids(r for r in reviews if predicate(r)))
+
+        self.assertEqual(
+            sorted(ids(self.repo.find("review", place_id="p1", rating__gte=3))),
+            expected(lambda r: r.place_id == "p1" and r.rating >= 3),
+        )
+        self.assertEqual(
+            sorted(ids(self.repo.find("review", user_id="u0", place_id__in=["p0", "p2", "p9"]))),
+            expected(lambda r: r.user_id == "u0" and r.place_id in ("p0", "p2")),
+        )
+        # Unindexed fields are checked on every object
+        self.assertEqual(sorted(ids(self.repo.find("review", rating=5))), expected(lambda r: r.rating == 5))
+        self.assertEqual(self.repo.count("review", place_id="p2"), 4)
+        self.assertEqual(self.repo.count("review"), 12)
+        self.assertEqual(self.repo.find("review", place_id="missing"), [])
+        with self.assertRaises(ValueError):
+            self.repo.find("review", rating__between=(1, 2))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_search_places_columnar(self):
+        repo = MemoryRepository(columnar_places=True)
+        places = [make_place(price, price % 7) for price in range(0, 3000, 10)]
+        for place in places:
+            repo.save(place)
+
+        # Delete most places to force the arrays to compact
+        for place in places[::3] + places[1::3]:
+            repo.delete(place)
+        survivors = places[2::3]
+        survivors[0].price_per_night = 5000
+        repo.update(survivors[0])
+
+        self.assertEqual(
+            ids(repo.search_places(price_per_night__gte=1000, max_guests__lt=4)),
+            ids([p for p in survivors if p.price_per_night >= 1000 and p.max_guests < 4]),
+        )
+        self.assertEqual(ids(repo.search_places(price_per_night=5000)), ids(survivors[:1]))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_search_places_columnar_does_not_coerce(self):
+        columnar = MemoryRepository(columnar_places=True)
+        places = [make_place(100, 2), make_place(200, 4)]
+        places[1].max_guests = "4"
+        for repo in (columnar, self.repo):
+            repo.save_many(places)
+
+        # Strings never equal or compare with numbers, as in criteria.matches
+        for criteria, expected in (
+            ({"price_per_night": "100"}, []),
+            ({"price_per_night__in": ["100", 200]}, places[1:]),
+            ({"price_per_night__gte": "100"}, []),
+            ({"max_guests": 4}, []),
+            ({"max_guests__gt": 1}, places[:1]),
+            ({"price_per_night": 100}, places[:1]),
+        ):
+            with self.subTest(criteria=criteria):
+                self.assertEqual(ids(columnar.search_places(**criteria)), ids(expected))
+                self.assertEqual(ids(self.repo.search_places(**criteria)), ids(expected))
+
+    def test_place_detail(self):
+        city = City(name="Montevideo", country_code="UY")
+        place = make_place(100, 2)
+        place.city_id = city.id
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        reviews = [Review(place_id=place.id, user_id="u1", comment="Nice", rating=5) for _ in range(2)]
+        self.repo.save_many([city, place, wifi, pool, PlaceAmenity(place.id, wifi.id), *reviews])
+        self.repo.save(Review(place_id="other", user_id="u1", comment="Meh", rating=2))
+
+        detail = self.repo.get_place_detail(place.id, ["city", "host", "amenities", "reviews"])
+        self.assertEqual(get_key(detail["place"]), place.id)
+        self.assertEqual(detail["city"].name, "Montevideo")
+        # The host was never saved
+        self.assertIsNone(detail["host"])
+        self.assertEqual([amenity.name for amenity in detail["amenities"]], ["Wifi"])
+        self.assertEqual(ids(detail["reviews"]), ids(reviews))
+
+        self.assertEqual(set(self.repo.get_place_detail(place.id, ["city"])), {"place", "city"})
+        self.assertIsNone(self.repo.get_place_detail("missing", ["city"]))
+
+    def test_rating_stats(self):
+        reviews = [Review(place_id="p1", user_id="u1", comment="Nice", rating=rating) for rating in (5, 4, 4.6, 2)]
+        self.repo.save_many(reviews)
+        self.repo.save(Review(place_id="p2", user_id="u1", comment="Bad", rating=1))
+
+        stats = self.repo.get_rating_stats("p1")
+        self.assertEqual(stats["count"], 4)
+        self.assertAlmostEqual(stats["sum"], 15.6)
+        self.assertAlmostEqual(stats["mean"], 3.9)
+        self.assertEqual(stats["histogram"], {"1": 0, "2": 1, "3": 0, "4": 1, "5": 2})
+
+        reviews[1].rating = 1
+        self.repo.update(reviews[1])
+        reviews[0].place_id = "p2"
+        self.repo.update(reviews[0])
+        self.repo.delete(reviews[3])
+        self.repo.delete_many([reviews[2]])
+
+        self.assertEqual(self.repo.get_rating_stats("p1"), {
+            "count": 1, "sum": 1.0, "mean": 1.0, "histogram": {"1": 1, "2": 0, "3": 0, "4": 0, "5": 0},
+        })
+        self.assertEqual(self.repo.get_rating_stats("p2")["histogram"], {"1": 1, "2": 0, "3": 0, "4": 0, "5": 1})
+        self.assertEqual(self.repo.get_rating_stats("missing"), {
+            "count": 0, "sum": 0.0, "mean": None, "histogram": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
+        })
+
+    def test_failed_update_leaves_rating_stats(self):
+        review = Review(place_id="p1", user_id="u1", comment="Nice", rating=4)
+        self.repo.save(review)
+        stats = self.repo.get_rating_stats("p1")
+
+        review.rating = "bad"
+        with self.assertRaises(ValueError):
+            self.repo.update(review)
+
+        self.assertEqual(self.repo.get_rating_stats("p1"), stats)
+        self.assertEqual(self.repo.get("review", review.id).rating, 4)
+
+    def test_reads_return_detached_objects(self):
+        city = City(name="Montevideo", country_code="UY")
+        self.repo.save(city)
+
+        fetched = self.repo.get("city", city.id)
+        self.assertIsNot(fetched, city)
+        fetched.name = "Salto"
+        self.assertEqual(self.repo.get("city", city.id).name, "Montevideo")
+
+        self.repo.update(fetched)
+        self.assertEqual(self.repo.get("city", city.id).name, "Salto")
+
+    def test_concurrent_writes_and_reads(self):
+        kept = []
+
+        def write(slot):
+            for i in range(200):
+                review = Review(place_id=f"p{i % 5}", user_id=f"u{slot}", comment="x", rating=3)
+                self.repo.save(review)
+                if i % 2:
+                    self.repo.delete(review)
+                else:
+                    kept.append(review)
+
+        def read():
+            for _ in range(20):
+                for review in self.repo.get_all("review"):
+                    self.repo.get("review", review.id)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.repo.get_all("review")), len(kept))
+        self.assertEqual(
+            sum(len(self.repo.get_by("review", "place_id", f"p{i}")) for i in range(5)),
+            len(kept),
+        )
+
+    def test_batch_operations(self):
+        cities = [City(name=f"City {i}", country_code="UY") for i in range(5)]
+        reviews = [Review(place_id="p1", user_id="u1", comment="Nice", rating=5) for _ in range(3)]
+        version = self.repo.snapshot("city").version
+
+        self.assertEqual(self.repo.save_many(cities + reviews), cities + reviews)
+        self.assertEqual(ids(self.repo.get_all("city")), ids(cities))
+        self.assertEqual(len(self.repo.get_by("review", "place_id", "p1")), 3)
+        # One new version per model, not per object
+        self.assertEqual(self.repo.snapshot("city").version, version + 1)
+
+        for city in cities:
+            city.name = "Renamed"
+        missing = City(name="Missing", country_code="UY")
+        self.assertEqual(ids(self.repo.update_many(cities + [missing])), ids(cities))
+        self.assertEqual({city.name for city in self.repo.get_all("city")}, {"Renamed"})
+
+        self.assertEqual(self.repo.delete_many(cities[:2] + reviews + [missing]), 5)
+        self.assertEqual(ids(self.repo.get_all("city")), ids(cities[2:]))
+        self.assertEqual(self.repo.get_by("review", "place_id", "p1"), [])
+
+    def test_page(self):
+        start = datetime(2024, 1, 1)
+        cities = [City(name=f"City {i}", country_code="UY") for i in range(7)]
+        for i, city in enumerate(cities):
+            # Saved out of creation order, with two cities created at the same time
+            city.created_at = start + timedelta(minutes=min(i, 5))
+        self.repo.save_many(cities[::-1])
+        tied = sorted(cities[5:], key=get_key)
+
+        first = self.repo.page("city", limit=3)
+        self.assertEqual(ids(first), ids(cities[:3]))
+        after, order = decode_cursor(encode_cursor(first[-1]))
+        self.assertEqual(order, "asc")
+        self.assertEqual(ids(self.repo.page("city", after, limit=3)), ids(cities[3:5] + tied[:1]))
+
+        after, _ = decode_cursor(encode_cursor(tied[0]))
+        self.assertEqual(ids(self.repo.page("city", after, limit=3)), [get_key(tied[1])])
+
+        newest = self.repo.page("city", limit=3, order="desc")
+        self.assertEqual(ids(newest), ids(tied[::-1] + [cities[4]]))
+        after, order = decode_cursor(encode_cursor(newest[-1], "desc"))
+        self.assertEqual(ids(self.repo.page("city", after, limit=10, order=order)), ids(cities[3::-1]))
+
+        # Updates move an object, deletes drop it
+        cities[0].created_at = start + timedelta(days=1)
+        self.repo.update(cities[0])
+        self.repo.delete(cities[1])
+        self.assertEqual(ids(self.repo.page("city", limit=10))[-1], get_key(cities[0]))
+        self.assertNotIn(get_key(cities[1]), ids(self.repo.page("city", limit=10)))
+
+    def test_invalid_cursor(self):
+        for cursor in ("", "not a cursor", encode_cursor(Country("Uruguay", "UY"), "sideways")):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
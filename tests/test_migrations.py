@@ -0,0 +1,154 @@
+from datetime import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import inspect, insert, select
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.place import PlaceRatingStats
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.db import DBRepository
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        uri = f"sqlite:///{os.path.join(self.tmpdir.name, 'hbnb.db')}"
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = uri
+
+        self.app = create_app(FileConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.alembic = AlembicConfig(os.path.join(ROOT, "alembic.ini"))
+        self.alembic.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+        self.alembic.set_main_option("sqlalchemy.url", uri)
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def indexes(self) -> set:
+        inspector = inspect(db.engine)
+        return {
+            (table, index["name"])
+            for table in inspector.get_table_names()
+            for index in inspector.get_indexes(table)
+        }
+
+    def test_indexes_match_models(self):
+        declared = {(table.name, index.name) for table in db.metadata.sorted_tables for index in table.indexes}
+        self.assertIn(("reviews", "ix_reviews_place_id"), declared)
+        self.assertIn(("places", "ix_places_created_at_id"), declared)
+        self.assertEqual(self.indexes(), declared)
+
+        # The migration drops and recreates exactly what the models declare
+        command.stamp(self.alembic, "head")
+        command.downgrade(self.alembic, "18c39446000d")
+        self.assertEqual(self.indexes(), set())
+
+        command.upgrade(self.alembic, "head")
+        self.assertEqual(self.indexes(), declared)
+
+    def test_rating_stats_are_backfilled(self):
+        # Core inserts skip the session hooks that maintain the stats
+        now = datetime.now()
+        db.session.execute(insert(Review.__table__), [
+            {"id": i, "place_id": "p1", "user_id": "u1", "comment": "Nice", "rating": rating, "created_at": now}
+            for i, rating in enumerate([5, 4.5, 3.4, 1], 1)
+        ])
+        db.session.commit()
+        self.assertIsNone(db.session.get(PlaceRatingStats, "p1"))
+
+        command.stamp(self.alembic, "head")
+        command.downgrade(self.alembic, "5b2e9c7d41a3")
+        command.upgrade(self.alembic, "head")
+
+        self.assertEqual(PlaceRatingStats.for_place("p1", db.session), {
+            "count": 4, "sum": 13.9, "mean": 13.9 / 4, "histogram": {"1": 1, "2": 0, "3": 1, "4": 0, "5": 2},
+        })
+
+
+    def test_rating_stats_upgrade_after_create_all(self):
+        # The app already ran db.create_all, so place_rating_stats exists, empty
+        now = datetime.now()
+        db.session.execute(insert(Review.__table__), [
+            {"id": i, "place_id": "p1", "user_id": "u1", "comment": "Nice", "rating": rating, "created_at": now}
+            for i, rating in enumerate([5, 2], 1)
+        ])
+        db.session.commit()
+
+        command.stamp(self.alembic, "5b2e9c7d41a3")
+        command.upgrade(self.alembic, "head")
+
+        self.assertEqual(PlaceRatingStats.for_place("p1", db.session), {
+            "count": 2, "sum": 7.0, "mean": 3.5, "histogram": {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1},
+        })
+
+    def test_rating_stats_backfill_matches_live_updates(self):
+        # Ratings on each bucket boundary, written, moved and deleted through the session hooks
+        reviews = [
+            Review(place_id=f"p{i % 3}", user_id="u1", comment="Nice", rating=rating, id=i)
+            for i, rating in enumerate([1, 1.49, 1.5, 2.5, 3.49, 3.5, 4.5, 5, 2, 3, 4], 1)
+        ]
+        repo = DBRepository()
+        repo.save_many(reviews)
+        reviews[0].rating = 4.5
+        reviews[1].place_id = "p2"
+        repo.update_many(reviews[:2])
+        repo.delete(reviews[-1])
+        repo.delete_many(reviews[-3:-1])
+
+        def snapshot() -> dict:
+            return {stats.place_id: stats.to_dict() for stats in db.session.scalars(select(PlaceRatingStats))}
+
+        live = snapshot()
+        self.assertEqual(set(live), {"p0", "p1", "p2"})
+        db.session.remove()
+
+        command.stamp(self.alembic, "head")
+        command.downgrade(self.alembic, "5b2e9c7d41a3")
+        command.upgrade(self.alembic, "head")
+
+        self.assertEqual(snapshot(), live)
+
+
+    def test_user_emails_are_lowercased(self):
+        # Stored before emails were normalized on write
+        now = datetime.now()
+        db.session.execute(insert(User.__table__), [
+            {"id": str(i), "email": email, "password": "x", "created_at": now}
+            for i, email in enumerate(["Ana@Example.com", " bo@example.com ", "Cy@Example.com", "cy@example.com"])
+        ])
+        db.session.commit()
+        repo = DBRepository()
+        self.assertIsNone(repo.get_by_email("ana@example.com"))
+
+        command.stamp(self.alembic, "head")
+        command.downgrade(self.alembic, "9d4f1a6c2e87")
+        # env.py would reconfigure logging and drop the handler of assertLogs
+        with mock.patch("logging.config.fileConfig"), self.assertLogs("alembic.runtime.migration", "WARNING") as logs:
+            command.upgrade(self.alembic, "head")
+
+        self.assertEqual(repo.get_by_email("ana@example.com").id, "0")
+        self.assertEqual(repo.get_by_email("BO@example.com").id, "1")
+        # Colliding emails are reported and left for a person to merge
+        self.assertEqual(db.session.get(User, "2").email, "Cy@Example.com")
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Cy@Example.com (2), cy@example.com (3)", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import unittest
+from unittest import mock
+from src import create_app
+from src.config import TestingConfig
+from src.models.amenity import Amenity
+from src.persistence.memory import MemoryRepository
+
+
+class TestPaginatedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MemoryRepository()
+        patcher = mock.patch("src.persistence.db", self.repo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        start = datetime(2024, 1, 1)
+        self.amenities = []
+        for i in range(7):
+            amenity = Amenity(name=f"Amenity {i}")
+            amenity.created_at = amenity.updated_at = start + timedelta(minutes=i)
+            self.amenities.append(amenity)
+        self.repo.save_many(self.amenities)
+
+        self.client = create_app(TestingConfig).test_client()
+
+    def follow(self, url: str) -> list[list[str]]:
+        """Get the ids of every page of a list endpoint, following X-Next-Cursor"""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([amenity["id"] for amenity in response.get_json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            url = cursor and f"/amenities/?limit=3&cursor={cursor}"
+        return pages
+
+    def test_follows_next_cursor(self):
+        ids = [amenity.id for amenity in self.amenities]
+
+        self.assertEqual(self.follow("/amenities/?limit=3"), [ids[:3], ids[3:6], ids[6:]])
+        self.assertEqual(self.follow("/amenities/?limit=3&order=desc"), [ids[:3:-1], ids[3:0:-1], ids[:1]])
+
+    def test_default_limit(self):
+        with mock.patch("src.controllers.pagination.DEFAULT_PAGE_LIMIT", 5):
+            response = self.client.get("/amenities/")
+
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertIn("X-Next-Cursor", response.headers)
+
+    def test_invalid_parameters(self):
+        for query in ("cursor=garbage", "limit=0", "limit=ten", "order=sideways"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/amenities/?{query}").status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
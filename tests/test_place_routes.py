@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+import unittest
+from unittest import mock
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.amenity import Amenity, PlaceAmenity
+from src.models.city import City
+from src.models.country import Country
+from src.models.place import Place
+from src.models.review import Review
+from src.models.user import User
+from src.persistence.db import DBRepository
+from src.persistence.memory import MemoryRepository
+
+
+class PlaceRoutesTests(ABC):
+    """Tests of the place routes, run against each repository by the subclasses"""
+
+    @abstractmethod
+    def make_repo(self): ...
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.addCleanup(self.ctx.pop)
+
+        self.repo = self.make_repo()
+        patcher = mock.patch("src.persistence.db", self.repo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self.app.test_client()
+
+        host = User(email="host@example.com", password="secret", first_name="Ana", last_name="Diaz")
+        # City and review ids are integer columns in the database
+        city = City(name="Montevideo", country_code="UY", id=1)
+        place = Place({"name": "Loft", "address": "Rambla 1", "city_id": 1, "user_id": host.id})
+        amenities = [Amenity(name=name) for name in ("Wifi", "Pool", "Gym")]
+        for amenity in amenities:
+            amenity.place_id = place.id
+        links = [PlaceAmenity(place.id, amenity.id) for amenity in amenities[:2]]
+        reviews = [
+            Review(place_id=place.id, user_id=host.id, comment="Nice", rating=rating, id=i)
+            for i, rating in enumerate([5, 4, 2], 1)
+        ]
+        self.host_id, self.place_id = host.id, place.id
+        self.repo.save_many([host, city, place, *amenities, *links, *reviews])
+
+    def test_get_place(self):
+        response = self.client.get(f"/places/{self.place_id}")
+
+        self.assertEqual(response.status_code, 200)
+        place = response.get_json()
+        self.assertEqual(place["id"], self.place_id)
+        self.assertNotIn("reviews", place)
+
+    def test_expand(self):
+        response = self.client.get(f"/places/{self.place_id}?expand=city,host,amenities,reviews")
+
+        self.assertEqual(response.status_code, 200)
+        place = response.get_json()
+        self.assertEqual(place["id"], self.place_id)
+        self.assertEqual(place["city"]["name"], "Montevideo")
+        self.assertEqual(place["host"]["id"], self.host_id)
+        self.assertEqual(sorted(amenity["name"] for amenity in place["amenities"]), ["Pool", "Wifi"])
+        self.assertEqual(sorted(review["rating"] for review in place["reviews"]), [2, 4, 5])
+
+        response = self.client.get(f"/places/{self.place_id}?expand=city")
+        self.assertEqual(set(response.get_json()) & {"city", "host", "amenities", "reviews"}, {"city"})
+
+    def test_expand_errors(self):
+        self.assertEqual(self.client.get(f"/places/{self.place_id}?expand=city,owner").status_code, 400)
+        self.assertEqual(self.client.get("/places/missing?expand=city").status_code, 404)
+
+    def test_review_stats(self):
+        response = self.client.get(f"/places/{self.place_id}/reviews/stats")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            "count": 3, "sum": 11.0, "mean": 11 / 3, "histogram": {"1": 0, "2": 1, "3": 0, "4": 1, "5": 1},
+        })
+        self.assertEqual(self.client.get("/places/missing/reviews/stats").status_code, 404)
+
+
+class TestMemoryPlaceRoutes(PlaceRoutesTests, unittest.TestCase):
+
+    def make_repo(self):
+        return MemoryRepository()
+
+
+class TestDBPlaceRoutes(PlaceRoutesTests, unittest.TestCase):
+
+    def make_repo(self):
+        db.create_all()
+        self.addCleanup(db.drop_all)
+        self.addCleanup(db.session.remove)
+        repo = DBRepository()
+        # cities.country_code references countries
+        repo.save(Country(name="Uruguay", code="UY"))
+        return repo
+
+
+if __name__ == '__main__':
+    unittest.main()
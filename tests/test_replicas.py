@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import insert
+from src import create_app, db
+from src.config import TestingConfig
+from src.models.country import Country
+from src.persistence.db import DBRepository
+
+
+class TestReplicas(unittest.TestCase):
+    """
+    Replication is not simulated: the primary and the replica are separate
+    SQLite files, so which one answered shows where a query was sent.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.tmpdir.name, 'primary.db')}"
+            DB_REPLICA_URIS = [f"sqlite:///{os.path.join(self.tmpdir.name, 'replica.db')}"]
+
+        self.app = create_app(ReplicaConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        self.replica = self.app.extensions["replicas"][0]
+        db.create_all()
+        db.metadata.create_all(self.replica)
+        with self.replica.begin() as connection:
+            connection.execute(insert(Country.__table__), [{"code": "UY", "name": "Uruguay"}])
+
+        self.repo = DBRepository()
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in [*db.engines.values(), self.replica]:
+            engine.dispose()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def codes(self) -> list:
+        return [country.code for country in self.repo.get_all("country")]
+
+    def test_reads_go_to_replica_until_a_write(self):
+        self.assertEqual(self.codes(), ["UY"])
+        self.assertEqual(self.repo.count("country"), 1)
+
+        self.repo.save(Country(name="Argentina", code="AR"))
+        # Pinned to the primary, which has only the new row
+        self.assertTrue(db.session().pinned)
+        self.assertEqual(self.codes(), ["AR"])
+
+        db.session.remove()
+        self.assertEqual(self.codes(), ["UY"])
+
+    def test_requests_read_their_own_writes(self):
+        @self.app.route("/_test/countries", methods=["POST"])
+        def create_country():
+            before = self.codes()
+            self.repo.save(Country(name="Argentina", code="AR"))
+            return {"before": before, "after": self.codes()}
+
+        @self.app.route("/_test/countries", methods=["GET"])
+        def list_countries():
+            return {"codes": self.codes()}
+
+        client = self.app.test_client()
+        self.assertEqual(client.post("/_test/countries").json, {"before": ["UY"], "after": ["AR"]})
+        # A new request reads from the replica again
+        self.assertEqual(client.get("/_test/countries").json, {"codes": ["UY"]})
+
+        self.assertEqual(DBRepository.pool_stats().keys(), {"default", "replica_0"})
+
+    def test_replicas_are_not_binds(self):
+        # Nothing is registered on the shared db, so apps without replicas still create their tables
+        self.assertNotIn("replica_0", db.metadatas)
+        self.assertNotIn("replica_0", db.engines)
+
+        app = create_app(TestingConfig)
+        with app.app_context():
+            self.assertEqual(app.extensions["replicas"], [])
+            db.create_all()
+
+
+if __name__ == '__main__':
+    unittest.main()
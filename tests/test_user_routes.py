@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+from flask_jwt_extended import decode_token
+from src import create_app
+from src.config import TestingConfig
+from src.persistence.memory import MemoryRepository
+
+
+class TestUserRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MemoryRepository()
+        patcher = mock.patch("src.persistence.db", self.repo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+
+    def test_sign_up_and_login(self):
+        user = {"email": "Ana@Example.com", "password": "secret", "first_name": "Ana", "last_name": "Diaz"}
+        response = self.client.post("/users", json=user)
+        self.assertEqual(response.status_code, 201)
+        user_id = response.get_json()["id"]
+
+        # Looked up through the email index of the memory repository
+        with mock.patch.object(self.repo, "get_by_email", wraps=self.repo.get_by_email) as get_by_email:
+            response = self.client.post("/users/login", json={"email": "ana@example.com", "password": "secret"})
+        self.assertEqual(response.status_code, 200)
+        get_by_email.assert_called_once_with("ana@example.com")
+        with self.app.app_context():
+            self.assertEqual(decode_token(response.get_json()["access_token"])["sub"], user_id)
+
+        for credentials in ({"email": "ana@example.com", "password": "wrong"}, {"email": "bo@example.com"}, {}):
+            with self.subTest(credentials=credentials):
+                self.assertEqual(self.client.post("/users/login", json=credentials).status_code, 401)
+
+    def test_email_must_be_a_string(self):
+        user = {"email": 5, "password": "secret", "first_name": "Ana", "last_name": "Diaz"}
+
+        self.assertEqual(self.client.post("/users", json=user).status_code, 400)
+        self.assertEqual(self.client.post("/users/login", json={"email": 5, "password": "secret"}).status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,4 +2,10 @@
 
 REPOSITORY_ENV_VAR = "db"
 
-FILE_STORAGE_FILENAME = "data.json"
\ No newline at end of file
+FILE_STORAGE_FILENAME = "data.json"
+
+# Snapshot format of the file storage, "json" or "binary"
+FILE_STORAGE_FORMAT = "json"
+
+# Layout of the file storage snapshot, "single" or "sharded"
+FILE_STORAGE_LAYOUT = "single"